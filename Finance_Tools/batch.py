@@ -0,0 +1,78 @@
+# Standard Imports
+import os
+import sys
+import argparse
+
+# Local Import
+from utils import utils
+from utils import export
+from utils import fetcher
+from utils import instrumentation
+from utils import position_sizing
+from utils import providers
+from utils.cache import ResponseCache
+from utils.price_store import PriceStore
+from src import strategies
+
+# Constants
+PROVIDERS = ("alphavantage", "iex")
+FREQUENCIES = ("M", "D")
+TICKERS_FILE = os.path.join("data", "raw_data", "stocks.csv")
+OUTPUT_FILE = os.path.join("data", "output_data", "recommended_trades.xlsx")
+CACHE_DIRECTORY = os.path.join("data", "cache")
+
+# Functions
+
+def parse_arguments(arguments=None):
+    parser = argparse.ArgumentParser(description="Run several strategies over one shared data load, without prompts.")
+    parser.add_argument("--amount", type=float, required=True, help="Portfolio amount to invest in each strategy.")
+    parser.add_argument("--strategies", nargs="+", default=list(strategies.STRATEGIES), choices=list(strategies.STRATEGIES), help="Strategies to run.")
+    parser.add_argument("--sizing", default="equal", choices=list(position_sizing.METHODS), help="How the amount is split across each strategy's stocks.")
+    parser.add_argument("--lot-size", type=int, default=1, help="Shares per tradable lot; positions are bought in whole lots.")
+    parser.add_argument("--min-position", type=float, default=0.0, help="Smallest position value worth holding; smaller positions are dropped.")
+    parser.add_argument("--tickers", default=TICKERS_FILE, help="CSV file with a Ticker column.")
+    parser.add_argument("--frequency", default="M", choices=list(FREQUENCIES), help="Bar frequency: M for monthly, D for daily with trading-day lookbacks.")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="Output file; .xlsx, .csv, .parquet, .arrow or .feather.")
+    parser.add_argument("--api-key", default=os.environ.get("ALPHAVANTAGE_API_KEY", "demo"), help="Alpha Vantage API key.")
+    parser.add_argument("--tier", default=os.environ.get("ALPHAVANTAGE_TIER"), choices=list(fetcher.TIERS), help="Alpha Vantage key tier setting the request quotas, free if omitted.")
+    parser.add_argument("--base-url", default=None, help="Provider base URL, the provider's public endpoint if omitted.")
+    parser.add_argument("--provider", default="alphavantage", choices=list(PROVIDERS), help="Market data provider.")
+    parser.add_argument("--iex-token", default=os.environ.get("IEX_CLOUD_API_TOKEN"), help="IEX Cloud API token.")
+    parser.add_argument("--cache-dir", default=CACHE_DIRECTORY, help="Response cache directory.")
+    parser.add_argument("--price-store", help="Price history directory to merge the monthly series into.")
+    parser.add_argument("--rolling-state", help="File of rolling momentum statistics, updated with only the new bars.")
+    parser.add_argument("--no-cache", action="store_true", help="Always fetch from the API.")
+    parser.add_argument("--prices-file", help="Local CSV or Parquet dump of daily or monthly bars; skips the API.")
+    parser.add_argument("--overview-file", help="Local CSV or Parquet dump of OVERVIEW fundamentals, used with --prices-file.")
+    return parser.parse_args(arguments)
+
+def create_provider(arguments):
+    if arguments.provider == "iex":
+        return providers.IEXBatchProvider(arguments.base_url or providers.IEX_BATCH_URL, arguments.iex_token)
+    return providers.AlphaVantageProvider(arguments.base_url or providers.ALPHA_VANTAGE_URL, arguments.api_key, arguments.tier)
+
+def main(arguments=None):
+    arguments = parse_arguments(arguments)
+    profiling = instrumentation.enable_from_environment()
+
+    stock_tickers = utils.get_stock_tickers(arguments.tickers)
+    store = PriceStore.create(arguments.price_store, frequency=arguments.frequency) if arguments.price_store else None
+    if store is not None and store.frequency != arguments.frequency:
+        raise SystemExit(f"Price store {arguments.price_store} holds '{store.frequency}' bars, not '{arguments.frequency}'.")
+
+    if arguments.prices_file:
+        dataset = strategies.load_offline_dataset(arguments.prices_file, arguments.strategies, arguments.overview_file, stock_tickers, store=store, frequency=arguments.frequency, rolling_state=arguments.rolling_state)
+    else:
+        cache = None if arguments.no_cache else ResponseCache(arguments.cache_dir)
+        provider = create_provider(arguments)
+        dataset = strategies.load_dataset(stock_tickers, provider.base_api_url, arguments.api_key, arguments.strategies, cache=cache, store=store, provider=provider, frequency=arguments.frequency, rolling_state=arguments.rolling_state)
+    sheets = strategies.run_strategies(dataset, arguments.strategies, arguments.amount, sizing=arguments.sizing, lot_size=arguments.lot_size, min_position=arguments.min_position)
+    paths = export.export(arguments.output, sheets)
+
+    print(f"Recommended trades for {', '.join(arguments.strategies)} have been saved to {', '.join(paths)}.")
+    if profiling:
+        instrumentation.emit()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
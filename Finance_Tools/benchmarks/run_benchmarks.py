@@ -0,0 +1,177 @@
+"""
+Benchmarks every pipeline stage on synthetic universes and checks for regressions.
+
+Run from the Finance_Tools directory:
+
+    python -m benchmarks.run_benchmarks --sizes 500 5000 50000 --save-baseline
+    python -m benchmarks.run_benchmarks --sizes 500 5000 50000
+
+The first command records wall time and peak memory per stage and size to
+benchmarks/baseline.json; later runs compare against it and exit with status 1
+if any stage is slower or uses more memory than the baseline allows.
+"""
+
+# Standard Imports
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import tempfile
+import platform
+import tracemalloc
+
+from utils import utils
+from utils import decode
+from utils import fetcher
+from utils import timeseries
+from src.portfolio_management import price_momentum
+from src.investment_analysis import ratio_analysis
+from benchmarks import synthetic
+from benchmarks.stub_server import StubServer
+
+# Constants
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_SIZES = [500, 5000, 50000]
+TOLERANCE = 0.25
+# Stages this fast are dominated by timer noise and are not flagged on time.
+MIN_SECONDS = 0.05
+
+# Functions
+
+def measure(function, *args):
+    """
+    Runs a stage once for wall time and once under tracemalloc for peak memory.
+
+    Parameters:
+    function (callable): Stage to run.
+    args: Arguments for the stage.
+
+    Returns:
+    tuple: Stage result, wall seconds and peak bytes allocated.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    function(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+def benchmark_size(number_of_stocks, fetch_limit=None, max_workers=fetcher.MAX_WORKERS):
+    """
+    Benchmarks every stage for one universe size.
+
+    Parameters:
+    number_of_stocks (int): Number of synthetic tickers.
+    fetch_limit (int): Maximum number of tickers to fetch over HTTP, all if None.
+    max_workers (int): Number of concurrent requests for the fetch stage.
+
+    Returns:
+    dict: Wall seconds and peak bytes per stage.
+    """
+    monthly = synthetic.monthly_payloads(number_of_stocks)
+    overview = synthetic.overview_payloads(number_of_stocks)
+    results = {}
+
+    fetch_count = number_of_stocks if fetch_limit is None else min(number_of_stocks, fetch_limit)
+    tickers = [payload['Meta Data']['2. Symbol'] for payload in monthly[:fetch_count]]
+    served = {('TIME_SERIES_MONTHLY', payload['Meta Data']['2. Symbol']): payload for payload in monthly[:fetch_count]}
+    with StubServer(served) as server:
+        limiter = fetcher.RateLimiter(requests_per_minute=None, requests_per_day=None)
+        _, seconds, peak = measure(lambda: utils.get_stock_data(tickers, server.url, 'demo', 'TIME_SERIES_MONTHLY', max_workers=max_workers, rate_limiter=limiter))
+        results['get_stock_data'] = {'seconds': seconds, 'peak_bytes': peak, 'requests': fetch_count}
+
+    # Both ways of decoding raw monthly responses; iter_monthly_returns projects with regexes only without orjson.
+    raws = [json.dumps(payload).encode() for payload in monthly]
+    _, seconds, peak = measure(lambda: [timeseries.parse_time_series(decode.loads(raw)) for raw in raws])
+    results['decode_monthly_loads'] = {'seconds': seconds, 'peak_bytes': peak, 'orjson': decode.orjson is not None}
+    _, seconds, peak = measure(lambda: [decode.parse_time_series_bytes(raw) for raw in raws])
+    results['decode_monthly_projected'] = {'seconds': seconds, 'peak_bytes': peak}
+    del raws
+
+    returns, seconds, peak = measure(utils.calculate_monthly_return_percentage, monthly, price_momentum.time_periods)
+    results['calculate_monthly_return_percentage'] = {'seconds': seconds, 'peak_bytes': peak}
+
+    attributes = price_momentum.extract_attributes(returns)
+    percentiles, seconds, peak = measure(lambda: price_momentum.calculate_return_percentile(attributes.copy()))
+    results['calculate_return_percentile'] = {'seconds': seconds, 'peak_bytes': peak}
+
+    scored, seconds, peak = measure(lambda: price_momentum.calculate_hqm_score(percentiles.copy()))
+    results['calculate_hqm_score'] = {'seconds': seconds, 'peak_bytes': peak}
+
+    ratios = utils.get_ratios(overview, dict(zip(returns['Ticker'], returns['Price'])))
+    _, seconds, peak = measure(ratio_analysis.calculate_percentile_RV, ratios)
+    results['calculate_percentile_RV'] = {'seconds': seconds, 'peak_bytes': peak}
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'recommended_trades.xlsx')
+        _, seconds, peak = measure(price_momentum.save_recommended_trades, scored, file_path)
+        results['save_recommended_trades'] = {'seconds': seconds, 'peak_bytes': peak}
+
+    return results
+
+def find_regressions(current, baseline, tolerance=TOLERANCE):
+    """
+    Compares a run against the baseline.
+
+    Parameters:
+    current (dict): Results per size and stage.
+    baseline (dict): Baseline results per size and stage.
+    tolerance (float): Allowed relative increase before flagging.
+
+    Returns:
+    list: Human readable regression descriptions.
+    """
+    regressions = []
+    for size, stages in current.items():
+        for stage, metrics in stages.items():
+            reference = baseline.get(size, {}).get(stage)
+            if reference is None:
+                continue
+            if metrics['seconds'] > MIN_SECONDS and metrics['seconds'] > reference['seconds'] * (1 + tolerance):
+                regressions.append(f"{stage} @ {size}: {metrics['seconds']:.3f}s vs baseline {reference['seconds']:.3f}s")
+            if metrics['peak_bytes'] > reference['peak_bytes'] * (1 + tolerance):
+                regressions.append(f"{stage} @ {size}: {metrics['peak_bytes'] / 2 ** 20:.1f} MiB vs baseline {reference['peak_bytes'] / 2 ** 20:.1f} MiB")
+    return regressions
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Finance_Tools pipeline stages.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Universe sizes to benchmark.')
+    parser.add_argument('--fetch-limit', type=int, default=None, help='Maximum tickers fetched over HTTP per size.')
+    parser.add_argument('--max-workers', type=int, default=fetcher.MAX_WORKERS, help='Concurrent requests for the fetch stage.')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline JSON file.')
+    parser.add_argument('--save-baseline', action='store_true', help='Overwrite the baseline with this run.')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='Allowed relative slowdown or memory growth.')
+    arguments = parser.parse_args(arguments)
+
+    current = {}
+    for size in arguments.sizes:
+        current[str(size)] = benchmark_size(size, arguments.fetch_limit, arguments.max_workers)
+        for stage, metrics in current[str(size)].items():
+            print(f"{size:>7} {stage:<38} {metrics['seconds']:>9.3f}s {metrics['peak_bytes'] / 2 ** 20:>9.1f} MiB")
+
+    if arguments.save_baseline:
+        with open(arguments.baseline, 'w') as file:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'results': current}, file, indent=2)
+        print(f"Baseline saved to {arguments.baseline}")
+        return 0
+
+    if not os.path.exists(arguments.baseline):
+        print("No baseline found; run with --save-baseline first.")
+        return 0
+
+    with open(arguments.baseline) as file:
+        baseline = json.load(file)['results']
+    regressions = find_regressions(current, baseline, arguments.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
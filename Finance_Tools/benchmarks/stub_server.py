@@ -0,0 +1,82 @@
+# Standard Imports
+import json
+import time
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Classes
+
+class StubServer:
+    """
+    Local Alpha Vantage stand-in with configurable latency and throttling.
+
+    Payloads come from `payload`, a function of the query dictionary, or
+    else from `payloads` keyed by (function, symbol), which are encoded once
+    up front so benchmarks measure the client rather than the server's JSON
+    encoding. `throttle` is the number of 429 responses sent per symbol
+    before serving data, `requests` counts every request seen and `seen`
+    every request per symbol. Shared by the benchmarks and the test suite's
+    `stub_server` fixture.
+    """
+
+    def __init__(self, payloads=None, latency=0.0, throttle=0, payload=None):
+        self.bodies = {key: json.dumps(data).encode() for key, data in (payloads or {}).items()}
+        self.payload = payload
+        self.latency = latency
+        self.throttle = throttle
+        self.requests = 0
+        self.seen = {}
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server.server_address[1]}/query'
+
+    def body(self, query):
+        if self.payload is not None:
+            return json.dumps(self.payload(query)).encode()
+        return self.bodies.get((query.get('function'), query.get('symbol')), b'{}')
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+                symbol = query.get('symbol', '')
+                with stub.lock:
+                    stub.requests += 1
+                    attempt = stub.seen.get(symbol, 0)
+                    stub.seen[symbol] = attempt + 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if attempt < stub.throttle:
+                    self.send_response(429)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body = stub.body(query)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,76 @@
+# Standard Imports
+import numpy as np
+
+# Constants
+NUMBER_OF_MONTHS = 24
+LAST_REFRESHED = '2024-03-22'
+
+# Functions
+
+def month_end_dates(number_of_months, last_refreshed=LAST_REFRESHED):
+    """
+    Builds Alpha Vantage style monthly bar dates, newest first.
+
+    Parameters:
+    number_of_months (int): Number of monthly bars.
+    last_refreshed (str): Date of the newest, partial month bar.
+
+    Returns:
+    list: ISO dates, newest first.
+    """
+    months = np.datetime64(last_refreshed, 'M') - np.arange(1, number_of_months)
+    month_ends = (months + 1).astype('datetime64[D]') - 1
+    return [last_refreshed] + [str(date) for date in month_ends]
+
+def monthly_payloads(number_of_stocks, number_of_months=NUMBER_OF_MONTHS, seed=0):
+    """
+    Generates TIME_SERIES_MONTHLY payloads following random walks.
+
+    Parameters:
+    number_of_stocks (int): Number of tickers.
+    number_of_months (int): Number of monthly bars per ticker.
+    seed (int): Random seed.
+
+    Returns:
+    list: Payload dictionaries, tickers named 'S00000', 'S00001', ...
+    """
+    rng = np.random.default_rng(seed)
+    dates = month_end_dates(number_of_months)
+    closes = 50 * np.cumprod(1 + rng.normal(0.005, 0.08, (number_of_stocks, number_of_months)), axis=1)
+    volumes = rng.integers(10 ** 5, 10 ** 8, (number_of_stocks, number_of_months))
+
+    payloads = []
+    for row in range(number_of_stocks):
+        series = {}
+        for column, date in enumerate(dates):
+            close = f"{closes[row, column]:.4f}"
+            series[date] = {"1. open": close, "2. high": close, "3. low": close, "4. close": close, "5. volume": str(volumes[row, column])}
+        payloads.append({
+            "Meta Data": {
+                "1. Information": "Monthly Prices (open, high, low, close) and Volumes",
+                "2. Symbol": f"S{row:05d}",
+                "3. Last Refreshed": dates[0],
+                "4. Time Zone": "US/Eastern"
+            },
+            "Monthly Time Series": series
+        })
+    return payloads
+
+def overview_payloads(number_of_stocks, seed=0):
+    """
+    Generates OVERVIEW payloads with random valuation ratios.
+
+    Parameters:
+    number_of_stocks (int): Number of tickers.
+    seed (int): Random seed.
+
+    Returns:
+    list: Payload dictionaries with the ratio fields `utils.get_ratios` reads.
+    """
+    rng = np.random.default_rng(seed + 1)
+    ratios = rng.lognormal(2, 0.6, (number_of_stocks, 5))
+    keys = ["PERatio", "PriceToBookRatio", "PriceToSalesRatioTTM", "EVToEBITDA", "EVToRevenue"]
+    return [
+        {"Symbol": f"S{row:05d}", **{key: f"{ratios[row, column]:.2f}" for column, key in enumerate(keys)}}
+        for row in range(number_of_stocks)
+    ]
@@ -1,15 +1,21 @@
-# Standard Imports
-import os
-import pandas as pd
-
 # Local Import
 from utils import utils
+from utils import refresh
+from utils import providers
+from utils import instrumentation
+from utils.cache import ResponseCache
 from src.portfolio_management import price_momentum
-from src.investment_analysis import ratio_analysis
 
 # Constants
 ALPHAVANTAGE_API_KEY = "demo"
+# Key tier setting the request quotas, "free" or "premium".
+ALPHAVANTAGE_TIER = "free"
 BASE_API_URL = "https://www.alphavantage.co/query"
+CACHE_DIRECTORY = "data/cache"
+STATE_PATH = "data/state/monthly_returns.json"
+
+# Opt-in stage timing, e.g. FINANCE_TOOLS_PROFILE=1 or FINANCE_TOOLS_PROFILE=cprofile,tracemalloc
+profiling = instrumentation.enable_from_environment()
 
 # Input the portfolio amount
 try:
@@ -25,16 +31,14 @@ stock_tickers = utils.get_stock_tickers("data\\raw_data\stocks.csv")
 
 # <------------------------------------------------------------->
 
-# Fetch the stock data
-FUNCTION = 'TIME_SERIES_MONTHLY'
-stock_data_monthly = utils.get_stock_data(stock_tickers, BASE_API_URL, ALPHAVANTAGE_API_KEY, FUNCTION)
+provider = providers.AlphaVantageProvider(BASE_API_URL, ALPHAVANTAGE_API_KEY, ALPHAVANTAGE_TIER)
 
-# Obtain Price and monthly returns dataframe
-stock_price_data = utils.extract_last_closing_price(stock_data_monthly)
-
-# Obtain Price Returns
+# Refresh the monthly price returns: only tickers with a newer bar than the stored state are streamed,
+# and those go through the response cache so a rerun within its TTL does no network I/O
 time_periods = ['One-Year', 'Six-Month', 'Three-Month', 'One-Month']
-stock_price_return_data = utils.calculate_monthly_return_percentage(stock_data_monthly, time_periods)
+response_cache = ResponseCache(CACHE_DIRECTORY)
+stock_price_return_data = refresh.refresh_monthly_return_percentage(stock_tickers, BASE_API_URL, ALPHAVANTAGE_API_KEY, time_periods, state_path=STATE_PATH, provider=provider, cache=response_cache)
+print(f"Cache hits: {response_cache.hits}, misses: {response_cache.misses}")
 
 # Run the price momentum strategy
 price_momentum_data = price_momentum.get_high_quality_momentum_stocks(stock_price_return_data)
@@ -46,3 +50,6 @@ price_momentum_data = utils.calculate_number_of_shares_to_buy(portfolio_amount,
 price_momentum.save_recommended_trades(price_momentum_data)
 
 print("Recommended trades have been saved to 'recommended_trades.xlsx'.")
+
+if profiling:
+    instrumentation.emit()
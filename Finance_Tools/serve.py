@@ -0,0 +1,85 @@
+# Standard Imports
+import os
+import sys
+import argparse
+
+# Local Import
+import batch
+from utils import utils
+from utils import fetcher
+from utils import instrumentation
+from utils.cache import ResponseCache
+from utils.price_store import PriceStore
+from src import service
+from src import strategies
+
+# Functions
+
+def parse_arguments(arguments=None):
+    parser = argparse.ArgumentParser(description="Keep strategy scores in memory, refresh them on a schedule and answer queries over HTTP.")
+    parser.add_argument("--strategies", nargs="+", default=list(service.SCORES), choices=list(service.SCORES), help="Strategies to score.")
+    parser.add_argument("--tickers", default=batch.TICKERS_FILE, help="CSV file with a Ticker column.")
+    parser.add_argument("--frequency", default="M", choices=list(batch.FREQUENCIES), help="Bar frequency: M for monthly, D for daily with trading-day lookbacks.")
+    parser.add_argument("--interval", type=float, default=service.REFRESH_INTERVAL, help="Seconds between refreshes.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on.")
+    parser.add_argument("--port", type=int, default=8080, help="TCP port to listen on.")
+    parser.add_argument("--socket", help="Unix socket path to listen on instead of TCP.")
+    parser.add_argument("--api-key", default=os.environ.get("ALPHAVANTAGE_API_KEY", "demo"), help="Alpha Vantage API key.")
+    parser.add_argument("--tier", default=os.environ.get("ALPHAVANTAGE_TIER"), choices=list(fetcher.TIERS), help="Alpha Vantage key tier setting the request quotas, free if omitted.")
+    parser.add_argument("--base-url", default=None, help="Provider base URL, the provider's public endpoint if omitted.")
+    parser.add_argument("--provider", default="alphavantage", choices=list(batch.PROVIDERS), help="Market data provider.")
+    parser.add_argument("--iex-token", default=os.environ.get("IEX_CLOUD_API_TOKEN"), help="IEX Cloud API token.")
+    parser.add_argument("--cache-dir", default=batch.CACHE_DIRECTORY, help="Response cache directory.")
+    parser.add_argument("--price-store", help="Price history directory to merge the series into.")
+    parser.add_argument("--rolling-state", help="File of rolling momentum statistics, updated with only the new bars.")
+    parser.add_argument("--no-cache", action="store_true", help="Always fetch from the API.")
+    parser.add_argument("--prices-file", help="Local CSV or Parquet dump of daily or monthly bars; reloaded on every refresh instead of the API.")
+    parser.add_argument("--overview-file", help="Local CSV or Parquet dump of OVERVIEW fundamentals, used with --prices-file.")
+    return parser.parse_args(arguments)
+
+def create_loader(arguments):
+    """
+    Builds the function each refresh calls to load a new Dataset through the batch fetch path.
+
+    Parameters:
+    arguments (Namespace): Parsed command line arguments.
+
+    Returns:
+    callable: Function without arguments returning a Dataset.
+    """
+    store = PriceStore.create(arguments.price_store, frequency=arguments.frequency) if arguments.price_store else None
+    if store is not None and store.frequency != arguments.frequency:
+        raise SystemExit(f"Price store {arguments.price_store} holds '{store.frequency}' bars, not '{arguments.frequency}'.")
+    cache = None if arguments.no_cache else ResponseCache(arguments.cache_dir)
+    provider = batch.create_provider(arguments)
+
+    def load():
+        # Re-read on every refresh so edits to the tickers file are picked up.
+        stock_tickers = utils.get_stock_tickers(arguments.tickers)
+        if arguments.prices_file:
+            return strategies.load_offline_dataset(arguments.prices_file, arguments.strategies, arguments.overview_file, stock_tickers, store=store, frequency=arguments.frequency, rolling_state=arguments.rolling_state)
+        return strategies.load_dataset(stock_tickers, provider.base_api_url, arguments.api_key, arguments.strategies, cache=cache, store=store, provider=provider, frequency=arguments.frequency, rolling_state=arguments.rolling_state)
+    return load
+
+def main(arguments=None):
+    arguments = parse_arguments(arguments)
+    profiling = instrumentation.enable_from_environment()
+
+    scoring = service.ScoringService(create_loader(arguments), arguments.strategies, arguments.interval)
+    scoring.start()
+    server = service.create_server(scoring, arguments.host, arguments.port, arguments.socket)
+    address = arguments.socket or f"http://{arguments.host}:{server.server_address[1]}"
+    print(f"Serving {', '.join(arguments.strategies)} scores for {len(scoring.snapshot.tickers)} tickers on {address}.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        scoring.stop()
+    if profiling:
+        instrumentation.emit()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
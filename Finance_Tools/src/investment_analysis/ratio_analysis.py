@@ -1,8 +1,13 @@
 # Standard Imports
-import xlsxwriter
-import pandas as pd
-from scipy import stats
-from statistics import mean
+import numpy as np
+
+from utils import lazy
+from utils import ranking
+from utils import selection
+from utils import export
+from utils import instrumentation
+
+pd = lazy.lazy_import('pandas')
 
 # Constants
 metrics = {
@@ -12,9 +17,29 @@ metrics = {
     'EV/EBITDA': 'EV/EBITDA Percentile',
     'EV/RE': 'EV/RE Percentile'
 }
+# How each ratio's unusable values are ranked. 'negative': 'keep' ranks negative
+# values as numbers, 'missing' leaves them out, 'worst' ranks them as the most
+# expensive; 'missing': 'omit' leaves missing values out of the ranking and the
+# RV score, 'worst' ranks them as the most expensive.
+DEFAULT_RATIO_RULE = {'negative': 'keep', 'missing': 'omit'}
+RATIO_RULES = {
+    'Price-to-Earnings Ratio': {'negative': 'worst', 'missing': 'omit'},
+    'EV/EBITDA': {'negative': 'worst', 'missing': 'omit'}
+}
+OUTPUT_FILE = 'data/output_data/recommended_value_trades.xlsx'
+SHEET_NAME = 'ratio_analysis'
+EXPORT_SCHEMA = [
+    ('Ticker', 'string'),
+    ('Price', 'dollar'),
+    ('Number of Shares to Buy', 'integer'),
+    ('* Percentile', 'percent'),
+    ('RV Score', 'float'),
+    ('*', 'float')
+]
 
 # Functions
 
+@instrumentation.timed()
 def extract_attributes(stock_data):
     """
     Extracts attributes from stock data.
@@ -27,53 +52,87 @@ def extract_attributes(stock_data):
     """
 
     stock_data_columns = ['Ticker', 'Price', 'Number of Shares to Buy', 'Price-to-Earnings Ratio', 'PE Percentile', 'Price-to-Book Ratio', 'PB Percentile', 'Price-to-Sales Ratio', 'PS Percentile', 'EV/EBITDA', 'EV/EBITDA Percentile', 'EV/RE', 'EV/RE Percentile', 'RV Score']
-    stock_attributes = pd.DataFrame(columns=stock_data_columns)
-    for row in stock_data.index:
-        stock_attributes = stock_attributes.append(
-            pd.Series(
-                [
-                    stock_data.loc[row, 'Ticker'],
-                    stock_data.loc[row, 'Price'],
-                    'N/A',
-                    stock_data.loc[row, 'Price-to-Earnings Ratio'],
-                    'N/A',
-                    stock_data.loc[row, 'Price-to-Book Ratio'],
-                    'N/A',
-                    stock_data.loc[row, 'Price-to-Sales Ratio'],
-                    'N/A',
-                    stock_data.loc[row, 'EV/EBITDA'],
-                    'N/A',
-                    stock_data.loc[row, 'EV/RE'],
-                    'N/A',
-                    'N/A'
-                ],
-                index=stock_data_columns
-            ),
-            ignore_index=True
-        )
-
-    return stock_attributes
-
-def calculate_ratios_percentile(stock_ratios):
+    number_of_stocks = len(stock_data)
+    columns = {}
+    for column in stock_data_columns:
+        if column == 'Ticker':
+            columns[column] = stock_data[column].to_numpy()
+        elif column in stock_data.columns:
+            columns[column] = stock_data[column].to_numpy(dtype=np.float64)
+        else:
+            columns[column] = np.full(number_of_stocks, np.nan)
+
+    return pd.DataFrame(columns, columns=stock_data_columns)
+
+def apply_ratio_rules(values, metric, rules=RATIO_RULES):
+    """
+    Applies one ratio's negative and missing value rules.
+
+    Parameters:
+    values (array-like): Values of the ratio, of any shape.
+    metric (str): Ratio name, a key of `metrics`.
+    rules (dict): Mapping of ratio name to its rule, see RATIO_RULES.
+
+    Returns:
+    ndarray: Copy ready for ranking; +inf ranks as the most expensive and NaN is left out.
+    """
+    rule = {**DEFAULT_RATIO_RULE, **rules.get(metric, {})}
+    values = np.array(values, dtype=np.float64)
+    missing = np.isnan(values)
+    negative = values < 0
+    if rule['negative'] == 'missing':
+        values[negative] = np.nan
+    elif rule['negative'] == 'worst':
+        values[negative] = np.inf
+    if rule['missing'] == 'worst':
+        values[missing] = np.inf
+    return values
+
+def value_percentiles(ratios, axis=0, groups=None):
+    """
+    Ranks ratios so that cheaper stocks get higher percentiles.
+
+    Parameters:
+    ratios (ndarray): Ratios after `apply_ratio_rules`.
+    axis (int): Axis along which stocks are compared.
+    groups (array-like): Optional group labels along `axis`, e.g. sectors.
+
+    Returns:
+    ndarray: Percentiles between 0 and 1, NaN where the ratio is left out.
+    """
+    return ranking.percentile_of_scores(-ratios, axis=axis, groups=groups) / 100
+
+@instrumentation.timed()
+def calculate_ratios_percentile(stock_ratios, group_by=None, rules=RATIO_RULES):
     """
     Calculates the percentile of ratios for each stock.
 
+    Lower ratios are better value, so they get higher percentiles.
+
     Parameters:
     stock_ratios (DataFrame): DataFrame containing stock ratios.
+    group_by (str): Optional column to rank within, e.g. 'Sector'.
+    rules (dict): Negative and missing value rules per ratio, see RATIO_RULES.
 
     Returns:
     DataFrame: DataFrame containing stock ratios and their percentiles.
     """
 
-    for metric, percentile_column in metrics.items():
-        stock_ratios[percentile_column] = stock_ratios[metric].apply(lambda x: stats.percentileofscore(stock_ratios[metric], x) / 100)
-    
+    ratios = np.stack([apply_ratio_rules(stock_ratios[metric].to_numpy(dtype=np.float64, na_value=np.nan), metric, rules) for metric in metrics], axis=1)
+    groups = stock_ratios[group_by].to_numpy() if group_by is not None else None
+    percentiles = value_percentiles(ratios, axis=0, groups=groups)
+    for column, percentile_column in enumerate(metrics.values()):
+        stock_ratios[percentile_column] = percentiles[:, column]
     return stock_ratios
 
+@instrumentation.timed()
 def calculate_rv_score(stock_data):
     """
     Calculates the Robust Value (RV) score for each stock.
 
+    The score is the mean of the available percentiles; stocks without any
+    are left unscored.
+
     Parameters:
     stock_data (DataFrame): DataFrame containing stock data.
 
@@ -81,30 +140,29 @@ def calculate_rv_score(stock_data):
     DataFrame: DataFrame containing stock data with RV scores.
     """
 
-    for row in stock_data.index:
-        rv_percentiles = []
-        for metric in metrics.keys():
-            rv_percentiles.append(stock_data.loc[row, metrics[metric]])
-        stock_data.loc[row, 'RV Score'] = mean(rv_percentiles)
-    
+    percentiles = np.ma.masked_invalid(stock_data[list(metrics.values())].to_numpy(dtype=np.float64, na_value=np.nan))
+    stock_data['RV Score'] = percentiles.mean(axis=1).filled(np.nan)
     return stock_data
 
-def top_rv_stocks(stock_data, number_of_stocks):
+@instrumentation.timed()
+def top_rv_stocks(stock_data, number_of_stocks, min_score=None):
     """
     Returns the top n stocks based on the RV score.
 
+    The input DataFrame is left untouched; ties are broken by ticker.
+
     Parameters:
     stock_data (DataFrame): DataFrame containing stock data.
     number_of_stocks (int): Number of top stocks to return.
+    min_score (float): Minimum RV score for a stock to be selected.
 
     Returns:
     DataFrame: DataFrame containing top n stocks based on the RV score.
     """
 
-    stock_data.sort_values('RV Score', ascending=False, inplace=True)
-    stock_data = stock_data[:number_of_stocks]
-    return stock_data
+    return selection.select_top(stock_data, 'RV Score', number_of_stocks, min_score=min_score)
 
+@instrumentation.timed()
 def calculate_percentile_RV(stock_ratios):
     """
     Calculates the percentile of ratios for each stock and the Robust Value (RV) score.
@@ -122,86 +180,15 @@ def calculate_percentile_RV(stock_ratios):
     stock_ratios = top_rv_stocks(stock_ratios, 50)
     return stock_ratios
 
-def save_recommended_trades(ratio_data):
+@instrumentation.timed()
+def save_recommended_trades(ratio_data, file_path=OUTPUT_FILE):
     """
     Saves the recommended trades to a file.
 
     Parameters:
     ratio_data (DataFrame): DataFrame containing recommended trades.
+    file_path (str): Output path; the extension selects Excel, CSV, Parquet or Arrow.
     """
-    file_path = 'data/output_data/recommended_trades.xlsx'
-    writer = pd.ExcelWriter(file_path, engine='xlsxwriter')
-    ratio_data.to_excel(writer, sheet_name='ratio_analysis', index=False)
-
-    background_color = '#0a0a23'
-    font_color = '#ffffff'
-
-    string_format = writer.book.add_format(
-        {
-            'font_color': font_color,
-            'bg_color': background_color,
-            'border': 1
-        }
-    )
-
-    dollar_format = writer.book.add_format(
-        {
-            'num_format':'$0.00',
-            'font_color': font_color,
-            'bg_color': background_color,
-            'border': 1
-        }
-    )
-
-    integer_format = writer.book.add_format(
-        {
-            'num_format':'0',
-            'font_color': font_color,
-            'bg_color': background_color,
-            'border': 1
-        }
-    )
-
-    float_format = writer.book.add_format(
-        {
-            'num_format':'0.00',
-            'font_color': font_color,
-            'bg_color': background_color,
-            'border': 1
-        }
-    )
-
-    percent_format = writer.book.add_format(
-        {
-            'num_format':'0.0%',
-            'font_color': font_color,
-            'bg_color': background_color,
-            'border': 1
-        }
-    )
-
-    column_formats = {
-        'A': ['Ticker', string_format],
-        'B': ['Price', dollar_format],
-        'C': ['Number of Shares to Buy', integer_format],
-        'D': ['Price-to-Earnings Ratio', float_format],
-        'E': ['PE Percentile', percent_format],
-        'F': ['Price-to-Book Ratio', float_format],
-        'G': ['PB Percentile', percent_format],
-        'H': ['Price-to-Sales Ratio', float_format],
-        'I': ['PS Percentile', percent_format],
-        'J': ['EV/EBITDA', float_format],
-        'K': ['EV/EBITDA Percentile', percent_format],
-        'L': ['EV/RE', float_format],
-        'M': ['EV/RE Percentile', percent_format],
-        'N': ['RV Score', float_format]
-    }
-
-    for column, format in column_formats.items():
-        writer.sheets['ratio_analysis'].set_column(f'{column}:{column}', 25, format[1])
-        writer.sheets['ratio_analysis'].write(f'{column}1', format[0], format[1])
-
-    writer.save()
+    export.export(file_path, [(SHEET_NAME, ratio_data, EXPORT_SCHEMA)])
 
     return None
-
@@ -0,0 +1,285 @@
+# Standard Imports
+import numpy as np
+
+from utils import lazy
+from utils import ranking
+from utils import providers
+from utils import timeseries
+from utils import position_sizing
+from utils.utils import LOOKBACK_MONTHS, LOOKBACK_PERIODS
+from src.investment_analysis import ratio_analysis
+
+pd = lazy.lazy_import('pandas')
+
+# Constants
+MONTHS_PER_YEAR = 12
+DEFAULT_HORIZONS = list(LOOKBACK_MONTHS.values())
+
+# Functions
+
+def forward_fill(matrix):
+    """
+    Carries each row's last valid value forward over NaN gaps.
+
+    Parameters:
+    matrix (ndarray): Ticker x date matrix.
+
+    Returns:
+    ndarray: Matrix with gaps filled, leading NaNs kept.
+    """
+    positions = np.where(~np.isnan(matrix), np.arange(matrix.shape[1]), -1)
+    np.maximum.accumulate(positions, axis=1, out=positions)
+    filled = matrix[np.arange(matrix.shape[0])[:, None], np.maximum(positions, 0)]
+    filled[positions < 0] = np.nan
+    return filled
+
+def historical_returns(close, horizons):
+    """
+    Computes every horizon's percentage return at every date.
+
+    Parameters:
+    close (ndarray): Ticker x date closing prices.
+    horizons (list): Horizons as month counts or (lookback, skip) pairs.
+
+    Returns:
+    ndarray: Horizon x ticker x date returns, NaN where the history is too short.
+    """
+    lookbacks, skips = timeseries.parse_horizons(horizons)
+    number_of_dates = close.shape[1]
+    returns = np.full((len(lookbacks),) + close.shape, np.nan)
+    for index, (lookback, skip) in enumerate(zip(lookbacks, skips)):
+        if lookback >= number_of_dates:
+            continue
+        current = close[:, lookback - skip:number_of_dates - skip]
+        past = close[:, :number_of_dates - lookback]
+        returns[index, :, lookback:] = (current - past) / past * 100
+    return returns
+
+def hqm_scores(close, horizons=DEFAULT_HORIZONS):
+    """
+    Computes the HQM score of every ticker at every date.
+
+    This is the vectorized equivalent of running `calculate_return_percentile`
+    and `calculate_hqm_score` on the cross-section at each date.
+
+    Parameters:
+    close (ndarray): Ticker x date closing prices.
+    horizons (list): Horizons as month counts or (lookback, skip) pairs.
+
+    Returns:
+    ndarray: Ticker x date HQM scores between 0 and 1.
+    """
+    percentiles = ranking.percentile_of_scores(historical_returns(close, horizons), axis=1) / 100
+    return percentiles.mean(axis=0)
+
+def rv_scores(ratio_panel, metrics=None):
+    """
+    Computes the RV score of every ticker at every date.
+
+    This is the vectorized equivalent of running `calculate_ratios_percentile`
+    and `calculate_rv_score` on the cross-section at each date.
+
+    Parameters:
+    ratio_panel (dict): Mapping of each `ratio_analysis.metrics` ratio to a ticker x date matrix.
+    metrics (list): Ratios to average, all of `ratio_analysis.metrics` if None.
+
+    Returns:
+    ndarray: Ticker x date RV scores between 0 and 1.
+    """
+    metrics = list(ratio_analysis.metrics) if metrics is None else list(metrics)
+    ratios = np.stack([ratio_analysis.apply_ratio_rules(ratio_panel[metric], metric) for metric in metrics])
+    return np.ma.masked_invalid(ratio_analysis.value_percentiles(ratios, axis=1)).mean(axis=0).filled(np.nan)
+
+def default_horizons(frequency='M'):
+    """
+    Returns the HQM horizons counted in periods of a frequency.
+
+    Parameters:
+    frequency (str): 'D', 'W' or 'M'; other frequencies fall back to months.
+
+    Returns:
+    list: One-year, six-month, three-month and one-month horizons.
+    """
+    return list(LOOKBACK_PERIODS.get(frequency or 'M', LOOKBACK_MONTHS).values())
+
+def periods_per_year(frequency='M'):
+    return timeseries.PERIODS_PER_YEAR.get(frequency or 'M', MONTHS_PER_YEAR)
+
+def tie_keys(tie_breakers, count):
+    """
+    Converts tie breakers to integer ranks, ascending.
+
+    Parameters:
+    tie_breakers (array-like): Value per ticker, e.g. tickers; row order if None.
+    count (int): Number of tickers.
+
+    Returns:
+    ndarray: Rank of each ticker's tie breaker.
+    """
+    if tie_breakers is None:
+        return np.arange(count)
+    return np.unique(np.asarray(tie_breakers), return_inverse=True)[1].reshape(-1)
+
+def select_top(scores, number_of_stocks, tie_breakers=None):
+    """
+    Selects the highest scoring tickers at every date.
+
+    Equal scores are ordered by `tie_breakers`, like `selection.top_positions`,
+    so the selection never depends on the sort algorithm.
+
+    Parameters:
+    scores (ndarray): Ticker x date scores, NaN for ineligible tickers.
+    number_of_stocks (int): Number of tickers to hold.
+    tie_breakers (array-like): Value per ticker ordering equal scores ascending, e.g. tickers; row order if None.
+
+    Returns:
+    ndarray: Boolean ticker x date selection mask.
+    """
+    eligible = np.where(np.isnan(scores), -np.inf, scores)
+    count = min(number_of_stocks, scores.shape[0])
+    selected = np.zeros(scores.shape, dtype=bool)
+    if count == 0:
+        return selected
+    keys = tie_keys(tie_breakers, scores.shape[0])
+    top = np.lexsort((np.broadcast_to(keys[:, None], scores.shape), -eligible), axis=0)[:count]
+    np.put_along_axis(selected, top, True, axis=0)
+    return selected & ~np.isnan(scores)
+
+def run_backtest(prices, scores, dates, portfolio_amount, number_of_stocks=50, periods_per_year=MONTHS_PER_YEAR, tie_breakers=None):
+    """
+    Rebalances into the top scoring tickers at every date and tracks the portfolio.
+
+    Positions are sized like the strategies' default equal sizing, through
+    `position_sizing.allocate_shares`: whole shares of an equal slice of the
+    current equity, with the leftover cash spent best score first; whatever
+    is still unspent is carried.
+
+    Parameters:
+    prices (ndarray): Ticker x date closing prices.
+    scores (ndarray): Ticker x date strategy scores, NaN where not yet available.
+    dates (array-like): Date of each column.
+    portfolio_amount (float): Starting capital.
+    number_of_stocks (int): Number of tickers to hold after each rebalance.
+    periods_per_year (int): Number of dates per year, used to annualize the Sharpe ratio.
+    tie_breakers (array-like): Value per ticker ordering equal scores, e.g. tickers; row order if None.
+
+    Returns:
+    dict: Equity curve, periodic returns, turnover and drawdown series, and summary statistics.
+    """
+    prices = forward_fill(np.asarray(prices, dtype=np.float64))
+    selected = select_top(scores, number_of_stocks, tie_breakers)
+    keys = tie_keys(tie_breakers, prices.shape[0])
+    tradable = ~np.isnan(prices)
+    start = int(np.argmax(selected.any(axis=0))) if selected.any() else prices.shape[1]
+
+    dates = pd.Index(dates)[start:]
+    equity = np.full(len(dates), float(portfolio_amount))
+    turnover = np.zeros(len(dates))
+    shares = np.zeros(prices.shape[0])
+    cash = float(portfolio_amount)
+
+    for offset, column in enumerate(range(start, prices.shape[1])):
+        price = np.where(tradable[:, column], prices[:, column], 0.0)
+        value = cash + shares @ price
+        equity[offset] = value
+
+        held = np.flatnonzero(selected[:, column] & tradable[:, column])
+        held = held[np.lexsort((keys[held], -scores[held, column]))]
+        target = np.zeros_like(shares)
+        if len(held):
+            target[held], _ = position_sizing.allocate_shares(value, price[held], position_sizing.equal_weights(len(held)))
+        turnover[offset] = np.abs(target - shares) @ price / value if value > 0 else 0.0
+        cash = value - target @ price
+        shares = target
+
+    equity = pd.Series(equity, index=dates, name='Equity')
+    returns = equity.pct_change().dropna()
+    drawdown = equity / equity.cummax() - 1
+    volatility = returns.std()
+    sharpe = returns.mean() / volatility * np.sqrt(periods_per_year) if volatility > 0 else np.nan
+
+    return {
+        'equity': equity,
+        'returns': returns,
+        'turnover': pd.Series(turnover, index=dates, name='Turnover'),
+        'drawdown': drawdown.rename('Drawdown'),
+        'summary': {
+            'total_return': equity.iloc[-1] / equity.iloc[0] - 1 if len(equity) else np.nan,
+            'sharpe': sharpe,
+            'max_drawdown': drawdown.min() if len(drawdown) else np.nan,
+            'average_turnover': turnover.mean() if len(turnover) else np.nan
+        }
+    }
+
+def backtest_hqm(price_matrix, portfolio_amount, number_of_stocks=50, horizons=None):
+    """
+    Backtests the High-Quality Momentum strategy over a PriceMatrix.
+
+    Parameters:
+    price_matrix (PriceMatrix): Closing prices at any frequency.
+    portfolio_amount (float): Starting capital.
+    number_of_stocks (int): Number of stocks to hold.
+    horizons (list): Momentum horizons as period counts or (lookback, skip) pairs, the matrix frequency's defaults if None.
+
+    Returns:
+    dict: Backtest results, see `run_backtest`.
+    """
+    horizons = default_horizons(price_matrix.frequency) if horizons is None else horizons
+    scores = hqm_scores(price_matrix.close.astype(np.float64), horizons)
+    return run_backtest(price_matrix.close, scores, price_matrix.dates, portfolio_amount, number_of_stocks, periods_per_year(price_matrix.frequency), price_matrix.tickers)
+
+def ratio_matrix(values, metric, shape):
+    """
+    Broadcasts one ratio of a ratio panel to a ticker x date matrix.
+
+    Parameters:
+    values (array-like): Per-ticker vector or ticker x date matrix.
+    metric (str): Ratio name, used in the error message.
+    shape (tuple): Shape of the price matrix, (tickers, dates).
+
+    Returns:
+    ndarray: Float matrix of `shape`.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1 and values.shape == shape[:1]:
+        values = values[:, None]
+    elif values.shape != shape:
+        raise ValueError(f"Ratio '{metric}' has shape {values.shape}; expected a per-ticker vector of {shape[0]} or a {shape[0]} x {shape[1]} matrix.")
+    return np.broadcast_to(values, shape)
+
+def backtest_rv(price_matrix, ratio_panel, portfolio_amount, number_of_stocks=50):
+    """
+    Backtests the Robust Value strategy over a PriceMatrix.
+
+    Parameters:
+    price_matrix (PriceMatrix): Closing prices at any frequency.
+    ratio_panel (dict): Mapping of each `ratio_analysis.metrics` ratio to a ticker x date matrix,
+                        or to a per-ticker vector when only a snapshot is available.
+    portfolio_amount (float): Starting capital.
+    number_of_stocks (int): Number of stocks to hold.
+
+    Returns:
+    dict: Backtest results, see `run_backtest`.
+    """
+    shape = price_matrix.close.shape
+    panel = {metric: ratio_matrix(values, metric, shape) for metric, values in ratio_panel.items()}
+    scores = rv_scores(panel)
+    scores[np.isnan(price_matrix.close)] = np.nan
+    return run_backtest(price_matrix.close, scores, price_matrix.dates, portfolio_amount, number_of_stocks, periods_per_year(price_matrix.frequency), price_matrix.tickers)
+
+def load_cached_price_matrix(cache, stock_tickers, function='TIME_SERIES_MONTHLY', provider=None):
+    """
+    Builds a PriceMatrix from cached payloads only, without network access.
+
+    Parameters:
+    cache (ResponseCache): Response cache holding the payloads.
+    stock_tickers (list): Tickers to load; tickers missing from the cache are skipped.
+    function (str): Alpha Vantage function the payloads were fetched with.
+    provider (Provider): Provider the payloads were fetched from, Alpha Vantage if None.
+
+    Returns:
+    PriceMatrix: Matrix of the cached tickers.
+    """
+    provider = provider or providers.AlphaVantageProvider()
+    payloads = [cache.get(function, ticker, provider.cache_params(function, ticker), ignore_ttl=True) for ticker in stock_tickers]
+    return timeseries.build_price_matrix(payload for payload in payloads if payload is not None)
@@ -0,0 +1,71 @@
+# Standard Imports
+import numpy as np
+
+from utils import lazy
+from utils import export
+from utils import position_sizing
+from utils import instrumentation
+
+pd = lazy.lazy_import('pandas')
+
+# Constants
+OUTPUT_FILE = 'data/output_data/recommended_equal_weight_trades.xlsx'
+SHEET_NAME = 'equal_weight'
+EXPORT_SCHEMA = [
+    ('Ticker', 'string'),
+    ('Price', 'dollar'),
+    ('Market Capitalization', 'dollar'),
+    ('Number of Shares to Buy', 'integer')
+]
+
+# Functions
+
+@instrumentation.timed()
+def extract_attributes(stock_data, price_data):
+    """
+    Extracts the equal-weight attributes from company overviews.
+
+    Parameters:
+    stock_data (list): List of OVERVIEW dictionaries.
+    price_data (dict): Mapping of ticker to latest closing price.
+
+    Returns:
+    DataFrame: DataFrame with Ticker, Price, Market Capitalization and an empty share count.
+    """
+    tickers = [data.get("Symbol") for data in stock_data]
+    market_caps = pd.to_numeric(pd.Series([data.get("MarketCapitalization") for data in stock_data], dtype=object), errors='coerce')
+    return pd.DataFrame({
+        'Ticker': tickers,
+        'Price': np.array([price_data.get(ticker, np.nan) for ticker in tickers], dtype=np.float64),
+        'Market Capitalization': market_caps.to_numpy(dtype=np.float64),
+        'Number of Shares to Buy': np.full(len(tickers), np.nan)
+    })
+
+@instrumentation.timed()
+def calculate_equal_weight_shares(portfolio_amount, Dataframe, lot_size=1, min_position=0.0):
+    """
+    Splits the portfolio equally across every stock with a price, spending the cash left by rounding.
+
+    Parameters:
+    portfolio_amount (float): Amount to invest in the portfolio.
+    Dataframe (DataFrame): DataFrame containing a Price column.
+    lot_size (int): Shares per tradable lot.
+    min_position (float): Smallest position value worth holding.
+
+    Returns:
+    DataFrame: DataFrame with the number of shares to buy calculated.
+    """
+    return position_sizing.size_positions(portfolio_amount, Dataframe, 'equal', lot_size=lot_size, min_position=min_position)
+
+@instrumentation.timed()
+def save_recommended_trades(Dataframe, file_path=OUTPUT_FILE):
+    """
+    Saves the recommended trades to a file.
+
+    Parameters:
+    Dataframe (DataFrame): DataFrame containing recommended trades.
+    file_path (str): Output path; the extension selects Excel, CSV, Parquet or Arrow.
+    """
+    export.export(file_path, [(SHEET_NAME, Dataframe, EXPORT_SCHEMA)])
+
+    return None
@@ -1,12 +1,65 @@
 # Standard Imports
-import pandas as pd
-from scipy import stats
-from statistics import mean
+import numpy as np
+
+from utils import lazy
+from utils import ranking
+from utils import selection
+from utils import export
+from utils import rolling
+from utils import instrumentation
+
+pd = lazy.lazy_import('pandas')
 
 # Constants
 time_periods = ['One-Year', 'Six-Month', 'Three-Month', 'One-Month']
+OUTPUT_FILE = 'data/output_data/recommended_trades.xlsx'
+SHEET_NAME = 'price_momentum'
+EXPORT_SCHEMA = [
+    ('Ticker', 'string'),
+    ('Price', 'dollar'),
+    ('Number of Shares to Buy', 'integer'),
+    ('* Price Return', 'percent'),
+    ('* Return Percentile', 'percent'),
+    ('Volatility-Adjusted Momentum', 'float'),
+    ('Rolling Sharpe', 'float'),
+    ('Drawdown', 'percent'),
+    ('* Percentile', 'percent'),
+    ('HQM Score', 'percent')
+]
+# Weight of each rolling factor in the HQM score; every return percentile weighs 1.
+FACTOR_WEIGHTS = {
+    'Volatility-Adjusted Momentum': 1.0,
+    'Rolling Sharpe': 1.0,
+    'Drawdown': 0.5
+}
 
 # Functions
+def get_time_periods(Dataframe):
+    """
+    Lists the time periods that have a price return column.
+
+    Parameters:
+    Dataframe (DataFrame): DataFrame containing '<period> Price Return' columns.
+
+    Returns:
+    list: Time period labels in column order.
+    """
+    suffix = ' Price Return'
+    return [column[:-len(suffix)] for column in Dataframe.columns if column.endswith(suffix)]
+
+def get_factors(Dataframe):
+    """
+    Lists the rolling factors that have a column.
+
+    Parameters:
+    Dataframe (DataFrame): DataFrame possibly containing `rolling.FACTORS` columns.
+
+    Returns:
+    list: Factor names in `rolling.FACTORS` order.
+    """
+    return [factor for factor in rolling.FACTORS if factor in Dataframe.columns]
+
+@instrumentation.timed()
 def extract_attributes(Stock_Dataframe):
     """
     Extracts attributes from stock data.
@@ -17,84 +70,100 @@ def extract_attributes(Stock_Dataframe):
     Returns:
     DataFrame: DataFrame containing extracted attributes.
     """
-    Dataframe_columns = ['Ticker', 'Price', 'Number of Shares to Buy', 'One-Year Price Return', 'One-Year Return Percentile', 'Six-Month Price Return', 'Six-Month Return Percentile', 'Three-Month Price Return', 'Three-Month Return Percentile', 'One-Month Price Return', 'One-Month Return Percentile', 'HQM Score']
-    Dataframe = pd.DataFrame(columns=Dataframe_columns)
-    for row in Stock_Dataframe.index:
-        Dataframe = Dataframe.append(
-            pd.Series(
-                [
-                    Stock_Dataframe.loc[row, 'Ticker'],
-                    Stock_Dataframe.loc[row, 'Price'],
-                    'N/A',
-                    Stock_Dataframe.loc[row, 'One-Year Price Return'],
-                    'N/A',
-                    Stock_Dataframe.loc[row, 'Six-Month Price Return'],
-                    'N/A',
-                    Stock_Dataframe.loc[row, 'Three-Month Price Return'],
-                    'N/A',
-                    Stock_Dataframe.loc[row, 'One-Month Price Return'],
-                    'N/A',
-                    'N/A'
-                ],
-                index=Dataframe_columns
-            ),
-            ignore_index=True
-        )
-    return Dataframe
-
-def calculate_return_percentile(Dataframe):
+    Dataframe_columns = ['Ticker', 'Price', 'Number of Shares to Buy']
+    for time_period in get_time_periods(Stock_Dataframe):
+        Dataframe_columns += [f'{time_period} Price Return', f'{time_period} Return Percentile']
+    for factor in get_factors(Stock_Dataframe):
+        Dataframe_columns += [factor, f'{factor} Percentile']
+    Dataframe_columns.append('HQM Score')
+
+    number_of_stocks = len(Stock_Dataframe)
+    columns = {}
+    for column in Dataframe_columns:
+        if column == 'Ticker':
+            columns[column] = Stock_Dataframe[column].to_numpy()
+        elif column in Stock_Dataframe.columns:
+            columns[column] = Stock_Dataframe[column].to_numpy(dtype=np.float64)
+        else:
+            columns[column] = np.full(number_of_stocks, np.nan)
+    return pd.DataFrame(columns, columns=Dataframe_columns)
+
+@instrumentation.timed()
+def calculate_return_percentile(Dataframe, group_by=None):
     """
-    Calculates return percentiles for each time period.
+    Calculates return percentiles for each time period, and for each rolling factor present.
 
     Parameters:
     Dataframe (DataFrame): DataFrame containing stock data.
+    group_by (str): Optional column to rank within, e.g. 'Sector'.
 
     Returns:
     DataFrame: DataFrame with return percentiles calculated.
     """
-    for row in Dataframe.index:
-        for time_period in time_periods:
-            Dataframe.loc[row, f'{time_period} Return Percentile'] = stats.percentileofscore(Dataframe[f'{time_period} Price Return'], Dataframe.loc[row, f'{time_period} Price Return']) / 100
-    return Dataframe
+    periods = get_time_periods(Dataframe)
+    factors = get_factors(Dataframe)
+    return ranking.rank_percentiles(
+        Dataframe,
+        [f'{time_period} Price Return' for time_period in periods] + factors,
+        [f'{time_period} Return Percentile' for time_period in periods] + [f'{factor} Percentile' for factor in factors],
+        group_by=group_by
+    )
 
-def calculate_hqm_score(Dataframe):
+@instrumentation.timed()
+def calculate_hqm_score(Dataframe, factor_weights=None):
     """
     Calculates the High-Quality Momentum (HQM) score for each stock.
 
+    The score is the mean of the return percentiles. With `factor_weights`,
+    the percentiles of the rolling factors join the mean with their weights;
+    a factor a stock has no value for is left out of its mean.
+
     Parameters:
     Dataframe (DataFrame): DataFrame containing stock data.
+    factor_weights (dict): Mapping of `rolling.FACTORS` name to weight, e.g. FACTOR_WEIGHTS; None for returns only.
 
     Returns:
     DataFrame: DataFrame with HQM score calculated.
     """
-    for row in Dataframe.index:
-        momentum_percentiles = []
-        for time_period in time_periods:
-            momentum_percentiles.append(Dataframe.loc[row, f'{time_period} Return Percentile'])
-        Dataframe.loc[row, 'HQM Score'] = mean(momentum_percentiles)
+    percentile_columns = [f'{time_period} Return Percentile' for time_period in get_time_periods(Dataframe)]
+    percentiles = Dataframe[percentile_columns].to_numpy(dtype=np.float64)
+    factors = [factor for factor in (factor_weights or {}) if f'{factor} Percentile' in Dataframe.columns]
+    if not factors:
+        Dataframe['HQM Score'] = percentiles.mean(axis=1)
+        return Dataframe
+
+    weights = np.array([factor_weights[factor] for factor in factors], dtype=np.float64)
+    factor_percentiles = Dataframe[[f'{factor} Percentile' for factor in factors]].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(factor_percentiles)
+    total = percentiles.sum(axis=1) + np.where(valid, factor_percentiles, 0.0) @ weights
+    Dataframe['HQM Score'] = total / (len(percentile_columns) + valid @ weights)
     return Dataframe
 
-def get_top_momentum_stocks(Dataframe):
+@instrumentation.timed()
+def get_top_momentum_stocks(Dataframe, number_of_stocks=50, min_score=None):
     """
     Retrieves the top momentum stocks based on their HQM score.
 
+    The input DataFrame is left untouched; ties are broken by ticker.
+
     Parameters:
     Dataframe (DataFrame): DataFrame containing stock data.
+    number_of_stocks (int): Number of top stocks to return.
+    min_score (float): Minimum HQM score for a stock to be selected.
 
     Returns:
     DataFrame: DataFrame containing top momentum stocks.
     """
-    Dataframe.sort_values('HQM Score', ascending=False, inplace=True)
-    Dataframe = Dataframe[:50]
-    Dataframe.reset_index(drop=True, inplace=True)
-    return Dataframe
+    return selection.select_top(Dataframe, 'HQM Score', number_of_stocks, min_score=min_score).reset_index(drop=True)
 
-def get_high_quality_momentum_stocks(stock_data):
+@instrumentation.timed()
+def get_high_quality_momentum_stocks(stock_data, factor_weights=None):
     """
     Retrieves high-quality momentum stocks.
 
     Parameters:
     stock_data (list): List of dictionaries containing stock data.
+    factor_weights (dict): Weights of the rolling factor columns in the HQM score, None for returns only.
 
     Returns:
     DataFrame: DataFrame containing high-quality momentum stocks.
@@ -106,91 +175,22 @@ def get_high_quality_momentum_stocks(stock_data):
     with_percentiles = calculate_return_percentile(extracted_data)
     
     # Calculate HQM scores
-    with_scores = calculate_hqm_score(with_percentiles)
+    with_scores = calculate_hqm_score(with_percentiles, factor_weights)
     
     # Filter top momentum stocks
     top_momentum_stocks = get_top_momentum_stocks(with_scores)
     
     return top_momentum_stocks
 
-def save_recommended_trades(Dataframe):
+@instrumentation.timed()
+def save_recommended_trades(Dataframe, file_path=OUTPUT_FILE):
     """
     Saves the recommended trades to a file.
 
     Parameters:
     Dataframe (DataFrame): DataFrame containing recommended trades.
+    file_path (str): Output path; the extension selects Excel, CSV, Parquet or Arrow.
     """
-    file_path = 'data/output_data/recommended_trades.xlsx'
-    
-    writer = pd.ExcelWriter(file_path, engine='xlsxwriter')
-    Dataframe.to_excel(writer, sheet_name='price_momentum', index=False)
-
-    background_color = '#0a0a23'
-    font_color = '#ffffff'
-
-    string_format = writer.book.add_format(
-        {
-            'font_color': font_color,
-            'bg_color': background_color,
-            'border': 1
-        }
-    )
-
-    dollar_format = writer.book.add_format(
-        {
-            'num_format':'$0.00',
-            'font_color': font_color,
-            'bg_color': background_color,
-            'border': 1
-        }
-    )
-
-    integer_format = writer.book.add_format(
-        {
-            'num_format':'0',
-            'font_color': font_color,
-            'bg_color': background_color,
-            'border': 1
-        }
-    )
-
-    float_format = writer.book.add_format(
-        {
-            'num_format':'0.00',
-            'font_color': font_color,
-            'bg_color': background_color,
-            'border': 1
-        }
-    )
-
-    percent_format = writer.book.add_format(
-        {
-            'num_format':'0.0%',
-            'font_color': font_color,
-            'bg_color': background_color,
-            'border': 1
-        }
-    )
+    export.export(file_path, [(SHEET_NAME, Dataframe, EXPORT_SCHEMA)])
 
-    column_formats = {
-        'A': ['Ticker', string_format],
-        'B': ['Price', dollar_format],
-        'C': ['Number of Shares to Buy', integer_format],
-        'D': ['One-Year Price Return', percent_format],
-        'E': ['One-Year Return Percentile', percent_format],
-        'F': ['Six-Month Price Return', percent_format],
-        'G': ['Six-Month Return Percentile', percent_format],
-        'H': ['Three-Month Price Return', percent_format],
-        'I': ['Three-Month Return Percentile', percent_format],
-        'J': ['One-Month Price Return', percent_format],
-        'K': ['One-Month Return Percentile', percent_format],
-        'L': ['HQM Score', percent_format]
-    }
-
-    for column, format in column_formats.items():
-        writer.sheets['price_momentum'].set_column(f'{column}:{column}', 25, format[1])
-        writer.sheets['price_momentum'].write(f'{column}1', format[0], format[1])
-
-    writer.save()
-
-    return None
\ No newline at end of file
+    return None
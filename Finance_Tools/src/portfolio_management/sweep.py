@@ -0,0 +1,206 @@
+# Standard Imports
+import os
+import shutil
+import tempfile
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils import lazy
+from utils import export
+from utils import timeseries
+from utils import instrumentation
+from src.investment_analysis import ratio_analysis
+from src.portfolio_management import backtest
+
+pd = lazy.lazy_import('pandas')
+
+# Constants
+# RAM-backed on Linux, so workers map the matrices without touching disk.
+SHARED_DIRECTORY = '/dev/shm' if os.path.isdir('/dev/shm') else None
+OUTPUT_FILE = 'data/output_data/strategy_sweep.xlsx'
+SHEET_NAME = 'sweep'
+EXPORT_SCHEMA = [
+    ('Strategy', 'string'),
+    ('Variant', 'string'),
+    ('Number of Stocks', 'integer'),
+    ('Total Return', 'percent'),
+    ('Sharpe Ratio', 'float'),
+    ('Max Drawdown', 'percent'),
+    ('Average Turnover', 'percent')
+]
+
+# State
+# Arrays of the current process, set by `attach` in every worker.
+shared_arrays = {}
+
+# Functions
+
+def metric_subsets(minimum_size=1):
+    """
+    Lists every subset of the ratio metrics, largest first.
+
+    Parameters:
+    minimum_size (int): Smallest subset to include.
+
+    Returns:
+    list: Tuples of `ratio_analysis.metrics` keys.
+    """
+    metrics = list(ratio_analysis.metrics)
+    return [
+        subset
+        for size in range(len(metrics), minimum_size - 1, -1)
+        for subset in itertools.combinations(metrics, size)
+    ]
+
+def parameter_grid(horizon_sets=(), metric_sets=(), top_sizes=(50,)):
+    """
+    Groups the sweep variants into tasks that share one score calculation.
+
+    Every top-N size of a horizon set or metric subset reuses the same
+    scores, so a task covers all sizes of one of them.
+
+    Parameters:
+    horizon_sets (list): HQM horizon lists, each as period counts or (lookback, skip) pairs.
+    metric_sets (list): RV metric subsets, each a list of `ratio_analysis.metrics` keys.
+    top_sizes (list): Numbers of stocks to hold.
+
+    Returns:
+    list: (strategy, parameters, top sizes) tasks.
+    """
+    tasks = [('hqm', tuple(horizons), tuple(top_sizes)) for horizons in horizon_sets]
+    tasks += [('rv', tuple(metrics), tuple(top_sizes)) for metrics in metric_sets]
+    return tasks
+
+def share_arrays(arrays, directory):
+    """
+    Writes arrays to .npy files that workers memory-map instead of unpickling.
+
+    Parameters:
+    arrays (dict): Mapping of name to ndarray.
+    directory (str): Directory for the files.
+
+    Returns:
+    dict: Mapping of name to file path.
+    """
+    paths = {}
+    for name, array in arrays.items():
+        paths[name] = os.path.join(directory, f'{name}.npy')
+        np.save(paths[name], np.ascontiguousarray(array))
+    return paths
+
+def attach(sources):
+    """
+    Makes the sweep arrays available to `evaluate` in this process.
+
+    Parameters:
+    sources (dict): Mapping of name to an ndarray or to a .npy path, which is memory-mapped read-only.
+    """
+    shared_arrays.clear()
+    for name, source in sources.items():
+        shared_arrays[name] = np.load(source, mmap_mode='r') if isinstance(source, str) else source
+
+def evaluate(task):
+    """
+    Backtests one task against the attached arrays.
+
+    Parameters:
+    task (tuple): (strategy, parameters, top sizes, portfolio amount, frequency).
+
+    Returns:
+    list: One comparison row per top-N size.
+    """
+    strategy, parameters, top_sizes, portfolio_amount, frequency = task
+    close = shared_arrays['close']
+    dates = shared_arrays['dates']
+    tickers = shared_arrays['tickers']
+
+    if strategy == 'hqm':
+        scores = backtest.hqm_scores(np.asarray(close, dtype=np.float64), list(parameters))
+        variant = ', '.join(timeseries.horizon_label(horizon, frequency) for horizon in parameters)
+    else:
+        ratios = shared_arrays['ratios']
+        names = list(shared_arrays['ratio_names'])
+        panel = {}
+        for metric in parameters:
+            panel[metric] = ratios[names.index(metric)]
+        scores = backtest.rv_scores(panel, parameters)
+        scores[np.isnan(close)] = np.nan
+        variant = ', '.join(parameters)
+
+    rows = []
+    for number_of_stocks in top_sizes:
+        summary = backtest.run_backtest(close, scores, dates, portfolio_amount, number_of_stocks, backtest.periods_per_year(frequency), tickers)['summary']
+        rows.append({
+            'Strategy': strategy,
+            'Variant': variant,
+            'Number of Stocks': number_of_stocks,
+            'Total Return': summary['total_return'],
+            'Sharpe Ratio': summary['sharpe'],
+            'Max Drawdown': summary['max_drawdown'],
+            'Average Turnover': summary['average_turnover']
+        })
+    return rows
+
+@instrumentation.timed()
+def run_sweep(price_matrix, portfolio_amount, horizon_sets=None, metric_sets=(), top_sizes=(50,), ratio_panel=None, max_workers=None):
+    """
+    Backtests a grid of HQM and RV variants across a process pool.
+
+    The price and ratio matrices are written once to memory-mapped files that
+    every worker maps read-only, so only the small task tuples are pickled.
+    Tasks are independent, so throughput scales with the number of workers.
+
+    Parameters:
+    price_matrix (PriceMatrix): Closing prices at any frequency.
+    portfolio_amount (float): Starting capital of every variant.
+    horizon_sets (list): HQM horizon lists to test, the matrix frequency's default horizons if None.
+    metric_sets (list): RV metric subsets to test, e.g. `metric_subsets()`.
+    top_sizes (list): Numbers of stocks to hold.
+    ratio_panel (dict): Mapping of each ratio to a ticker x date matrix or a per-ticker vector, needed for RV variants.
+    max_workers (int): Number of worker processes, os.cpu_count() if None; 1 runs in this process.
+
+    Returns:
+    DataFrame: One row per variant and size, sorted by Sharpe ratio.
+    """
+    if metric_sets and ratio_panel is None:
+        raise ValueError("RV variants need a ratio_panel.")
+
+    if horizon_sets is None:
+        horizon_sets = [backtest.default_horizons(price_matrix.frequency)]
+    tasks = [task + (portfolio_amount, price_matrix.frequency or 'M') for task in parameter_grid(horizon_sets, metric_sets, top_sizes)]
+    arrays = {'close': np.asarray(price_matrix.close, dtype=np.float64), 'dates': np.asarray(price_matrix.dates), 'tickers': np.array(price_matrix.tickers, dtype=str)}
+    if ratio_panel is not None:
+        names = [metric for metric in ratio_analysis.metrics if metric in ratio_panel]
+        arrays['ratios'] = np.stack([backtest.ratio_matrix(ratio_panel[metric], metric, arrays['close'].shape) for metric in names])
+        arrays['ratio_names'] = np.array(names)
+
+    max_workers = min(max_workers or os.cpu_count() or 1, max(len(tasks), 1))
+    if max_workers == 1:
+        attach(arrays)
+        results = [evaluate(task) for task in tasks]
+    else:
+        directory = tempfile.mkdtemp(prefix='sweep-', dir=SHARED_DIRECTORY)
+        try:
+            sources = share_arrays(arrays, directory)
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=attach, initargs=(sources,)) as executor:
+                results = list(executor.map(evaluate, tasks))
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    comparison = pd.DataFrame([row for rows in results for row in rows], columns=[column for column, _ in EXPORT_SCHEMA])
+    return comparison.sort_values('Sharpe Ratio', ascending=False, kind='stable', na_position='last').reset_index(drop=True)
+
+@instrumentation.timed()
+def save_sweep(Dataframe, file_path=OUTPUT_FILE):
+    """
+    Saves the sweep comparison table to a file.
+
+    Parameters:
+    Dataframe (DataFrame): Comparison table from `run_sweep`.
+    file_path (str): Output path; the extension selects Excel, CSV, Parquet or Arrow.
+    """
+    export.export(file_path, [(SHEET_NAME, Dataframe, EXPORT_SCHEMA)])
+
+    return None
@@ -0,0 +1,263 @@
+# Standard Imports
+import os
+import sys
+import json
+import time
+import threading
+import socketserver
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+
+from utils import selection
+from utils import instrumentation
+from utils import position_sizing
+from src import strategies
+
+# Constants
+# Strategy name to (function scoring every stock, score column).
+SCORES = {
+    'hqm': (strategies.hqm_scores, 'HQM Score'),
+    'rv': (strategies.rv_scores, 'RV Score')
+}
+REFRESH_INTERVAL = 15 * 60
+DEFAULT_TOP = 50
+
+# Classes
+
+class Snapshot:
+    """
+    Scores of one data load, built once and never modified afterwards.
+
+    Every table holds the scored stocks best first with a Rank column, and
+    `rows` the same rows as JSON-ready dictionaries, so a top-N query is a
+    slice and a ticker query a dictionary lookup. Readers take a reference
+    to the current snapshot and keep using it for the whole request.
+    """
+
+    def __init__(self, dataset, strategy_names, refreshed_at=None):
+        self.dataset = dataset
+        self.refreshed_at = refreshed_at or time.time()
+        self.tickers = frozenset(dataset.price_matrix.tickers)
+        self.tables = {}
+        self.rows = {}
+        self.ranks = {}
+        for name in strategy_names:
+            score, column = SCORES[name]
+            scores = score(dataset)
+            table = selection.select_top(scores, column, len(scores)).reset_index(drop=True)
+            table.insert(0, 'Rank', np.arange(1, len(table) + 1))
+            self.tables[name] = table
+            self.rows[name] = records(table)
+            self.ranks[name] = dict(zip(table['Ticker'], range(len(table))))
+
+    def strategy(self, name):
+        if name not in self.tables:
+            raise ValueError(f"Unknown strategy '{name}'. Available: {', '.join(self.tables)}.")
+        return name
+
+    def top(self, name, number_of_stocks=DEFAULT_TOP):
+        """
+        Returns the best scoring stocks of a strategy.
+
+        Parameters:
+        name (str): Strategy name.
+        number_of_stocks (int): Number of stocks to return.
+
+        Returns:
+        list: Rows best first.
+        """
+        return self.rows[self.strategy(name)][:max(number_of_stocks, 0)]
+
+    def score(self, ticker):
+        """
+        Returns a stock's row and rank under every strategy.
+
+        Parameters:
+        ticker (str): Stock ticker.
+
+        Returns:
+        dict: Mapping of strategy name to the stock's row, None where it is unscored.
+        """
+        if ticker not in self.tickers:
+            raise LookupError(f"Unknown ticker '{ticker}'.")
+        return {name: self.rows[name][self.ranks[name][ticker]] if ticker in self.ranks[name] else None for name in self.tables}
+
+    def size(self, name, portfolio_amount, number_of_stocks=DEFAULT_TOP, sizing='equal', lot_size=1, min_position=0.0):
+        """
+        Splits a portfolio amount across a strategy's best scoring stocks.
+
+        Parameters:
+        name (str): Strategy name.
+        portfolio_amount (float): Amount to invest.
+        number_of_stocks (int): Number of stocks to buy.
+        sizing (str): Position sizing method, one of `position_sizing.METHODS`.
+        lot_size (int): Shares per tradable lot.
+        min_position (float): Smallest position value worth holding.
+
+        Returns:
+        list: Rows best first with the number of shares to buy.
+        """
+        if sizing not in position_sizing.METHODS:
+            raise ValueError(f"Unknown sizing '{sizing}'. Available: {', '.join(position_sizing.METHODS)}.")
+        if not portfolio_amount > 0:
+            raise ValueError("The portfolio amount must be positive.")
+        name = self.strategy(name)
+        trades = self.tables[name].iloc[:max(number_of_stocks, 0)].copy()
+        trades = strategies.size_trades(self.dataset, trades, portfolio_amount, sizing, SCORES[name][1], lot_size, min_position)
+        return records(trades[['Rank', 'Ticker', 'Price', SCORES[name][1], 'Number of Shares to Buy']])
+
+class ScoringService:
+    """
+    Keeps the latest Snapshot in memory and rebuilds it on a schedule.
+
+    A refresh loads and scores a whole new Snapshot off to the side and then
+    replaces the `snapshot` reference in one assignment, so readers see
+    either the old scores or the new ones, never a mix. A failed refresh
+    keeps serving the previous snapshot.
+    """
+
+    def __init__(self, load, strategy_names, interval=REFRESH_INTERVAL):
+        self.load = load
+        self.strategy_names = list(strategy_names)
+        self.interval = interval
+        self.snapshot = None
+        self.refresh_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    @instrumentation.timed()
+    def refresh(self):
+        """
+        Loads fresh data, scores it and swaps it in.
+
+        Returns:
+        Snapshot: The new snapshot.
+        """
+        with self.refresh_lock:
+            snapshot = Snapshot(self.load(), self.strategy_names)
+            self.snapshot = snapshot
+        return snapshot
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as error:
+                print(f"Refresh failed, still serving the scores from {time.ctime(self.snapshot.refreshed_at)}: {error}", file=sys.stderr)
+
+    def start(self):
+        """
+        Starts refreshing in a background thread, after a first synchronous refresh if nothing is loaded yet.
+        """
+        if self.snapshot is None:
+            self.refresh()
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name='scoring-refresh', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API over the service's current snapshot.
+
+    GET /health, /top?strategy=hqm&n=50, /ticker/<TICKER> and
+    /size?strategy=hqm&amount=10000&n=50&sizing=equal&lot_size=1&min_position=0; POST /refresh
+    rebuilds the snapshot right away.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split('/') if part]
+        snapshot = self.server.service.snapshot
+        if snapshot is None:
+            return self.send_json(503, {'error': 'Scores are not loaded yet.'})
+        try:
+            if parts == ['health']:
+                body = {'status': 'ok', 'refreshed_at': snapshot.refreshed_at, 'tickers': len(snapshot.tickers), 'strategies': list(snapshot.tables)}
+            elif parts == ['top']:
+                body = snapshot.top(query.get('strategy', 'hqm'), int(query.get('n', DEFAULT_TOP)))
+            elif len(parts) == 2 and parts[0] == 'ticker':
+                body = {'ticker': parts[1].upper(), 'refreshed_at': snapshot.refreshed_at, **snapshot.score(parts[1].upper())}
+            elif parts == ['size']:
+                body = snapshot.size(query.get('strategy', 'hqm'), float(query.get('amount', 'nan')), int(query.get('n', DEFAULT_TOP)), query.get('sizing', 'equal'), int(query.get('lot_size', 1)), float(query.get('min_position', 0.0)))
+            else:
+                return self.send_json(404, {'error': f"Unknown path '{url.path}'."})
+        except ValueError as error:
+            return self.send_json(400, {'error': str(error)})
+        except LookupError as error:
+            return self.send_json(404, {'error': str(error)})
+        self.send_json(200, body)
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip('/') != '/refresh':
+            return self.send_json(404, {'error': f"Unknown path '{self.path}'."})
+        try:
+            snapshot = self.server.service.refresh()
+        except Exception as error:
+            return self.send_json(502, {'error': f"Refresh failed: {error}"})
+        self.send_json(200, {'status': 'ok', 'refreshed_at': snapshot.refreshed_at})
+
+    def send_json(self, status, body):
+        data = json.dumps(body, default=json_default, allow_nan=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+# Functions
+
+def json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def records(Dataframe):
+    """
+    Converts a DataFrame to JSON-ready rows, with None for missing values.
+
+    Parameters:
+    Dataframe (DataFrame): Rows to convert.
+
+    Returns:
+    list: One dictionary per row.
+    """
+    return Dataframe.astype(object).where(Dataframe.notna(), None).to_dict('records')
+
+def create_server(service, host='127.0.0.1', port=8080, socket_path=None):
+    """
+    Creates the HTTP server answering queries from a service's snapshot.
+
+    Parameters:
+    service (ScoringService): Service holding the scores.
+    host (str): Interface to listen on.
+    port (int): TCP port, 0 for any free port.
+    socket_path (str): Unix socket path to listen on instead of TCP, None for TCP.
+
+    Returns:
+    socketserver.BaseServer: Server ready for `serve_forever`.
+    """
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, RequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), RequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    return server
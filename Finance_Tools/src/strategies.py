@@ -0,0 +1,227 @@
+# Standard Imports
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from utils import utils
+from utils import ingest
+from utils import rolling
+from utils import fetcher
+from utils import providers
+from utils import timeseries
+from utils import instrumentation
+from utils import position_sizing
+from src.portfolio_management import price_momentum
+from src.portfolio_management import equal_weight
+from src.investment_analysis import ratio_analysis
+
+# Constants
+MONTHLY = 'TIME_SERIES_MONTHLY'
+OVERVIEW = 'OVERVIEW'
+# Temporary column carrying each trade's volatility to inverse volatility sizing.
+VOLATILITY_COLUMN = 'Volatility'
+
+# State
+STRATEGIES = {}
+
+# Classes
+
+class Dataset:
+    """
+    Market data loaded once and shared read-only by every strategy in a batch.
+
+    `price_matrix` holds the parsed closes at any frequency, monthly by
+    default, `prices` each ticker's newest close, `volatility` its return
+    volatility over the trailing year of periods, `rolling_stats` the
+    rolling statistics behind the momentum factors, and `overview` the raw
+    OVERVIEW payloads (empty unless a strategy needs them).
+    """
+
+    def __init__(self, price_matrix, overview=None, rolling_stats=None):
+        self.price_matrix = price_matrix
+        self.rolling_stats = rolling_stats or rolling.RollingStats.from_price_matrix(price_matrix)
+        self.prices = dict(zip(price_matrix.tickers, price_matrix.last_close()))
+        periods = timeseries.PERIODS_PER_YEAR.get(price_matrix.frequency, position_sizing.VOLATILITY_PERIODS)
+        self.volatility = dict(zip(price_matrix.tickers, position_sizing.trailing_volatility(price_matrix.close, periods)))
+        self.overview = overview or []
+
+# Functions
+
+def register(name, requires):
+    """
+    Registers a strategy function under a name.
+
+    The function receives the shared Dataset, the portfolio amount, the
+    sizing method and the `lot_size` and `min_position` sizing constraints,
+    and returns a (sheet name, DataFrame, export schema) tuple.
+
+    Parameters:
+    name (str): Name used to select the strategy.
+    requires (tuple): Data sets the strategy reads, out of MONTHLY and OVERVIEW.
+
+    Returns:
+    callable: Decorator.
+    """
+    def decorator(function):
+        STRATEGIES[name] = {'run': function, 'requires': set(requires)}
+        return function
+    return decorator
+
+@instrumentation.timed()
+def load_dataset(stock_tickers, base_api_url, api_key, strategy_names, cache=None, max_workers=fetcher.MAX_WORKERS, store=None, provider=None, frequency='M', rolling_state=None):
+    """
+    Fetches the data every selected strategy needs, once.
+
+    Parameters:
+    stock_tickers (list): List of stock tickers.
+    base_api_url (str): Base URL for the Alpha Vantage API.
+    api_key (str): Alpha Vantage API key.
+    strategy_names (list): Names of the strategies that will run.
+    cache (ResponseCache): On-disk response cache, None to always fetch.
+    max_workers (int): Number of concurrent requests.
+    store (PriceStore): Local price history the fetched series are merged into and read back from, None to skip.
+    provider (Provider): Market data provider, Alpha Vantage at `base_api_url` if None.
+    frequency (str): Bar frequency to fetch, 'M' for monthly or 'D' for daily series.
+    rolling_state (str): File of rolling statistics to update with the new bars only, None to build them from the full history.
+
+    Returns:
+    Dataset: Shared market data; tickers with error payloads are left out.
+    """
+    requires = set().union(*(STRATEGIES[name]['requires'] for name in strategy_names))
+    provider = provider or providers.AlphaVantageProvider(base_api_url, api_key)
+    rate_limiter = provider.rate_limiter(cache)
+
+    series = utils.get_stock_data(stock_tickers, base_api_url, api_key, timeseries.SERIES_FUNCTIONS[frequency], max_workers=max_workers, rate_limiter=rate_limiter, cache=cache, provider=provider)
+    price_matrix = timeseries.build_price_matrix((data for data in series if fetcher.is_valid_payload(data)), timeseries.SERIES_KEYS[frequency])
+    if store is not None:
+        price_matrix = store.write(price_matrix).price_matrix(price_matrix.tickers)
+
+    overview = []
+    if OVERVIEW in requires:
+        priced = price_matrix.tickers
+        overview = utils.get_stock_data(priced, base_api_url, api_key, OVERVIEW, max_workers=max_workers, rate_limiter=rate_limiter, cache=cache, provider=provider)
+        overview = [data for data in overview if fetcher.is_valid_payload(data)]
+
+    rolling_stats = rolling.update_state(price_matrix, rolling_state) if rolling_state else None
+    return Dataset(price_matrix, overview, rolling_stats)
+
+def load_offline_dataset(prices_file, strategy_names, overview_file=None, stock_tickers=None, store=None, frequency='M', rolling_state=None):
+    """
+    Loads the data every selected strategy needs from local dumps instead of the API.
+
+    Parameters:
+    prices_file (str): CSV or Parquet file of daily or monthly bars, see `ingest.load_price_matrix`.
+    strategy_names (list): Names of the strategies that will run.
+    overview_file (str): CSV or Parquet file of OVERVIEW fundamentals, required by strategies using ratios.
+    stock_tickers (list): Tickers to keep, every ticker in the dump if None.
+    store (PriceStore): Local price history the series are merged into and read back from, None to skip.
+    frequency (str): Frequency to aggregate the bars to, 'M' for monthly or 'D' for daily.
+    rolling_state (str): File of rolling statistics to update with the new bars only, None to build them from the full history.
+
+    Returns:
+    Dataset: Shared market data.
+    """
+    requires = set().union(*(STRATEGIES[name]['requires'] for name in strategy_names))
+    if OVERVIEW in requires and overview_file is None:
+        raise ValueError("The selected strategies need an overview file.")
+
+    price_matrix = ingest.load_price_matrix(prices_file, frequency=frequency, tickers=stock_tickers)
+    if store is not None:
+        price_matrix = store.write(price_matrix).price_matrix(price_matrix.tickers)
+
+    overview = ingest.load_overview(overview_file, tickers=price_matrix.tickers) if OVERVIEW in requires else []
+    rolling_stats = rolling.update_state(price_matrix, rolling_state) if rolling_state else None
+    return Dataset(price_matrix, overview, rolling_stats)
+
+def size_trades(dataset, trades, portfolio_amount, sizing, score_column, lot_size=1, min_position=0.0):
+    """
+    Splits the portfolio across a strategy's selected stocks.
+
+    Parameters:
+    dataset (Dataset): Shared market data, used for volatility weights.
+    trades (DataFrame): Selected stocks with Ticker and Price columns.
+    portfolio_amount (float): Amount to invest.
+    sizing (str): 'equal', 'score' or 'inverse_volatility'.
+    score_column (str): Column weighting the 'score' method.
+    lot_size (int): Shares per tradable lot.
+    min_position (float): Smallest position value worth holding.
+
+    Returns:
+    DataFrame: Trades with the number of shares to buy calculated.
+    """
+    if sizing != 'inverse_volatility':
+        return utils.calculate_number_of_shares_to_buy(portfolio_amount, trades, sizing, score_column=score_column, lot_size=lot_size, min_position=min_position)
+    trades[VOLATILITY_COLUMN] = [dataset.volatility.get(ticker, np.nan) for ticker in trades['Ticker']]
+    trades = utils.calculate_number_of_shares_to_buy(portfolio_amount, trades, sizing, volatility_column=VOLATILITY_COLUMN, lot_size=lot_size, min_position=min_position)
+    return trades.drop(columns=VOLATILITY_COLUMN)
+
+def hqm_scores(dataset):
+    """
+    Scores every priced stock for High Quality Momentum.
+
+    Parameters:
+    dataset (Dataset): Shared market data.
+
+    Returns:
+    DataFrame: Every stock with its returns, factors, percentiles and HQM Score, in ticker order.
+    """
+    returns = utils.calculate_monthly_return_percentage(dataset.price_matrix, price_momentum.time_periods)
+    returns = rolling.add_factors(returns, dataset.rolling_stats)
+    scores = price_momentum.calculate_return_percentile(price_momentum.extract_attributes(returns))
+    return price_momentum.calculate_hqm_score(scores, price_momentum.FACTOR_WEIGHTS)
+
+def rv_scores(dataset):
+    """
+    Scores every stock with fundamentals for Robust Value.
+
+    Parameters:
+    dataset (Dataset): Shared market data with OVERVIEW payloads.
+
+    Returns:
+    DataFrame: Every stock with its ratios, percentiles and RV Score.
+    """
+    ratios = ratio_analysis.extract_attributes(utils.get_ratios(dataset.overview, dataset.prices))
+    return ratio_analysis.calculate_rv_score(ratio_analysis.calculate_ratios_percentile(ratios))
+
+def run_strategies(dataset, strategy_names, portfolio_amount, max_workers=None, sizing='equal', lot_size=1, min_position=0.0):
+    """
+    Runs the selected strategies over the shared dataset in parallel.
+
+    Parameters:
+    dataset (Dataset): Shared market data.
+    strategy_names (list): Names of registered strategies.
+    portfolio_amount (float): Amount to invest in each strategy's portfolio.
+    max_workers (int): Number of strategies to run at once, all of them if None.
+    sizing (str): Position sizing method, one of `position_sizing.METHODS`.
+    lot_size (int): Shares per tradable lot.
+    min_position (float): Smallest position value worth holding.
+
+    Returns:
+    list: (sheet name, DataFrame, export schema) tuples in the order of `strategy_names`.
+    """
+    unknown = [name for name in strategy_names if name not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown strategies: {', '.join(unknown)}. Available: {', '.join(STRATEGIES)}.")
+    with ThreadPoolExecutor(max_workers=max_workers or len(strategy_names) or 1) as executor:
+        run = instrumentation.propagate(lambda name: STRATEGIES[name]['run'](dataset, portfolio_amount, sizing, lot_size, min_position))
+        return list(executor.map(run, strategy_names))
+
+# Strategies
+
+@register('hqm', requires=(MONTHLY,))
+def high_quality_momentum(dataset, portfolio_amount, sizing, lot_size=1, min_position=0.0):
+    trades = price_momentum.get_top_momentum_stocks(hqm_scores(dataset))
+    trades = size_trades(dataset, trades, portfolio_amount, sizing, 'HQM Score', lot_size, min_position)
+    return price_momentum.SHEET_NAME, trades, price_momentum.EXPORT_SCHEMA
+
+@register('rv', requires=(MONTHLY, OVERVIEW))
+def robust_value(dataset, portfolio_amount, sizing, lot_size=1, min_position=0.0):
+    trades = ratio_analysis.top_rv_stocks(rv_scores(dataset), 50)
+    trades = size_trades(dataset, trades, portfolio_amount, sizing, 'RV Score', lot_size, min_position)
+    return ratio_analysis.SHEET_NAME, trades, ratio_analysis.EXPORT_SCHEMA
+
+@register('equal_weight', requires=(MONTHLY, OVERVIEW))
+def equal_weight_index(dataset, portfolio_amount, sizing, lot_size=1, min_position=0.0):
+    trades = equal_weight.extract_attributes(dataset.overview, dataset.prices)
+    trades = equal_weight.calculate_equal_weight_shares(portfolio_amount, trades, lot_size, min_position)
+    return equal_weight.SHEET_NAME, trades, equal_weight.EXPORT_SCHEMA
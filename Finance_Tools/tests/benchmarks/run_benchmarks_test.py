@@ -0,0 +1,36 @@
+# Standard Imports
+from benchmarks import run_benchmarks
+
+# Constants
+BASELINE = {'500': {'parse': {'seconds': 1.0, 'peak_bytes': 1000}}}
+
+# Tests
+
+def test_changes_within_tolerance_are_not_flagged():
+    current = {'500': {'parse': {'seconds': 1.2, 'peak_bytes': 1200}}}
+
+    assert run_benchmarks.find_regressions(current, BASELINE, tolerance=0.25) == []
+
+def test_slowdowns_and_memory_growth_beyond_tolerance_are_flagged():
+    current = {'500': {'parse': {'seconds': 1.3, 'peak_bytes': 1300}}}
+
+    regressions = run_benchmarks.find_regressions(current, BASELINE, tolerance=0.25)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith('parse @ 500: 1.300s')
+    assert 'MiB' in regressions[1]
+
+def test_stages_faster_than_timer_noise_are_not_flagged_on_time():
+    baseline = {'500': {'parse': {'seconds': 0.001, 'peak_bytes': 1000}}}
+    current = {'500': {'parse': {'seconds': run_benchmarks.MIN_SECONDS, 'peak_bytes': 1000}}}
+
+    assert run_benchmarks.find_regressions(current, baseline) == []
+
+def test_stages_and_sizes_missing_from_the_baseline_are_skipped():
+    current = {
+        '500': {'export': {'seconds': 9.0, 'peak_bytes': 10 ** 9}},
+        '5000': {'parse': {'seconds': 9.0, 'peak_bytes': 10 ** 9}}
+    }
+
+    assert run_benchmarks.find_regressions(current, BASELINE) == []
+    assert run_benchmarks.find_regressions(current, {}) == []
@@ -0,0 +1,67 @@
+# Standard Imports
+import pytest
+
+from benchmarks.stub_server import StubServer
+
+# Functions
+
+def monthly_payload(symbol, closes, last_refreshed='2024-03-22'):
+    """
+    Builds a TIME_SERIES_MONTHLY payload with the given closes, newest first.
+
+    Parameters:
+    symbol (str): Stock ticker.
+    closes (list): Closing prices, newest first.
+    last_refreshed (str): Date of the newest bar.
+
+    Returns:
+    dict: Alpha Vantage style payload.
+    """
+    import numpy as np
+
+    last = np.datetime64(last_refreshed, 'D')
+    months = np.datetime64(last_refreshed, 'M') - np.arange(len(closes))
+    dates = [last] + list((months[1:] + 1).astype('datetime64[D]') - 1)
+    series = {}
+    for date, close in zip(dates, closes):
+        series[str(date)] = {
+            "1. open": f"{close:.4f}",
+            "2. high": f"{close:.4f}",
+            "3. low": f"{close:.4f}",
+            "4. close": f"{close:.4f}",
+            "5. volume": "1000"
+        }
+    return {
+        "Meta Data": {
+            "1. Information": "Monthly Prices (open, high, low, close) and Volumes",
+            "2. Symbol": symbol,
+            "3. Last Refreshed": last_refreshed,
+            "4. Time Zone": "US/Eastern"
+        },
+        "Monthly Time Series": series
+    }
+
+# Fixtures
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    """
+    Local Alpha Vantage stand-in, see `benchmarks.stub_server.StubServer`.
+
+    Serves 13 rising monthly closes for any symbol unless `payload` is
+    replaced. The stub has no quotas, so providers stop applying the free
+    tier's.
+    """
+    from utils import providers
+
+    monkeypatch.setattr(providers.Provider, 'requests_per_minute', None)
+    monkeypatch.setattr(providers.Provider, 'requests_per_day', None)
+    with StubServer(payload=lambda query: monthly_payload(query['symbol'], [100.0 + index for index in range(13)][::-1])) as server:
+        yield server
+
+@pytest.fixture
+def make_monthly_payload():
+    """
+    Returns the TIME_SERIES_MONTHLY payload builder.
+    """
+    return monthly_payload
@@ -22,4 +22,56 @@
 # # Save the recommended trades to excel
 # ratio_analysis.save_recommended_trades(ratio_data)
 
-# print("Recommended trades have been saved to 'recommended_trades.xlsx'.")
\ No newline at end of file
+# print("Recommended trades have been saved to 'recommended_trades.xlsx'.")
+
+# Standard Imports
+import numpy as np
+import pandas as pd
+
+from src.investment_analysis import ratio_analysis
+
+# Functions
+
+def ratio_frame(rows):
+    columns = ['Ticker'] + list(ratio_analysis.metrics)
+    return pd.DataFrame([dict(zip(columns, row)) for row in rows], columns=columns)
+
+# Tests
+
+def test_cheaper_ratios_score_higher():
+    stock_ratios = ratio_frame([('AAA', 10, 1, 1, 5, 1), ('BBB', 20, 2, 2, 10, 2), ('CCC', 30, 3, 3, 15, 3)])
+
+    scored = ratio_analysis.calculate_rv_score(ratio_analysis.calculate_ratios_percentile(ratio_analysis.extract_attributes(stock_ratios)))
+
+    assert scored['RV Score'].is_monotonic_decreasing
+    assert ratio_analysis.top_rv_stocks(scored, 1)['Ticker'].tolist() == ['AAA']
+
+def test_negative_earnings_rank_as_most_expensive():
+    stock_ratios = ratio_frame([('AAA', -5, 1, 1, -3, 1), ('BBB', 20, 1, 1, 10, 1), ('CCC', 30, 1, 1, 15, 1)])
+
+    scored = ratio_analysis.calculate_ratios_percentile(ratio_analysis.extract_attributes(stock_ratios))
+    masked = ratio_analysis.calculate_ratios_percentile(ratio_analysis.extract_attributes(stock_ratios), rules={'Price-to-Earnings Ratio': {'negative': 'missing'}})
+
+    assert scored['PE Percentile'].idxmin() == 0
+    assert scored['EV/EBITDA Percentile'].idxmin() == 0
+    assert np.isnan(masked.loc[0, 'PE Percentile'])
+    assert masked.loc[0, 'EV/EBITDA Percentile'] == 1.0
+
+def test_missing_ratios_are_left_out_of_the_score():
+    stock_ratios = ratio_frame([('AAA', np.nan, 1, 1, 5, 1), ('BBB', 20, 2, 2, 10, 2), ('CCC', np.nan, np.nan, np.nan, np.nan, np.nan)])
+
+    scored = ratio_analysis.calculate_rv_score(ratio_analysis.calculate_ratios_percentile(ratio_analysis.extract_attributes(stock_ratios)))
+
+    assert scored.loc[0, 'RV Score'] == 1.0
+    assert np.isnan(scored.loc[2, 'RV Score'])
+    assert ratio_analysis.top_rv_stocks(scored, 5)['Ticker'].tolist() == ['AAA', 'BBB']
+
+def test_value_screen_survives_bad_payloads():
+    from utils import utils
+
+    overview = [{'Symbol': f'T{index}', 'PERatio': 'None' if index % 7 == 0 else str(5 + index), 'PriceToBookRatio': '-', 'PriceToSalesRatioTTM': str(index / 10), 'EVToEBITDA': str(index - 50), 'EVToRevenue': str(index)} for index in range(2000)]
+
+    trades = ratio_analysis.calculate_percentile_RV(utils.get_ratios(overview, {f'T{index}': 10.0 for index in range(2000)}))
+
+    assert len(trades) == 50
+    assert trades['RV Score'].notna().all()
@@ -0,0 +1,116 @@
+# Standard Imports
+import numpy as np
+import pytest
+
+from utils import utils
+from utils import providers
+from utils import timeseries
+from utils import position_sizing
+from utils.cache import ResponseCache
+from src.portfolio_management import backtest
+from src.portfolio_management import price_momentum
+
+# Functions
+
+def random_walk_payloads(make_monthly_payload, number_of_stocks=40, number_of_months=48, seed=3):
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for index in range(number_of_stocks):
+        closes = 50 * np.cumprod(1 + rng.normal(0.01, 0.08, number_of_months))
+        payloads.append(make_monthly_payload(f'T{index}', list(closes[::-1])))
+    return payloads
+
+# Tests
+
+def test_hqm_scores_match_live_pipeline_at_last_date(make_monthly_payload):
+    payloads = random_walk_payloads(make_monthly_payload)
+    price_matrix = timeseries.build_price_matrix(payloads)
+
+    scores = backtest.hqm_scores(price_matrix.close)
+    live = price_momentum.get_high_quality_momentum_stocks(utils.calculate_monthly_return_percentage(payloads, price_momentum.time_periods))
+    live_scores = dict(zip(live['Ticker'], live['HQM Score']))
+
+    for ticker, score in live_scores.items():
+        assert scores[price_matrix.index[ticker], -1] == pytest.approx(score)
+
+def test_backtest_reports_equity_turnover_drawdown_and_sharpe(make_monthly_payload):
+    price_matrix = timeseries.build_price_matrix(random_walk_payloads(make_monthly_payload))
+
+    result = backtest.backtest_hqm(price_matrix, 100000, number_of_stocks=10)
+
+    assert result['equity'].index[0] == price_matrix.dates[12]
+    assert len(result['equity']) == len(price_matrix.dates) - 12
+    assert result['equity'].iloc[0] == 100000
+    assert (result['drawdown'] <= 0).all()
+    assert result['turnover'].iloc[0] > 0.9
+    assert np.isfinite(result['summary']['sharpe'])
+
+def test_backtest_never_spends_more_than_equity():
+    prices = np.array([[10.0, 11.0, 12.0], [30.0, 27.0, 33.0], [7.0, 7.0, 8.0]])
+    scores = np.array([[0.9, 0.1, 0.9], [0.8, 0.9, 0.8], [0.1, 0.8, 0.1]])
+
+    result = backtest.run_backtest(prices, scores, ['a', 'b', 'c'], 1000, number_of_stocks=2)
+
+    # Day one buys 50 x 10 and 16 x 30, leaving 20 in cash.
+    assert result['equity'].iloc[1] == pytest.approx(20 + 50 * 11 + 16 * 27)
+
+def test_backtest_sizes_positions_like_the_strategies():
+    prices = np.array([[30.0, 60.0], [40.0, 40.0]])
+    scores = np.array([[0.9, 0.9], [0.8, 0.8]])
+
+    result = backtest.run_backtest(prices, scores, ['a', 'b'], 100, number_of_stocks=2)
+
+    # Whole shares leave 30 in cash, which buys a second share of the best scoring stock.
+    shares, cash = position_sizing.allocate_shares(100, prices[:, 0], position_sizing.equal_weights(2))
+    assert list(shares) == [2, 1] and cash == 0
+    assert result['equity'].iloc[1] == pytest.approx(2 * 60 + 40)
+
+def test_rv_backtest_rejects_misshaped_ratios(make_monthly_payload):
+    price_matrix = timeseries.build_price_matrix(random_walk_payloads(make_monthly_payload, number_of_stocks=5, number_of_months=6))
+
+    with pytest.raises(ValueError, match='EV/RE'):
+        backtest.backtest_rv(price_matrix, {'EV/RE': np.ones(4)}, 10000)
+    with pytest.raises(ValueError, match='EV/RE'):
+        backtest.backtest_rv(price_matrix, {'EV/RE': np.ones((5, 5))}, 10000)
+
+def test_rv_backtest_accepts_snapshot_ratios(make_monthly_payload):
+    price_matrix = timeseries.build_price_matrix(random_walk_payloads(make_monthly_payload, number_of_stocks=5, number_of_months=6))
+    ratios = {metric: np.arange(5, dtype=float) for metric in ['Price-to-Earnings Ratio', 'Price-to-Book Ratio', 'Price-to-Sales Ratio', 'EV/EBITDA', 'EV/RE']}
+
+    result = backtest.backtest_rv(price_matrix, ratios, 10000, number_of_stocks=2)
+
+    assert len(result['equity']) == 6
+
+def test_backtest_runs_offline_from_cache(make_monthly_payload, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttls={'TIME_SERIES_MONTHLY': 0})
+    provider = providers.AlphaVantageProvider()
+    for payload in random_walk_payloads(make_monthly_payload, number_of_stocks=5):
+        symbol = payload['Meta Data']['2. Symbol']
+        cache.put('TIME_SERIES_MONTHLY', symbol, payload, provider.cache_params('TIME_SERIES_MONTHLY', symbol))
+
+    price_matrix = backtest.load_cached_price_matrix(cache, ['T0', 'T1', 'T2', 'T3', 'T4', 'MISSING'])
+
+    assert price_matrix.tickers == ['T0', 'T1', 'T2', 'T3', 'T4']
+    assert len(backtest.backtest_hqm(price_matrix, 10000, number_of_stocks=2)['equity']) == 36
+
+def test_equal_scores_are_broken_by_ticker():
+    scores = np.array([[0.5, 0.5], [0.5, 0.9], [0.5, 0.5]])
+
+    selected = backtest.select_top(scores, 2, tie_breakers=['C', 'B', 'A'])
+
+    np.testing.assert_array_equal(selected, [[False, False], [True, True], [True, True]])
+
+def test_daily_backtest_uses_daily_horizons_and_annualization(make_monthly_payload):
+    payloads = random_walk_payloads(make_monthly_payload, number_of_stocks=8, number_of_months=300)
+    for payload in payloads:
+        dates = np.busday_offset('2024-03-22', -np.arange(300), roll='backward')
+        payload[timeseries.DAILY_SERIES_KEY] = dict(zip(map(str, dates), payload.pop('Monthly Time Series').values()))
+    price_matrix = timeseries.build_price_matrix(payloads, timeseries.DAILY_SERIES_KEY)
+
+    result = backtest.backtest_hqm(price_matrix, 10000, number_of_stocks=3)
+
+    scores = backtest.hqm_scores(price_matrix.close, [252, 126, 63, 21])
+    expected = backtest.run_backtest(price_matrix.close, scores, price_matrix.dates, 10000, 3, periods_per_year=252, tie_breakers=price_matrix.tickers)
+    assert price_matrix.frequency == 'D'
+    assert result['equity'].index[0] == price_matrix.dates[252]
+    assert result['summary']['sharpe'] == pytest.approx(expected['summary']['sharpe'])
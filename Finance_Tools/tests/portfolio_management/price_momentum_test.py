@@ -19,3 +19,31 @@
 # price_momentum.save_recommended_trades(price_momentum_data)
 
 # print("Recommended trades have been saved to 'recommended_trades.xlsx'.")
+
+# Standard Imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.portfolio_management import price_momentum
+
+# Tests
+
+def test_rolling_factors_join_the_hqm_score_with_their_weights():
+    returns = pd.DataFrame({
+        'Ticker': ['AAA', 'BBB', 'CCC'],
+        'Price': [10.0, 20.0, 30.0],
+        'One-Year Price Return': [30.0, 20.0, 10.0],
+        'Rolling Sharpe': [0.1, 0.5, 2.0],
+        'Drawdown': [-0.3, np.nan, -0.1]
+    })
+
+    plain = price_momentum.get_high_quality_momentum_stocks(returns[['Ticker', 'Price', 'One-Year Price Return']])
+    weighted = price_momentum.get_high_quality_momentum_stocks(returns, {'Rolling Sharpe': 2.0, 'Drawdown': 1.0})
+
+    assert plain['Ticker'].tolist() == ['AAA', 'BBB', 'CCC']
+    assert weighted['Ticker'].tolist() == ['CCC', 'BBB', 'AAA']
+    scores = dict(zip(weighted['Ticker'], weighted['HQM Score']))
+    assert scores['AAA'] == pytest.approx((1.0 + 2 * 1 / 3 + 1 / 2) / 4)
+    assert scores['BBB'] == pytest.approx((2 / 3 + 2 * 2 / 3) / 3)
+    assert 'Rolling Sharpe Percentile' in weighted.columns
@@ -0,0 +1,64 @@
+# Standard Imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import timeseries
+from src.investment_analysis import ratio_analysis
+from src.portfolio_management import backtest
+from src.portfolio_management import sweep
+
+# Functions
+
+def universe(make_monthly_payload, number_of_stocks=30, number_of_months=36, seed=5):
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for index in range(number_of_stocks):
+        closes = 40 * np.cumprod(1 + rng.normal(0.01, 0.07, number_of_months))
+        payloads.append(make_monthly_payload(f'T{index}', list(closes[::-1])))
+    ratio_panel = {metric: rng.uniform(1, 30, number_of_stocks) for metric in ratio_analysis.metrics}
+    return timeseries.build_price_matrix(payloads), ratio_panel
+
+# Tests
+
+def test_metric_subsets_cover_every_combination():
+    subsets = sweep.metric_subsets()
+
+    assert len(subsets) == 2 ** len(ratio_analysis.metrics) - 1
+    assert subsets[0] == tuple(ratio_analysis.metrics)
+
+def test_sweep_matches_single_backtests(make_monthly_payload):
+    price_matrix, ratio_panel = universe(make_monthly_payload)
+
+    table = sweep.run_sweep(price_matrix, 10000, horizon_sets=[[12, 6, 3, 1], [(12, 1)]], metric_sets=[tuple(ratio_analysis.metrics)], top_sizes=[5, 10], ratio_panel=ratio_panel, max_workers=1)
+
+    assert len(table) == 6
+    assert table['Sharpe Ratio'].is_monotonic_decreasing
+    hqm = table[(table['Variant'] == '12-1 Month') & (table['Number of Stocks'] == 5)].iloc[0]
+    expected = backtest.backtest_hqm(price_matrix, 10000, number_of_stocks=5, horizons=[(12, 1)])['summary']
+    assert hqm['Total Return'] == pytest.approx(expected['total_return'])
+    rv = table[(table['Strategy'] == 'rv') & (table['Number of Stocks'] == 10)].iloc[0]
+    expected = backtest.backtest_rv(price_matrix, ratio_panel, 10000, number_of_stocks=10)['summary']
+    assert rv['Sharpe Ratio'] == pytest.approx(expected['sharpe'])
+
+def test_process_pool_matches_in_process_run(make_monthly_payload):
+    price_matrix, ratio_panel = universe(make_monthly_payload)
+    options = dict(horizon_sets=[[12, 6, 3, 1], [6, 3]], metric_sets=sweep.metric_subsets(4), top_sizes=[5, 10], ratio_panel=ratio_panel)
+
+    serial = sweep.run_sweep(price_matrix, 10000, max_workers=1, **options)
+    parallel = sweep.run_sweep(price_matrix, 10000, max_workers=2, **options)
+
+    pd.testing.assert_frame_equal(serial, parallel)
+
+def test_mixed_vector_and_matrix_ratios_are_broadcast(make_monthly_payload):
+    price_matrix, ratio_panel = universe(make_monthly_payload)
+    shape = np.asarray(price_matrix.close).shape
+    first = next(iter(ratio_analysis.metrics))
+    mixed = {**ratio_panel, first: np.tile(ratio_panel[first][:, None], (1, shape[1]))}
+    options = dict(horizon_sets=[], metric_sets=[tuple(ratio_analysis.metrics)], top_sizes=[5], max_workers=1)
+
+    table = sweep.run_sweep(price_matrix, 10000, ratio_panel=mixed, **options)
+
+    pd.testing.assert_frame_equal(table, sweep.run_sweep(price_matrix, 10000, ratio_panel=ratio_panel, **options))
+    with pytest.raises(ValueError, match=first):
+        sweep.run_sweep(price_matrix, 10000, ratio_panel={**ratio_panel, first: ratio_panel[first][:-1]}, **options)
@@ -0,0 +1,158 @@
+# Standard Imports
+import json
+import socket
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from src import service
+from src import strategies
+
+# Constants
+TICKERS = [f'T{index:02d}' for index in range(12)]
+
+# Functions
+
+def overview_payload(symbol):
+    seed = int(symbol[1:]) + 1
+    return {
+        "Symbol": symbol,
+        "MarketCapitalization": str(seed * 1_000_000),
+        "PERatio": str(10.0 + seed),
+        "PriceToBookRatio": str(1.0 + seed / 10),
+        "PriceToSalesRatioTTM": str(2.0 + seed / 5),
+        "EVToEBITDA": str(8.0 + seed / 2),
+        "EVToRevenue": str(3.0 + seed / 3)
+    }
+
+def serve_universe(stub_server, make_monthly_payload, leader=None):
+    def build(query):
+        symbol = query['symbol']
+        if query['function'] == strategies.OVERVIEW:
+            return overview_payload(symbol)
+        growth = 1.0 + (50 if symbol == leader else int(symbol[1:])) / 100
+        return make_monthly_payload(symbol, [100.0 * growth ** -month for month in range(13)])
+    stub_server.payload = build
+
+def get(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+# Fixtures
+
+@pytest.fixture
+def running_service(stub_server, make_monthly_payload):
+    serve_universe(stub_server, make_monthly_payload)
+    scoring = service.ScoringService(lambda: strategies.load_dataset(TICKERS, stub_server.url, 'demo', ['hqm', 'rv']), ['hqm', 'rv'], interval=3600)
+    scoring.start()
+    server = service.create_server(scoring, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield scoring, f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+    scoring.stop()
+
+# Tests
+
+def test_queries_match_batch_rankings(running_service):
+    scoring, url = running_service
+    sheets = strategies.run_strategies(scoring.snapshot.dataset, ['hqm', 'rv'], 10000.0)
+
+    status, top = get(f'{url}/top?strategy=hqm&n=5')
+    assert status == 200
+    assert [row['Ticker'] for row in top] == sheets[0][1]['Ticker'].tolist()[:5]
+    assert [row['Rank'] for row in top] == [1, 2, 3, 4, 5]
+
+    status, score = get(f'{url}/ticker/{top[2]["Ticker"]}')
+    assert status == 200
+    assert score['hqm']['Rank'] == 3
+    assert score['rv']['RV Score'] == pytest.approx(sheets[1][1].set_index('Ticker').loc[top[2]['Ticker'], 'RV Score'])
+
+def test_size_splits_amount_across_top_stocks(running_service):
+    _, url = running_service
+
+    status, trades = get(f'{url}/size?strategy=rv&amount=10000&n=4&sizing=equal')
+
+    assert status == 200
+    assert len(trades) == 4
+    spent = sum(trade['Price'] * trade['Number of Shares to Buy'] for trade in trades)
+    assert 0 < spent <= 10000
+
+def test_size_honours_lot_size_and_min_position(running_service):
+    _, url = running_service
+
+    status, trades = get(f'{url}/size?strategy=hqm&amount=10000&n=5&sizing=inverse_volatility&lot_size=5&min_position=1000')
+
+    assert status == 200
+    assert all(trade['Number of Shares to Buy'] % 5 == 0 for trade in trades)
+    assert all(trade['Price'] * trade['Number of Shares to Buy'] >= 1000 for trade in trades if trade['Number of Shares to Buy'])
+    assert get(f'{url}/size?amount=10000&lot_size=0')[0] == 400
+    assert get(f'{url}/size?amount=10000&min_position=-1')[0] == 400
+
+def test_bad_queries_are_rejected(running_service):
+    _, url = running_service
+
+    assert get(f'{url}/ticker/NOPE')[0] == 404
+    assert get(f'{url}/top?strategy=equal_weight')[0] == 400
+    assert get(f'{url}/size?amount=-5')[0] == 400
+    assert get(f'{url}/missing')[0] == 404
+
+def test_refresh_swaps_in_new_scores(running_service, stub_server, make_monthly_payload):
+    scoring, url = running_service
+    before = scoring.snapshot
+    serve_universe(stub_server, make_monthly_payload, leader='T00')
+
+    request = urllib.request.Request(f'{url}/refresh', method='POST')
+    with urllib.request.urlopen(request) as response:
+        assert response.status == 200
+
+    _, score = get(f'{url}/ticker/T00')
+    _, top = get(f'{url}/top?n={len(TICKERS)}')
+    assert score['hqm']['One-Year Return Percentile'] == max(row['One-Year Return Percentile'] for row in top)
+    # The previous snapshot is untouched for readers still holding it.
+    assert before.score('T00')['hqm']['One-Year Price Return'] < score['hqm']['One-Year Price Return']
+    assert scoring.snapshot is not before
+
+def test_failed_refresh_keeps_serving_previous_scores(stub_server, make_monthly_payload):
+    serve_universe(stub_server, make_monthly_payload)
+    loads = iter([lambda: strategies.load_dataset(TICKERS, stub_server.url, 'demo', ['hqm'])])
+
+    def load():
+        return next(loads)()
+
+    scoring = service.ScoringService(load, ['hqm'], interval=0.01)
+    scoring.start()
+    snapshot = scoring.snapshot
+    scoring.stopped.wait(0.1)
+    scoring.stop()
+
+    assert scoring.snapshot is snapshot
+    assert np.isfinite(snapshot.top('hqm', 1)[0]['HQM Score'])
+
+def test_unix_socket_serves_queries(running_service, tmp_path):
+    scoring, _ = running_service
+    path = str(tmp_path / 'scores.sock')
+    server = service.create_server(scoring, socket_path=path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+            client.sendall(b'GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n')
+            response = b''
+            while chunk := client.recv(65536):
+                response += chunk
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    head, body = response.split(b'\r\n\r\n', 1)
+    assert head.startswith(b'HTTP/1.1 200')
+    assert json.loads(body)['tickers'] == len(TICKERS)
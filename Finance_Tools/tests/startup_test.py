@@ -0,0 +1,49 @@
+# Standard Imports
+import os
+import sys
+import json
+import subprocess
+
+# Constants
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('pandas', 'scipy', 'requests', 'xlsxwriter', 'pyarrow')
+# Seconds to import the batch entry point; numpy alone takes most of it.
+STARTUP_BUDGET = float(os.environ.get('FINANCE_TOOLS_STARTUP_BUDGET', 0.75))
+
+# Functions
+
+def run_python(code):
+    completed = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+# Tests
+
+def test_entry_point_imports_no_heavy_dependencies():
+    loaded = run_python(
+        "import sys, json\n"
+        "import batch\n"
+        "from src.portfolio_management import sweep, backtest\n"
+        "from utils import refresh, cache, price_store\n"
+        f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))"
+    )
+
+    assert loaded == []
+
+def test_entry_point_imports_within_budget():
+    seconds = min(
+        run_python("import time, json\nstart = time.perf_counter()\nimport batch\nprint(json.dumps(time.perf_counter() - start))")
+        for _ in range(3)
+    )
+
+    assert seconds < STARTUP_BUDGET
+
+def test_heavy_dependency_loads_on_first_use():
+    loaded = run_python(
+        "import sys, json\n"
+        "from utils import utils\n"
+        "before = 'pandas' in sys.modules\n"
+        "utils.pd.DataFrame\n"
+        "print(json.dumps([before, 'pandas' in sys.modules]))"
+    )
+
+    assert loaded == [False, True]
@@ -0,0 +1,126 @@
+# Standard Imports
+import numpy as np
+import pandas as pd
+
+import batch
+from utils.price_store import PriceStore
+from src import strategies
+from src.portfolio_management import equal_weight
+
+# Constants
+TICKERS = [f'T{index:02d}' for index in range(12)]
+
+# Functions
+
+def overview_payload(symbol):
+    seed = int(symbol[1:]) + 1
+    return {
+        "Symbol": symbol,
+        "MarketCapitalization": str(seed * 1_000_000),
+        "PERatio": str(10.0 + seed),
+        "PriceToBookRatio": str(1.0 + seed / 10),
+        "PriceToSalesRatioTTM": str(2.0 + seed / 5),
+        "EVToEBITDA": str(8.0 + seed / 2),
+        "EVToRevenue": str(3.0 + seed / 3)
+    }
+
+def serve_universe(stub_server, make_monthly_payload):
+    def build(query):
+        symbol = query['symbol']
+        if query['function'] == strategies.OVERVIEW:
+            return overview_payload(symbol)
+        growth = 1.0 + int(symbol[1:]) / 100
+        return make_monthly_payload(symbol, [100.0 * growth ** -month for month in range(13)])
+    stub_server.payload = build
+
+# Tests
+
+def test_equal_weight_splits_portfolio_across_priced_stocks():
+    trades = pd.DataFrame({'Ticker': ['A', 'B', 'C'], 'Price': [10.0, 30.0, np.nan]})
+
+    trades = equal_weight.calculate_equal_weight_shares(600.0, trades)
+
+    np.testing.assert_array_equal(trades['Number of Shares to Buy'], [30.0, 10.0, np.nan])
+
+def test_dataset_is_loaded_once_for_all_strategies(stub_server, make_monthly_payload):
+    serve_universe(stub_server, make_monthly_payload)
+    names = list(strategies.STRATEGIES)
+
+    dataset = strategies.load_dataset(TICKERS, stub_server.url, 'demo', names)
+    sheets = strategies.run_strategies(dataset, names, 100000.0)
+
+    assert stub_server.requests == 2 * len(TICKERS)
+    assert [sheet_name for sheet_name, _, _ in sheets] == ['price_momentum', 'ratio_analysis', 'equal_weight']
+    assert set(sheets[2][1]['Ticker']) == set(TICKERS)
+
+def test_monthly_only_strategies_skip_overview(stub_server, make_monthly_payload):
+    serve_universe(stub_server, make_monthly_payload)
+
+    strategies.load_dataset(TICKERS, stub_server.url, 'demo', ['hqm'])
+
+    assert stub_server.requests == len(TICKERS)
+
+def test_batch_runs_without_prompts(stub_server, make_monthly_payload, tmp_path):
+    serve_universe(stub_server, make_monthly_payload)
+    tickers_file = tmp_path / 'stocks.csv'
+    pd.DataFrame({'Ticker': TICKERS}).to_csv(tickers_file, index=False)
+    output = tmp_path / 'trades.csv'
+
+    batch.main([
+        '--amount', '50000', '--strategies', 'hqm', 'equal_weight', '--tickers', str(tickers_file),
+        '--output', str(output), '--base-url', stub_server.url, '--no-cache', '--lot-size', '5'
+    ])
+
+    assert (tmp_path / 'trades_price_momentum.csv').exists()
+    equal_weight = pd.read_csv(tmp_path / 'trades_equal_weight.csv')
+    assert len(equal_weight) == len(TICKERS)
+    assert (equal_weight['Number of Shares to Buy'] % 5 == 0).all()
+
+def test_dataset_reads_back_through_price_store(stub_server, make_monthly_payload, tmp_path):
+    serve_universe(stub_server, make_monthly_payload)
+    store = PriceStore.create(str(tmp_path / 'prices'))
+
+    dataset = strategies.load_dataset(TICKERS, stub_server.url, 'demo', ['hqm'], store=store)
+
+    assert PriceStore(str(tmp_path / 'prices')).tickers == TICKERS
+    assert dataset.prices['T05'] == 100.0
+
+def test_sizing_methods_stay_within_budget(stub_server, make_monthly_payload):
+    serve_universe(stub_server, make_monthly_payload)
+    dataset = strategies.load_dataset(TICKERS, stub_server.url, 'demo', ['hqm'])
+
+    for sizing in ('equal', 'score', 'inverse_volatility'):
+        _, trades, _ = strategies.run_strategies(dataset, ['hqm'], 10000.0, sizing=sizing)[0]
+        spent = (trades['Number of Shares to Buy'] * trades['Price']).sum()
+        assert 0 < spent <= 10000.0
+
+def test_every_sizing_method_honours_lot_size_and_min_position(stub_server, make_monthly_payload):
+    serve_universe(stub_server, make_monthly_payload)
+    dataset = strategies.load_dataset(TICKERS, stub_server.url, 'demo', ['hqm'])
+
+    for sizing in ('equal', 'score', 'inverse_volatility'):
+        _, trades, _ = strategies.run_strategies(dataset, ['hqm'], 30000.0, sizing=sizing, lot_size=10, min_position=1500.0)[0]
+        shares = trades['Number of Shares to Buy']
+        values = shares * trades['Price']
+        assert (shares % 10 == 0).all()
+        assert (values[shares > 0] >= 1500.0).all()
+        assert 0 < values.sum() <= 30000.0
+        assert strategies.VOLATILITY_COLUMN not in trades
+
+def test_strategies_run_on_daily_bars(stub_server, make_monthly_payload):
+    dates = [str(date) for date in np.array(pd.bdate_range(end='2024-03-22', periods=260), dtype='datetime64[D]')[::-1]]
+
+    def build(query):
+        assert query['function'] == 'TIME_SERIES_DAILY' and query['outputsize'] == 'full'
+        growth = 1.0 + int(query['symbol'][1:]) / 1000
+        payload = make_monthly_payload(query['symbol'], [100.0 * growth ** -day for day in range(len(dates))])
+        payload['Time Series (Daily)'] = dict(zip(dates, payload.pop('Monthly Time Series').values()))
+        return payload
+    stub_server.payload = build
+
+    dataset = strategies.load_dataset(TICKERS, stub_server.url, 'demo', ['hqm'], frequency='D')
+    _, trades, _ = strategies.run_strategies(dataset, ['hqm'], 10000.0, sizing='inverse_volatility')[0]
+
+    assert dataset.price_matrix.frequency == 'D'
+    assert dataset.price_matrix.close.shape == (len(TICKERS), len(dates))
+    assert trades['Ticker'].iloc[0] == 'T11'
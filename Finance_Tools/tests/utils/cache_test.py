@@ -0,0 +1,80 @@
+# Standard Imports
+import os
+import time
+
+from utils import utils
+from utils import fetcher
+from utils import providers
+from utils.cache import ResponseCache
+
+# Tests
+
+def test_warm_run_does_no_network_io(stub_server, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    tickers = ['AAA', 'BBB', 'CCC']
+
+    cold = utils.get_stock_data(tickers, stub_server.url, 'demo', 'TIME_SERIES_MONTHLY', cache=cache)
+    requests_after_cold = stub_server.requests
+    warm = utils.get_stock_data(tickers, stub_server.url, 'demo', 'TIME_SERIES_MONTHLY', cache=cache)
+
+    assert warm == cold
+    assert stub_server.requests == requests_after_cold == 3
+    assert cache.stats() == {'hits': 3, 'misses': 3}
+
+def test_key_depends_on_function_symbol_and_params(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+
+    assert cache.key('OVERVIEW', 'IBM') != cache.key('TIME_SERIES_MONTHLY', 'IBM')
+    assert cache.key('OVERVIEW', 'IBM') != cache.key('OVERVIEW', 'MSFT')
+    assert cache.key('OVERVIEW', 'IBM', {'apikey': 'a'}) == cache.key('OVERVIEW', 'IBM', {'apikey': 'b'})
+    assert cache.key('OVERVIEW', 'IBM', {'outputsize': 'full'}) != cache.key('OVERVIEW', 'IBM')
+
+def test_entries_expire_after_function_ttl(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttls={'OVERVIEW': 0.05})
+    cache.put('OVERVIEW', 'IBM', {'Symbol': 'IBM'})
+
+    assert cache.get('OVERVIEW', 'IBM') == {'Symbol': 'IBM'}
+    time.sleep(0.1)
+    assert cache.get('OVERVIEW', 'IBM') is None
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_entries=2)
+    for age, symbol in enumerate(['AAA', 'BBB', 'CCC']):
+        cache.put('OVERVIEW', symbol, {'Symbol': symbol})
+        path = cache.path(cache.key('OVERVIEW', symbol))
+        os.utime(path, (1000 + age, 1000 + age))
+    cache.get('OVERVIEW', 'AAA')
+
+    assert cache.evict() == 1
+    assert cache.get('OVERVIEW', 'BBB') is None
+    assert cache.get('OVERVIEW', 'AAA') is not None
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+def test_invalid_payloads_are_not_cached(stub_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(fetcher, 'BACKOFF_FACTOR', 0.001)
+    stub_server.payload = lambda query: {'Note': 'Thank you for using Alpha Vantage!'}
+    cache = ResponseCache(str(tmp_path))
+
+    utils.get_stock_data(['AAA'], stub_server.url, 'demo', 'OVERVIEW', cache=cache)
+
+    assert not os.listdir(tmp_path)
+
+def test_payloads_of_different_providers_and_options_do_not_collide(stub_server, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    alpha_vantage = providers.AlphaVantageProvider(stub_server.url, 'key-a')
+    iex = providers.IEXBatchProvider(stub_server.url, 'token')
+
+    keys = {
+        cache.key('TIME_SERIES_MONTHLY', 'IBM', alpha_vantage.cache_params('TIME_SERIES_MONTHLY', 'IBM')),
+        cache.key('TIME_SERIES_MONTHLY', 'IBM', iex.cache_params('TIME_SERIES_MONTHLY', 'IBM')),
+        cache.key('TIME_SERIES_DAILY', 'IBM', alpha_vantage.cache_params('TIME_SERIES_DAILY', 'IBM'))
+    }
+    other_key = providers.AlphaVantageProvider(stub_server.url, 'key-b').cache_params('TIME_SERIES_MONTHLY', 'IBM')
+
+    assert len(keys) == 3
+    assert cache.key('TIME_SERIES_MONTHLY', 'IBM', other_key) in keys
+    assert 'token' not in iex.cache_params('TIME_SERIES_MONTHLY', 'IBM')
+
+    utils.get_stock_data(['IBM'], None, None, 'TIME_SERIES_MONTHLY', cache=cache, provider=alpha_vantage)
+    assert cache.get('TIME_SERIES_MONTHLY', 'IBM', iex.cache_params('TIME_SERIES_MONTHLY', 'IBM')) is None
+    assert cache.get('TIME_SERIES_MONTHLY', 'IBM', alpha_vantage.cache_params('TIME_SERIES_MONTHLY', 'IBM')) is not None
@@ -0,0 +1,61 @@
+# Standard Imports
+import json
+
+import numpy as np
+import pytest
+
+from utils import utils
+from utils import decode
+from utils import timeseries
+from utils import instrumentation
+
+# Tests
+
+def test_projected_series_matches_full_parse(make_monthly_payload):
+    payload = make_monthly_payload('AAA', [3.0, 2.5, 2.0, 1.0])
+    raw = json.dumps(payload, indent=4).encode()
+
+    parsed = decode.parse_time_series_bytes(raw, fields=('close', 'volume'))
+    expected = timeseries.parse_time_series(payload, fields=('close', 'volume'))
+
+    assert parsed['symbol'] == 'AAA'
+    assert parsed['last_refreshed'] == '2024-03-22'
+    np.testing.assert_array_equal(parsed['dates'], expected['dates'])
+    np.testing.assert_array_equal(parsed['close'], expected['close'])
+    np.testing.assert_array_equal(parsed['volume'], expected['volume'])
+    assert 'open' not in parsed
+
+def test_projection_keeps_only_dates_since(make_monthly_payload):
+    raw = json.dumps(make_monthly_payload('AAA', [4.0, 3.0, 2.0, 1.0])).encode()
+
+    parsed = decode.parse_time_series_bytes(raw, since='2024-01-01')
+
+    np.testing.assert_array_equal(parsed['dates'].astype(str), ['2024-01-31', '2024-02-29', '2024-03-22'])
+    np.testing.assert_array_equal(parsed['close'], [2.0, 3.0, 4.0])
+
+def test_decoder_falls_back_to_full_decode_for_errors():
+    raw = b'{"Error Message": "Invalid API call."}'
+
+    assert decode.parse_time_series_bytes(raw) is None
+    assert decode.time_series_decoder()(raw) == {"Error Message": "Invalid API call."}
+    assert decode.loads(raw) == json.loads(raw)
+
+@pytest.mark.parametrize('with_orjson', [True, False])
+def test_streamed_returns_project_series_only_without_orjson(stub_server, monkeypatch, with_orjson):
+    if with_orjson:
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(decode, 'orjson', None)
+    data = utils.get_stock_data(['AAA', 'BBB'], stub_server.url, 'demo', 'TIME_SERIES_MONTHLY')
+    expected = utils.calculate_monthly_return_percentage(data, ['One-Year', 'One-Month'])
+
+    instrumentation.enable()
+    try:
+        streamed = utils.stream_monthly_return_percentage(['AAA', 'BBB'], stub_server.url, 'demo', ['One-Year', 'One-Month'])
+        spans = instrumentation.report()['spans']
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+
+    assert ('decode.time_series' in spans) is not with_orjson
+    np.testing.assert_allclose(streamed.iloc[:, 1:].to_numpy(dtype=float), expected.iloc[:, 1:].to_numpy(dtype=float))
@@ -0,0 +1,78 @@
+# Standard Imports
+import zipfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import export
+from src.portfolio_management import price_momentum
+from src.investment_analysis import ratio_analysis
+
+# Tests
+
+def test_resolve_formats_matches_wildcards_in_order():
+    columns = ['Ticker', 'Price', '9-Month Price Return', '9-Month Return Percentile', 'HQM Score', 'Sector']
+
+    formats = export.resolve_formats(columns, price_momentum.EXPORT_SCHEMA)
+
+    assert formats == ['string', 'dollar', 'percent', 'percent', 'percent', 'string']
+    assert export.resolve_formats(['PE Percentile', 'EV/EBITDA'], ratio_analysis.EXPORT_SCHEMA) == ['percent', 'float']
+
+def test_write_excel_puts_every_sheet_in_one_workbook(tmp_path):
+    momentum = pd.DataFrame({'Ticker': ['AAA', 'BBB'], 'Price': [1.5, np.nan], 'HQM Score': [0.9, 0.1]})
+    value = pd.DataFrame({'Ticker': ['CCC'], 'Price': [3.0], 'RV Score': [0.5]})
+    file_path = str(tmp_path / 'trades.xlsx')
+
+    export.write_excel(file_path, [('price_momentum', momentum, price_momentum.EXPORT_SCHEMA), ('ratio_analysis', value, ratio_analysis.EXPORT_SCHEMA)])
+
+    with zipfile.ZipFile(file_path) as workbook:
+        names = workbook.namelist()
+        assert 'xl/worksheets/sheet1.xml' in names and 'xl/worksheets/sheet2.xml' in names
+        assert b'price_momentum' in workbook.read('xl/workbook.xml')
+        assert b'<v>0.9</v>' in workbook.read('xl/worksheets/sheet1.xml')
+
+def test_save_recommended_trades_writes_csv(tmp_path):
+    Dataframe = pd.DataFrame({'Ticker': ['AAA'], 'Price': [10.0], 'HQM Score': [0.75]})
+    file_path = str(tmp_path / 'momentum.csv')
+
+    price_momentum.save_recommended_trades(Dataframe, file_path)
+
+    pd.testing.assert_frame_equal(pd.read_csv(file_path), Dataframe)
+
+def test_parquet_round_trip(tmp_path):
+    pytest.importorskip('pyarrow')
+    Dataframe = pd.DataFrame({'Ticker': ['AAA'], 'RV Score': [0.5]})
+    file_path = str(tmp_path / 'value.parquet')
+
+    ratio_analysis.save_recommended_trades(Dataframe, file_path)
+
+    pd.testing.assert_frame_equal(pd.read_parquet(file_path), Dataframe)
+
+def test_unknown_extension_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        export.export(str(tmp_path / 'trades.txt'), [])
+
+def test_excel_peak_memory_does_not_grow_with_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, 'CHUNK_ROWS', 500)
+
+    def peak_memory(number_of_rows):
+        Dataframe = pd.DataFrame({
+            'Ticker': [f'T{index}' for index in range(number_of_rows)],
+            'Price': np.linspace(1, 2, number_of_rows),
+            'One-Year Price Return': np.linspace(-1, 1, number_of_rows),
+            'HQM Score': np.linspace(0, 1, number_of_rows)
+        })
+        tracemalloc.start()
+        try:
+            export.write_excel(str(tmp_path / f'{number_of_rows}.xlsx'), [('price_momentum', Dataframe, price_momentum.EXPORT_SCHEMA)])
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    peak_memory(100)
+    small = peak_memory(2_000)
+    large = peak_memory(10_000)
+
+    assert large < 1.3 * small
@@ -0,0 +1,125 @@
+# Standard Imports
+import time
+
+import pytest
+
+from utils import utils
+from utils import fetcher
+from utils import providers
+from utils.cache import ResponseCache
+
+# Tests
+
+def test_get_stock_data_preserves_order_and_shape(stub_server):
+    tickers = ['AAA', 'BBB', 'CCC', 'DDD']
+    data = utils.get_stock_data(tickers, stub_server.url, 'demo', 'TIME_SERIES_MONTHLY')
+
+    assert [payload['Meta Data']['2. Symbol'] for payload in data] == tickers
+    assert all('Monthly Time Series' in payload for payload in data)
+
+def test_get_stock_data_runs_concurrently(stub_server):
+    stub_server.latency = 0.2
+    tickers = [f'T{index}' for index in range(8)]
+
+    start = time.perf_counter()
+    data = utils.get_stock_data(tickers, stub_server.url, 'demo', 'TIME_SERIES_MONTHLY', max_workers=8)
+    elapsed = time.perf_counter() - start
+
+    assert len(data) == 8
+    assert elapsed < 0.2 * 8 / 2
+
+def test_fetch_retries_after_429(stub_server, monkeypatch):
+    monkeypatch.setattr(fetcher, 'BACKOFF_FACTOR', 0.01)
+    stub_server.throttle = 2
+
+    data = utils.get_stock_data(['AAA', 'BBB'], stub_server.url, 'demo', 'TIME_SERIES_MONTHLY')
+
+    assert [payload['Meta Data']['2. Symbol'] for payload in data] == ['AAA', 'BBB']
+    assert stub_server.requests == 6
+
+def test_fetch_gives_up_after_max_retries(stub_server, monkeypatch):
+    monkeypatch.setattr(fetcher, 'BACKOFF_FACTOR', 0.01)
+    stub_server.throttle = 10
+
+    data = fetcher.fetch_all(stub_server.url, [{'symbol': 'AAA'}, {'symbol': 'BBB'}], max_retries=1)
+
+    assert [fetcher.is_valid_payload(payload) for payload in data] == [False, False]
+    assert 'HTTP 429' in data[0]['Error Message']
+
+def test_fetch_retries_timeouts_then_returns_error_payload(stub_server, monkeypatch):
+    monkeypatch.setattr(fetcher, 'BACKOFF_FACTOR', 0.01)
+    monkeypatch.setattr(fetcher, 'REQUEST_TIMEOUT', 0.05)
+    stub_server.latency = 0.3
+
+    data = fetcher.fetch_all(stub_server.url, [{'symbol': 'AAA'}], max_retries=1)
+
+    assert not fetcher.is_valid_payload(data[0])
+    assert stub_server.requests == 2
+
+def test_token_bucket_throttles_to_rate():
+    now = [0.0]
+    bucket = fetcher.TokenBucket(2, 60, clock=lambda: now[0], sleep=lambda seconds: now.__setitem__(0, now[0] + seconds))
+
+    for _ in range(4):
+        bucket.acquire()
+
+    assert now[0] == pytest.approx(60.0)
+
+def test_rate_limiter_enforces_daily_quota():
+    limiter = fetcher.RateLimiter(requests_per_minute=None, requests_per_day=2)
+    limiter.acquire()
+    limiter.acquire()
+
+    with pytest.raises(fetcher.QuotaExhausted):
+        limiter.acquire()
+
+def test_daily_quota_resets_on_a_new_day_and_persists_across_processes(tmp_path):
+    day = ['2024-05-01']
+    state_path = str(tmp_path / 'alphavantage.quota')
+    quota = fetcher.DailyQuota(2, state_path, today=lambda: day[0])
+
+    assert quota.try_acquire() and quota.try_acquire()
+    assert not fetcher.DailyQuota(2, state_path, today=lambda: day[0]).try_acquire()
+    day[0] = '2024-05-02'
+    assert quota.try_acquire()
+
+def test_requests_past_the_daily_quota_become_error_payloads(stub_server, tmp_path):
+    tickers = [f'T{index}' for index in range(6)]
+    provider = providers.AlphaVantageProvider(stub_server.url)
+    provider.requests_per_day = 4
+    cache = ResponseCache(str(tmp_path))
+
+    data = utils.get_stock_data(tickers, stub_server.url, 'demo', 'TIME_SERIES_MONTHLY', max_workers=1, cache=cache, provider=provider)
+
+    assert len(data) == len(tickers)
+    assert [fetcher.is_valid_payload(payload) for payload in data] == [True] * 4 + [False] * 2
+    assert 'quota' in data[-1]['Error Message']
+    assert stub_server.requests == 4
+
+    # The count is kept next to the cache, so a later run cannot fetch past it either.
+    data = utils.get_stock_data(tickers, stub_server.url, 'demo', 'TIME_SERIES_MONTHLY', max_workers=1, cache=ResponseCache(str(tmp_path)), provider=provider)
+
+    assert [fetcher.is_valid_payload(payload) for payload in data] == [True] * 4 + [False] * 2
+    assert stub_server.requests == 4
+
+def test_iter_fetch_yields_every_payload_with_bounded_window(stub_server):
+    params_list = ({'symbol': f'T{index}'} for index in range(10))
+
+    results = dict(fetcher.iter_fetch(stub_server.url, params_list, max_workers=2, window=3))
+
+    assert sorted(results) == list(range(10))
+    assert results[7]['Meta Data']['2. Symbol'] == 'T7'
+
+def test_iter_fetch_cancels_queued_requests_when_consumer_stops(stub_server):
+    stub_server.latency = 0.2
+    params_list = [{'symbol': f'T{index}'} for index in range(20)]
+
+    start = time.perf_counter()
+    stream = fetcher.iter_fetch(stub_server.url, params_list, max_workers=2, window=10)
+    next(stream)
+    stream.close()
+    elapsed = time.perf_counter() - start
+
+    time.sleep(0.3)
+    assert elapsed < 0.2 * 3
+    assert stub_server.requests <= 4
@@ -0,0 +1,117 @@
+# Standard Imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import utils
+from utils import ingest
+from utils import providers
+from utils import timeseries
+from src import strategies
+
+# Constants
+TICKERS = ['MSFT', 'AAPL', 'NVDA']
+
+# Functions
+
+def daily_bars():
+    dates = pd.bdate_range('2023-01-02', '2024-03-22')
+    frames = []
+    for seed, ticker in enumerate(TICKERS, start=1):
+        close = 100.0 * (1 + seed / 1000) ** np.arange(len(dates))
+        frames.append(pd.DataFrame({
+            'symbol': ticker,
+            'date': dates.strftime('%Y-%m-%d'),
+            'open': close - 1,
+            'high': close + 1,
+            'low': close - 2,
+            'close': close,
+            'volume': 1000.0,
+            'unused': 'x'
+        }))
+    # Shuffled so months of one ticker span several chunks.
+    return pd.concat(frames, ignore_index=True).sample(frac=1.0, random_state=7)
+
+def chart_payloads(bars):
+    payloads = []
+    for ticker, rows in bars.groupby('symbol'):
+        chart = rows.drop(columns=['symbol', 'unused']).to_dict('records')
+        payloads.append(providers.monthly_payload(ticker, {'chart': chart}))
+    return payloads
+
+# Tests
+
+@pytest.mark.parametrize('extension', ['csv', 'parquet'])
+def test_price_matrix_matches_payload_parsing(tmp_path, extension):
+    bars = daily_bars()
+    file_path = str(tmp_path / f'bars.{extension}')
+    bars.to_csv(file_path, index=False) if extension == 'csv' else bars.to_parquet(file_path, index=False)
+
+    price_matrix = ingest.load_price_matrix(file_path, fields=('open', 'close', 'volume'), chunk_rows=97, max_workers=3)
+    expected = timeseries.build_price_matrix(chart_payloads(bars), fields=('open', 'close', 'volume'))
+
+    assert price_matrix.tickers == sorted(TICKERS)
+    np.testing.assert_array_equal(price_matrix.dates, expected.dates)
+    np.testing.assert_allclose(price_matrix.close, expected.close, rtol=1e-6)
+    np.testing.assert_allclose(price_matrix.fields['open'], expected.fields['open'], rtol=1e-6)
+    np.testing.assert_allclose(price_matrix.fields['volume'], expected.fields['volume'])
+    assert price_matrix.last_refreshed == ['2024-03-22'] * len(TICKERS)
+
+    returns = utils.calculate_monthly_return_percentage(price_matrix, ['One-Year', 'One-Month'])
+    expected_returns = utils.calculate_monthly_return_percentage(expected, ['One-Year', 'One-Month'])
+    pd.testing.assert_frame_equal(returns, expected_returns, rtol=1e-4)
+
+def test_price_matrix_honours_column_mapping_and_ticker_filter(tmp_path):
+    bars = daily_bars().rename(columns={'symbol': 'Ticker', 'date': 'Date', 'close': 'Adj Close'})
+    file_path = str(tmp_path / 'bars.csv')
+    bars.to_csv(file_path, index=False)
+
+    price_matrix = ingest.load_price_matrix(file_path, columns={'symbol': 'Ticker', 'date': 'Date', 'close': 'Adj Close'}, tickers=['NVDA'])
+
+    assert price_matrix.tickers == ['NVDA']
+    assert price_matrix.close.shape == (1, 15)
+
+def test_overview_feeds_get_ratios(tmp_path):
+    file_path = str(tmp_path / 'overview.csv')
+    pd.DataFrame({
+        'Symbol': ['MSFT', 'AAPL'],
+        'Name': ['Microsoft', 'Apple'],
+        'MarketCapitalization': [3e12, 2.8e12],
+        'PERatio': [35.0, None],
+        'PriceToBookRatio': [12.0, 45.0],
+        'PriceToSalesRatioTTM': [13.0, 7.5],
+        'EVToEBITDA': [25.0, 22.0],
+        'EVToRevenue': [13.0, 7.4]
+    }).to_csv(file_path, index=False)
+
+    overview = ingest.load_overview(file_path, tickers=['AAPL'])
+    ratios = utils.get_ratios(overview, {'AAPL': 170.0})
+
+    assert overview[0]['PERatio'] is None
+    assert ratios['Ticker'].tolist() == ['AAPL']
+    assert np.isnan(ratios['Price-to-Earnings Ratio'][0])
+    assert ratios['Price-to-Book Ratio'][0] == 45.0
+
+def test_offline_dataset_runs_strategies_without_network(tmp_path):
+    bars_path = str(tmp_path / 'bars.parquet')
+    daily_bars().to_parquet(bars_path, index=False)
+
+    dataset = strategies.load_offline_dataset(bars_path, ['hqm'])
+    sheets = strategies.run_strategies(dataset, ['hqm'], 10000.0)
+
+    assert set(sheets[0][1]['Ticker']) == set(TICKERS)
+    with pytest.raises(ValueError):
+        strategies.load_offline_dataset(bars_path, ['rv'])
+
+def test_stock_tickers_are_cached_until_the_file_changes(tmp_path):
+    file_path = tmp_path / 'stocks.csv'
+    file_path.write_text('Ticker,Name\nAAPL,Apple\n')
+    assert utils.get_stock_tickers(str(file_path)) == ['AAPL']
+
+    tickers = utils.get_stock_tickers(str(file_path))
+    tickers.append('MUTATED')
+    assert utils.get_stock_tickers(str(file_path)) == ['AAPL']
+
+    file_path.write_text('Ticker,Name\nAAPL,Apple\nMSFT,Microsoft\n')
+    utils.os.utime(file_path, ns=(0, 10**18))
+    assert utils.get_stock_tickers(str(file_path)) == ['AAPL', 'MSFT']
@@ -0,0 +1,97 @@
+# Standard Imports
+import json
+import tracemalloc
+
+import pandas as pd
+import pytest
+
+from utils import utils
+from utils import fetcher
+from utils import instrumentation
+from src.portfolio_management import price_momentum
+
+# Fixtures
+
+@pytest.fixture
+def instrumented():
+    instrumentation.enable()
+    yield instrumentation
+    instrumentation.disable()
+    instrumentation.reset()
+
+# Tests
+
+def test_disabled_instrumentation_records_nothing():
+    assert instrumentation.span('anything') is instrumentation.NULL_SPAN
+
+    instrumentation.count('requests')
+    price_momentum.calculate_hqm_score(pd.DataFrame({'One-Year Price Return': [1.0], 'One-Year Return Percentile': [0.5]}))
+
+    assert instrumentation.report()['spans'] == {}
+
+def test_stage_spans_carry_rows_and_request_counters(instrumented, stub_server):
+    data = utils.get_stock_data(['AAA', 'BBB'], stub_server.url, 'demo', 'TIME_SERIES_MONTHLY')
+    utils.calculate_monthly_return_percentage(data, price_momentum.time_periods)
+
+    report = instrumented.report()
+
+    assert report['spans']['utils.get_stock_data']['counters']['rows'] == 2
+    assert report['spans']['decode.json']['calls'] == 2
+    assert report['spans']['decode.json']['bytes_per_second'] > 0
+    assert report['spans']['utils.calculate_monthly_return_percentage']['calls'] == 1
+    assert report['counters']['http_requests'] == 2
+    assert report['counters']['bytes'] > 0
+
+def test_nested_span_counters_roll_up(instrumented):
+    with instrumented.span('outer', rows=3):
+        with instrumented.span('inner'):
+            instrumented.count('cache_hits', 2)
+
+    report = instrumented.report()
+
+    assert report['spans']['outer']['counters'] == {'rows': 3, 'cache_hits': 2}
+    assert report['spans']['inner']['counters'] == {'cache_hits': 2}
+
+def test_profile_and_memory_capture_are_emitted_as_json(tmp_path):
+    instrumentation.enable(profile=True, memory=True)
+    try:
+        with instrumentation.span('work'):
+            sum(range(10000))
+        file_path = tmp_path / 'profile.json'
+        instrumentation.emit(str(file_path))
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+
+    report = json.loads(file_path.read_text())
+    assert report['profile']
+    assert report['memory']['peak_bytes'] >= 0
+    assert report['spans']['work']['calls'] == 1
+
+def test_worker_thread_counters_reach_the_callers_span(instrumented, stub_server):
+    params_list = [{'function': 'TIME_SERIES_MONTHLY', 'symbol': symbol, 'apikey': 'demo'} for symbol in ('AAA', 'BBB', 'CCC')]
+
+    with instrumented.span('caller'):
+        fetcher.fetch_all(stub_server.url, params_list, max_workers=3)
+        list(fetcher.iter_fetch(stub_server.url, params_list, max_workers=3))
+
+    counters = instrumented.report()['spans']['caller']['counters']
+    assert counters['http_requests'] == 6
+    assert counters['bytes'] == instrumented.report()['counters']['bytes']
+
+def test_disable_leaves_tracemalloc_started_elsewhere_running():
+    tracemalloc.start()
+    try:
+        instrumentation.enable(memory=True)
+        instrumentation.disable()
+        instrumentation.reset()
+
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+    instrumentation.enable(memory=True)
+    instrumentation.disable()
+    instrumentation.reset()
+
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,54 @@
+# Standard Imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import utils
+from utils import position_sizing
+
+# Tests
+
+def test_portfolio_is_split_not_repeated():
+    trades = pd.DataFrame({'Ticker': ['AAA', 'BBB'], 'Price': [10.0, 25.0]})
+
+    trades = utils.calculate_number_of_shares_to_buy(1000, trades, spend_leftover=False)
+
+    assert trades['Number of Shares to Buy'].tolist() == [50.0, 20.0]
+
+def test_leftover_cash_is_spent_without_exceeding_budget():
+    rng = np.random.default_rng(1)
+    prices = rng.uniform(5, 900, 200)
+
+    floored, floored_cash = position_sizing.allocate_shares(100000, prices, position_sizing.equal_weights(200), spend_leftover=False)
+    shares, cash = position_sizing.allocate_shares(100000, prices, position_sizing.equal_weights(200))
+
+    assert shares @ prices == pytest.approx(100000 - cash)
+    assert 0 <= cash < floored_cash
+    assert cash < prices.max()
+    assert (shares >= floored).all() and (shares - floored <= 1).all()
+
+def test_score_and_inverse_volatility_weights():
+    np.testing.assert_allclose(position_sizing.score_weights([3.0, 1.0, np.nan, -1.0]), [0.75, 0.25, 0.0, 0.0])
+    np.testing.assert_allclose(position_sizing.inverse_volatility_weights([0.1, 0.2, 0.0]), [2 / 3, 1 / 3, 0.0])
+
+    trades = pd.DataFrame({'Ticker': ['AAA', 'BBB'], 'Price': [1.0, 1.0], 'HQM Score': [0.9, 0.3]})
+    trades = position_sizing.size_positions(1200, trades, 'score', score_column='HQM Score')
+    assert trades['Number of Shares to Buy'].tolist() == [900.0, 300.0]
+
+def test_lot_size_and_minimum_position():
+    prices = np.array([10.0, 20.0, 1000.0, np.nan])
+
+    shares, cash = position_sizing.allocate_shares(3000, prices, [0.5, 0.3, 0.2, 0.0], lot_size=10, min_position=700)
+
+    assert shares[2] == 0 and np.isnan(shares[3])
+    assert (shares[:2] % 10 == 0).all()
+    assert (shares[:2] * prices[:2] >= 700).all()
+    assert shares[:2] @ prices[:2] + cash == pytest.approx(3000)
+
+def test_trailing_volatility_ignores_gaps():
+    close = np.array([[100.0, 110.0, 99.0, 108.9], [100.0, np.nan, 100.0, 100.0], [np.nan, np.nan, np.nan, 5.0]])
+
+    volatility = position_sizing.trailing_volatility(close)
+
+    assert volatility[0] == pytest.approx(np.std([0.1, -0.1, 0.1], ddof=1))
+    assert np.isnan(volatility[1]) and np.isnan(volatility[2])
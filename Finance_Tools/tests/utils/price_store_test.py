@@ -0,0 +1,92 @@
+# Standard Imports
+import os
+
+import numpy as np
+import pytest
+
+from utils import utils
+from utils import timeseries
+from utils.price_store import PriceStore
+
+# Functions
+
+def matrix(make_monthly_payload, closes_by_ticker, last_refreshed='2024-03-22'):
+    payloads = [make_monthly_payload(ticker, closes, last_refreshed) for ticker, closes in closes_by_ticker.items()]
+    return timeseries.build_price_matrix(payloads, fields=('close', 'volume'))
+
+# Tests
+
+def test_round_trip_is_zero_copy(tmp_path, make_monthly_payload):
+    original = matrix(make_monthly_payload, {'AAA': [13.0, 12.0, 11.0], 'BBB': [23.0, 22.0]})
+    store = PriceStore.create(str(tmp_path), ticker_capacity=16).write(original)
+
+    loaded = PriceStore(str(tmp_path)).price_matrix()
+
+    assert loaded.tickers == ['AAA', 'BBB']
+    np.testing.assert_array_equal(loaded.dates, original.dates)
+    np.testing.assert_array_equal(loaded.close, original.close)
+    assert isinstance(loaded.close.base, np.memmap) or isinstance(loaded.close, np.memmap)
+    assert loaded.last_refreshed == ['2024-03-22', '2024-03-22']
+    assert len(store) == 2
+
+def test_new_month_appends_without_rewriting(tmp_path, make_monthly_payload):
+    store = PriceStore.create(str(tmp_path), fields=('close',), ticker_capacity=4)
+    store.write(matrix(make_monthly_payload, {'AAA': [12.0, 11.0, 10.0]}, '2024-03-22'))
+    size = os.path.getsize(store.path('close'))
+    with open(store.path('close'), 'rb') as file:
+        before = file.read()
+
+    store.write(matrix(make_monthly_payload, {'AAA': [13.0, 12.5], 'CCC': [5.0, 4.0]}, '2024-04-19'))
+
+    with open(store.path('close'), 'rb') as file:
+        after = file.read()
+    assert len(after) == size + 4 * 8
+    assert after[:size - 4 * 8] == before[:size - 4 * 8]
+    loaded = store.price_matrix(['CCC', 'AAA', 'ZZZ'])
+    assert loaded.tickers == ['CCC', 'AAA']
+    np.testing.assert_array_equal(loaded.close[1], [10.0, 11.0, 12.5, 13.0])
+    np.testing.assert_array_equal(loaded.close[0], [np.nan, np.nan, 4.0, 5.0])
+
+def test_date_range_and_returns_match_payloads(tmp_path, make_monthly_payload):
+    closes = {'AAA': [100.0 + index for index in range(13)][::-1], 'BBB': [50.0 - index for index in range(13)][::-1]}
+    payloads = [make_monthly_payload(ticker, values) for ticker, values in closes.items()]
+    store = PriceStore.create(str(tmp_path)).write(timeseries.build_price_matrix(payloads))
+
+    from_store = utils.calculate_monthly_return_percentage(store.price_matrix(), ['One-Year', 'One-Month'])
+    from_payloads = utils.calculate_monthly_return_percentage(payloads, ['One-Year', 'One-Month'])
+
+    np.testing.assert_allclose(from_store.drop(columns='Ticker').to_numpy(), from_payloads.drop(columns='Ticker').to_numpy())
+    assert len(store.price_matrix(start='2023-12', end='2024-02').dates) == 3
+
+def test_capacity_is_enforced(tmp_path, make_monthly_payload):
+    store = PriceStore.create(str(tmp_path), ticker_capacity=1).write(matrix(make_monthly_payload, {'AAA': [2.0, 1.0]}))
+
+    with pytest.raises(ValueError):
+        store.write(matrix(make_monthly_payload, {'BBB': [2.0, 1.0]}))
+
+def test_new_ticker_with_older_history_rebases_the_store(tmp_path, make_monthly_payload):
+    store = PriceStore.create(str(tmp_path), ticker_capacity=4)
+    store.write(matrix(make_monthly_payload, {'AAA': [12.0, 11.0, 10.0]}))
+    start = store.start
+
+    store.write(matrix(make_monthly_payload, {'BBB': [25.0, 24.0, 23.0, 22.0, 21.0]}))
+    loaded = PriceStore(str(tmp_path)).price_matrix()
+
+    assert loaded.dates[0] == start - 2
+    assert loaded.tickers == ['AAA', 'BBB']
+    np.testing.assert_array_equal(loaded.close[0], [np.nan, np.nan, 10.0, 11.0, 12.0])
+    np.testing.assert_array_equal(loaded.close[1], [21.0, 22.0, 23.0, 24.0, 25.0])
+    assert os.path.getsize(store.path('close')) == 5 * 4 * 8
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+def test_daily_store_reads_back_trading_days(tmp_path):
+    dates = np.array(['2024-03-14', '2024-03-15', '2024-03-18', '2024-03-19'], dtype='datetime64[D]')
+    original = timeseries.PriceMatrix(['AAA'], dates, {'close': np.array([[1.0, 2.0, 3.0, 4.0]])}, ['2024-03-19'], 'D')
+    store = PriceStore.create(str(tmp_path), fields=('close',), ticker_capacity=4, frequency='D').write(original)
+
+    loaded = store.price_matrix()
+
+    assert store.number_of_dates == 6
+    assert loaded.frequency == 'D'
+    np.testing.assert_array_equal(loaded.dates, dates)
+    np.testing.assert_array_equal(loaded.close, original.close)
@@ -0,0 +1,103 @@
+# Standard Imports
+import numpy as np
+import pytest
+
+from utils import utils
+from utils import timeseries
+from utils import providers
+from utils.cache import ResponseCache
+
+# Constants
+TICKERS = [f'T{index:03d}' for index in range(250)]
+
+# Functions
+
+def daily_chart(seed, days=90):
+    dates = np.arange(np.datetime64('2024-01-02'), np.datetime64('2024-01-02') + days)
+    dates = dates[np.is_busday(dates)]
+    closes = 50.0 + seed + np.arange(len(dates))
+    return [
+        {'date': str(date), 'open': close - 1, 'high': close + 1, 'low': close - 2, 'close': close, 'volume': 100}
+        for date, close in zip(dates, closes)
+    ]
+
+def iex_batch(query):
+    response = {}
+    for symbol in query['symbols'].split(','):
+        if symbol == 'T007':
+            continue
+        seed = int(symbol[1:])
+        if 'chart' in query['types']:
+            response[symbol] = {'chart': daily_chart(seed)}
+        else:
+            response[symbol] = {
+                'quote': {'peRatio': 10 + seed, 'marketCap': 1e9},
+                'advanced-stats': {'priceToBook': 2.0, 'priceToSales': None, 'enterpriseValue': 600.0, 'EBITDA': 50.0, 'enterpriseValueToRevenue': 3.5}
+            }
+    return response
+
+# Tests
+
+def test_batch_provider_chunks_symbols(stub_server):
+    stub_server.payload = iex_batch
+    provider = providers.IEXBatchProvider(stub_server.url, token='test')
+
+    payloads = utils.get_stock_data(TICKERS, None, None, 'TIME_SERIES_MONTHLY', provider=provider)
+
+    assert stub_server.requests == 3
+    assert payloads[7] == {}
+    assert [payload['Meta Data']['2. Symbol'] for payload in payloads if payload] == [ticker for ticker in TICKERS if ticker != 'T007']
+
+def test_monthly_bars_are_normalized_to_the_internal_schema(stub_server):
+    stub_server.payload = iex_batch
+    provider = providers.IEXBatchProvider(stub_server.url)
+
+    payloads = utils.get_stock_data(['T001', 'T002'], None, None, 'TIME_SERIES_MONTHLY', provider=provider)
+    parsed = timeseries.parse_time_series(payloads[0], fields=('open', 'high', 'low', 'close', 'volume'))
+
+    chart = daily_chart(1)
+    january = [bar for bar in chart if bar['date'] < '2024-02-01']
+    assert parsed['dates'][0] == np.datetime64(january[-1]['date'])
+    assert parsed['close'][0] == january[-1]['close']
+    assert parsed['open'][0] == january[0]['open']
+    assert parsed['high'][0] == max(bar['high'] for bar in january)
+    assert parsed['volume'][0] == 100 * len(january)
+    assert payloads[0]['Meta Data']['3. Last Refreshed'] == chart[-1]['date']
+
+def test_overview_is_normalized_and_cached(stub_server, tmp_path):
+    stub_server.payload = iex_batch
+    provider = providers.IEXBatchProvider(stub_server.url)
+    cache = ResponseCache(str(tmp_path))
+
+    overview = utils.get_stock_data(['T001', 'T007'], None, None, 'OVERVIEW', cache=cache, provider=provider)
+    ratios = utils.get_ratios(overview, {'T001': 20.0})
+    utils.get_stock_data(['T001', 'T007'], None, None, 'OVERVIEW', cache=cache, provider=provider)
+
+    assert ratios['Price-to-Earnings Ratio'].tolist() == [11.0]
+    assert ratios['EV/EBITDA'].tolist() == [12.0]
+    assert np.isnan(ratios.loc[0, 'Price-to-Sales Ratio'])
+    assert stub_server.requests == 2
+
+def test_alpha_vantage_provider_requests_one_symbol(stub_server):
+    payloads = utils.get_stock_data(['AAA', 'BBB'], stub_server.url, 'demo', 'TIME_SERIES_MONTHLY')
+
+    assert stub_server.requests == 2
+    assert [payload['Meta Data']['2. Symbol'] for payload in payloads] == ['AAA', 'BBB']
+
+def test_alpha_vantage_quotas_default_to_the_free_tier():
+    free = providers.AlphaVantageProvider().rate_limiter()
+    premium = providers.AlphaVantageProvider(tier='premium').rate_limiter()
+
+    assert (free.minute_bucket.capacity, free.day_quota.limit) == (5, 25)
+    assert premium.minute_bucket.capacity == 75
+    assert premium.day_quota is None
+
+def test_providers_must_implement_params_and_normalize():
+    class ParamsOnly(providers.Provider):
+        def params(self, function, symbols):
+            return {'function': function, 'symbol': symbols[0]}
+
+    with pytest.raises(TypeError, match='normalize'):
+        ParamsOnly('http://localhost')
+    with pytest.raises(TypeError):
+        providers.Provider('http://localhost')
@@ -0,0 +1,45 @@
+# Standard Imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import ranking
+from src.portfolio_management import price_momentum
+
+# Tests
+
+def test_matches_percentileofscore_rank_with_ties():
+    stats = pytest.importorskip('scipy.stats')
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        scores = rng.integers(0, 8, size=rng.integers(1, 60)).astype(float)
+        expected = [stats.percentileofscore(scores, score) for score in scores]
+
+        assert np.array_equal(ranking.percentile_of_scores(scores), expected)
+
+def test_ranks_each_column_independently():
+    matrix = np.array([[1.0, 30.0], [2.0, 10.0], [2.0, 20.0]])
+
+    result = ranking.percentile_of_scores(matrix, axis=0)
+
+    np.testing.assert_allclose(result[:, 0], [100 / 3, 250 / 3, 250 / 3])
+    np.testing.assert_allclose(result[:, 1], [100.0, 100 / 3, 200 / 3])
+
+def test_nan_values_are_omitted_from_population():
+    result = ranking.percentile_of_scores([1.0, np.nan, 3.0, 2.0])
+
+    np.testing.assert_allclose(result, [100 / 3, np.nan, 100.0, 200 / 3])
+    assert np.isnan(ranking.percentile_of_scores([1.0, np.nan], nan_policy='propagate')).all()
+
+def test_groups_rank_within_each_group():
+    result = ranking.percentile_of_scores([1.0, 5.0, 2.0, 6.0], groups=['Tech', 'Energy', 'Tech', 'Energy'])
+
+    np.testing.assert_allclose(result, [50.0, 50.0, 100.0, 100.0])
+
+def test_calculate_return_percentile_fills_every_period():
+    Dataframe = pd.DataFrame({f'{time_period} Price Return': [3.0, 1.0, 2.0] for time_period in price_momentum.time_periods})
+
+    result = price_momentum.calculate_return_percentile(Dataframe)
+
+    for time_period in price_momentum.time_periods:
+        np.testing.assert_allclose(result[f'{time_period} Return Percentile'], [1.0, 1 / 3, 2 / 3])
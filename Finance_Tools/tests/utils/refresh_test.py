@@ -0,0 +1,53 @@
+# Standard Imports
+import datetime
+
+import numpy as np
+
+from utils import utils
+from utils import refresh
+from utils.cache import ResponseCache
+
+# Constants
+TIME_PERIODS = ['One-Year', 'Six-Month', 'Three-Month', 'One-Month']
+
+# Tests
+
+def test_expected_last_refreshed_skips_weekends():
+    assert refresh.expected_last_refreshed(datetime.date(2024, 3, 25)) == '2024-03-22'
+    assert refresh.expected_last_refreshed(datetime.date(2024, 3, 27)) == '2024-03-26'
+
+def test_only_stale_tickers_are_refetched(stub_server, tmp_path):
+    state_path = str(tmp_path / 'state.json')
+    tickers = ['AAA', 'BBB', 'CCC']
+
+    first = refresh.refresh_monthly_return_percentage(tickers, stub_server.url, 'demo', TIME_PERIODS, state_path=state_path, today=datetime.date(2024, 3, 25))
+    second = refresh.refresh_monthly_return_percentage(tickers + ['DDD'], stub_server.url, 'demo', TIME_PERIODS, state_path=state_path, today=datetime.date(2024, 3, 25))
+
+    assert stub_server.requests == 4
+    assert list(second['Ticker']) == tickers + ['DDD']
+    np.testing.assert_allclose(second['One-Year Price Return'][:3], first['One-Year Price Return'])
+
+def test_result_matches_full_recalculation(stub_server, tmp_path, make_monthly_payload):
+    tickers = ['AAA', 'BBB']
+
+    refreshed = refresh.refresh_monthly_return_percentage(tickers, stub_server.url, 'demo', TIME_PERIODS, state_path=str(tmp_path / 'state.json'))
+    full = utils.stream_monthly_return_percentage(tickers, stub_server.url, 'demo', TIME_PERIODS)
+
+    np.testing.assert_allclose(refreshed.drop(columns='Ticker').to_numpy(), full.drop(columns='Ticker').to_numpy())
+
+def test_behind_tickers_wait_for_recheck_interval():
+    state = {'AAA': {'last_refreshed': '2024-03-22', 'checked_at': 1000.0, 'price': 1.0, 'returns': {period: 0.0 for period in TIME_PERIODS}}}
+
+    assert refresh.stale_tickers(state, ['AAA'], TIME_PERIODS, today=datetime.date(2024, 3, 28), now=1000.0 + 60) == []
+    assert refresh.stale_tickers(state, ['AAA'], TIME_PERIODS, today=datetime.date(2024, 3, 28), now=1000.0 + 86400) == ['AAA']
+    assert refresh.stale_tickers(state, ['AAA'], TIME_PERIODS + ['Nine-Month'], today=datetime.date(2024, 3, 25), now=1000.0) == ['AAA']
+
+def test_stale_tickers_are_served_from_the_response_cache(stub_server, tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache'))
+    options = dict(today=datetime.date(2024, 3, 25), cache=cache)
+
+    refresh.refresh_monthly_return_percentage(['AAA', 'BBB'], stub_server.url, 'demo', TIME_PERIODS, state_path=str(tmp_path / 'first.json'), **options)
+    refresh.refresh_monthly_return_percentage(['AAA', 'BBB'], stub_server.url, 'demo', TIME_PERIODS, state_path=str(tmp_path / 'second.json'), **options)
+
+    assert stub_server.requests == 2
+    assert cache.stats() == {'hits': 2, 'misses': 2}
@@ -0,0 +1,67 @@
+# Standard Imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import rolling
+from utils import timeseries
+
+# Functions
+
+def price_matrix(number_of_months=40, tickers=('AAA', 'BBB', 'CCC')):
+    generator = np.random.default_rng(3)
+    returns = generator.normal(0.01, 0.05, size=(len(tickers), number_of_months))
+    close = 100.0 * np.cumprod(1 + returns, axis=1)
+    close[2, :7] = np.nan
+    dates = np.arange(np.datetime64('2021-01'), np.datetime64('2021-01') + number_of_months)
+    return timeseries.PriceMatrix(list(tickers), dates, {'close': close})
+
+def sliced(matrix, stop, rows=slice(None)):
+    return timeseries.PriceMatrix(np.array(matrix.tickers)[rows].tolist(), matrix.dates[:stop], {'close': matrix.close[rows, :stop]})
+
+# Tests
+
+def test_statistics_match_full_recomputation():
+    matrix = price_matrix()
+    frame = pd.DataFrame(matrix.close.T)
+    returns = frame.pct_change(fill_method=None).iloc[-12:]
+
+    stats = rolling.RollingStats.from_price_matrix(matrix)
+
+    np.testing.assert_allclose(stats.volatility(), returns.std().to_numpy())
+    np.testing.assert_allclose(stats.momentum(), (1 + returns).prod().to_numpy() - 1)
+    np.testing.assert_allclose(stats.sharpe(), (returns.mean() / returns.std()).to_numpy() * np.sqrt(12))
+    np.testing.assert_allclose(stats.drawdown(), (frame.iloc[-1] / frame.max() - 1).to_numpy())
+    assert stats.window == 12 and stats.last_date == '2024-04'
+
+def test_saved_state_only_applies_new_bars(tmp_path):
+    matrix = price_matrix()
+    path = str(tmp_path / 'rolling.npz')
+    rolling.update_state(sliced(matrix, 30), path)
+
+    updated = rolling.update_state(matrix, path)
+    expected = rolling.RollingStats.from_price_matrix(matrix)
+
+    assert updated.position == 40
+    for name, values in expected.factors().items():
+        np.testing.assert_allclose(updated.factors()[name], values, err_msg=name)
+
+def test_new_ticker_is_backfilled_in_line():
+    matrix = price_matrix()
+    stats = rolling.RollingStats.from_price_matrix(sliced(matrix, 30, slice(0, 2)))
+
+    stats.extend(matrix)
+    expected = rolling.RollingStats.from_price_matrix(matrix)
+
+    assert stats.tickers == matrix.tickers
+    np.testing.assert_allclose(stats.volatility(), expected.volatility())
+    np.testing.assert_allclose(stats.drawdown(), expected.drawdown())
+
+def test_add_factors_leaves_unknown_tickers_empty():
+    stats = rolling.RollingStats.from_price_matrix(price_matrix())
+
+    frame = rolling.add_factors(pd.DataFrame({'Ticker': ['BBB', 'ZZZ']}), stats)
+
+    assert list(frame.columns[1:]) == list(rolling.FACTORS)
+    assert frame.loc[0, 'Rolling Sharpe'] == pytest.approx(stats.sharpe()[1])
+    assert frame.loc[1, rolling.FACTORS].isna().all()
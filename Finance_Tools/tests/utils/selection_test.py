@@ -0,0 +1,47 @@
+# Standard Imports
+import numpy as np
+import pandas as pd
+
+from utils import selection
+from src.investment_analysis import ratio_analysis
+
+# Tests
+
+def test_select_top_matches_full_sort_with_ticker_tie_breaks():
+    rng = np.random.default_rng(11)
+    Dataframe = pd.DataFrame({'Ticker': [f'T{index:03d}' for index in range(500)], 'Score': rng.integers(0, 40, 500).astype(float)})
+
+    top = selection.select_top(Dataframe, 'Score', 50)
+    expected = Dataframe.sort_values(['Score', 'Ticker'], ascending=[False, True]).head(50)
+
+    assert list(top['Ticker']) == list(expected['Ticker'])
+
+def test_select_top_skips_nan_and_low_scores():
+    Dataframe = pd.DataFrame({'Ticker': ['A', 'B', 'C', 'D'], 'Score': [0.9, np.nan, 0.2, 0.5]})
+
+    top = selection.select_top(Dataframe, 'Score', 3, min_score=0.4)
+
+    assert list(top['Ticker']) == ['A', 'D']
+
+def test_top_rv_stocks_leaves_input_untouched():
+    Dataframe = pd.DataFrame({'Ticker': ['A', 'B', 'C'], 'RV Score': [0.1, 0.9, 0.5]})
+    original = Dataframe.copy()
+
+    top = ratio_analysis.top_rv_stocks(Dataframe, 2)
+
+    assert list(top['Ticker']) == ['B', 'C']
+    pd.testing.assert_frame_equal(Dataframe, original)
+
+def test_top_n_tracks_streaming_updates():
+    tracker = selection.TopN(2, min_score=0.0)
+    for ticker, score in [('A', 0.5), ('B', 0.7), ('C', 0.6)]:
+        tracker.update(ticker, score)
+
+    assert tracker.top() == [('B', 0.7), ('C', 0.6)]
+
+    tracker.update('A', 0.8)
+    tracker.update('B', -1.0)
+
+    assert tracker.top() == [('A', 0.8), ('C', 0.6)]
+    assert tracker.rank('C') == 2
+    assert tracker.rank('B') is None
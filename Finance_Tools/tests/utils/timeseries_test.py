@@ -0,0 +1,136 @@
+# Standard Imports
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import utils
+from utils import timeseries
+
+# Tests
+
+def test_parse_time_series_sorts_ascending(make_monthly_payload):
+    parsed = timeseries.parse_time_series(make_monthly_payload('AAA', [3.0, 2.0, 1.0]), fields=('close', 'volume'))
+
+    assert parsed['symbol'] == 'AAA'
+    assert parsed['dates'].dtype == np.dtype('datetime64[D]')
+    assert list(parsed['dates'].astype(str)) == ['2024-01-31', '2024-02-29', '2024-03-22']
+    np.testing.assert_array_equal(parsed['close'], [1.0, 2.0, 3.0])
+    assert parsed['volume'].dtype == np.float64
+
+def test_stack_aligns_tickers_on_calendar_months(make_monthly_payload):
+    short = make_monthly_payload('NEW', [5.0, 4.0])
+    lagging = make_monthly_payload('OLD', [9.0, 8.0, 7.0], last_refreshed='2024-02-29')
+
+    matrix = timeseries.build_price_matrix([short, lagging], dtype=np.float32)
+
+    assert list(matrix.dates.astype(str)) == ['2023-12', '2024-01', '2024-02', '2024-03']
+    assert matrix.close.dtype == np.float32
+    np.testing.assert_array_equal(matrix.close[0], [np.nan, np.nan, 4.0, 5.0])
+    np.testing.assert_array_equal(matrix.close[1], [7.0, 8.0, 9.0, np.nan])
+    np.testing.assert_array_equal(matrix.last_close(), [5.0, 9.0])
+
+def test_lookback_return_is_date_based(make_monthly_payload):
+    matrix = timeseries.build_price_matrix([make_monthly_payload('AAA', [200.0] + [100.0] * 12)])
+
+    assert matrix.lookback_return(12)[0] == pytest.approx(100.0)
+    assert matrix.lookback_return(1)[0] == pytest.approx(100.0)
+    assert np.isnan(matrix.lookback_return(13)[0])
+
+def test_monthly_return_percentage_reads_from_matrix(make_monthly_payload):
+    closes = [130.0, 120.0, 115.0, 110.0, 105.0, 104.0, 100.0, 99.0, 98.0, 97.0, 96.0, 95.0, 65.0]
+    stock_data = [make_monthly_payload('AAA', closes)]
+    matrix = timeseries.build_price_matrix(stock_data)
+
+    returns = utils.calculate_monthly_return_percentage(matrix, ['One-Year', 'Six-Month', 'Three-Month', 'One-Month'])
+
+    assert returns.loc[0, 'One-Year Price Return'] == pytest.approx(100.0)
+    assert returns.loc[0, 'Six-Month Price Return'] == pytest.approx(30.0)
+    assert returns.loc[0, 'Three-Month Price Return'] == pytest.approx((130 / 110 - 1) * 100)
+    assert returns.loc[0, 'One-Month Price Return'] == pytest.approx((130 / 120 - 1) * 100)
+
+def test_lookback_returns_handles_any_horizon_set(make_monthly_payload):
+    closes = [float(value) for value in range(113, 100, -1)]
+    matrix = timeseries.build_price_matrix([make_monthly_payload('AAA', closes), make_monthly_payload('BBB', closes[:4])])
+
+    returns = matrix.lookback_returns([1, 9, (12, 1)])
+
+    assert returns.shape == (2, 3)
+    assert returns[0, 0] == pytest.approx((113 / 112 - 1) * 100)
+    assert returns[0, 1] == pytest.approx((113 / 104 - 1) * 100)
+    assert returns[0, 2] == pytest.approx((112 / 101 - 1) * 100)
+    assert returns[1, 0] == pytest.approx((113 / 112 - 1) * 100)
+    assert np.isnan(returns[1, 1:]).all()
+
+def test_invalid_horizon_is_rejected():
+    with pytest.raises(ValueError):
+        timeseries.parse_horizons([(1, 1)])
+
+def test_momentum_returns_feed_hqm_for_custom_horizons(make_monthly_payload):
+    from src.portfolio_management import price_momentum
+
+    stock_data = [make_monthly_payload(f'T{index}', [100.0 + index * step for step in range(13)]) for index in range(5)]
+
+    returns = utils.calculate_momentum_returns(stock_data, [1, 3, 6, 9, 12, (12, 1)])
+    top = price_momentum.get_high_quality_momentum_stocks(returns)
+
+    assert '12-1 Month Return Percentile' in top.columns
+    assert '9-Month Return Percentile' in top.columns
+    assert list(top['Ticker']) == ['T0', 'T1', 'T2', 'T3', 'T4']
+
+def daily_matrix():
+    dates = np.array(pd.bdate_range('2023-01-02', '2024-03-22'), dtype='datetime64[D]')
+    growth = np.array([[1.001], [1.002]]) ** np.arange(len(dates))
+    close = 100.0 * growth
+    close[1, 5:15] = np.nan
+    volume = np.full(close.shape, 10.0)
+    return timeseries.PriceMatrix(['AAA', 'BBB'], dates, {'close': close, 'volume': volume}, ['2024-03-22'] * 2)
+
+def test_resample_matches_pandas_for_every_ticker():
+    matrix = daily_matrix()
+    frame = pd.DataFrame(matrix.close.T, index=pd.DatetimeIndex(matrix.dates))
+
+    monthly = matrix.resample('M')
+    weekly = matrix.resample('W')
+
+    assert monthly.frequency == 'M'
+    np.testing.assert_array_equal(monthly.dates, np.arange(np.datetime64('2023-01'), np.datetime64('2024-04')))
+    np.testing.assert_allclose(monthly.close, frame.resample('MS').last().to_numpy().T)
+    np.testing.assert_allclose(monthly.fields['volume'], pd.DataFrame(matrix.fields['volume'].T, index=frame.index).resample('MS').sum().to_numpy().T)
+    assert weekly.dates[0] == np.datetime64('2023-01-02') and (weekly.dates.astype('datetime64[D]').view(np.int64) % 7 == 4).all()
+    np.testing.assert_allclose(weekly.close, frame.resample('W-MON', label='left', closed='left').last().to_numpy().T)
+
+def test_resample_to_custom_calendar_and_empty_periods():
+    matrix = daily_matrix()
+
+    mid_month = matrix.resample('M', calendar=['2024-01-15', '2024-02-15', '2024-03-15'])
+    reduced = timeseries.reduce_periods(np.array([[np.nan, np.nan, 1.0, 2.0]]), np.array([0, 2]), 'first')
+
+    assert mid_month.frequency == 'M'
+    assert mid_month.close.shape == (2, 3)
+    column = np.flatnonzero(matrix.dates == np.datetime64('2024-03-15'))[0]
+    assert mid_month.close[0, 2] == matrix.close[0, column]
+    np.testing.assert_array_equal(reduced, [[np.nan, 1.0]])
+
+def test_daily_series_use_trading_days_and_daily_lookbacks(make_monthly_payload):
+    payload = make_monthly_payload('AAA', [float(value) for value in range(300, 0, -1)])
+    dates = np.array(pd.bdate_range(end='2024-03-22', periods=300), dtype='datetime64[D]')[::-1]
+    payload[timeseries.DAILY_SERIES_KEY] = dict(zip(map(str, dates), payload.pop('Monthly Time Series').values()))
+
+    matrix = timeseries.build_price_matrix([payload], timeseries.DAILY_SERIES_KEY)
+    returns = utils.calculate_monthly_return_percentage(matrix, ['One-Year', 'One-Month'])
+
+    assert matrix.frequency == 'D'
+    assert matrix.close.shape == (1, 300)
+    assert returns.loc[0, 'One-Year Price Return'] == pytest.approx((300 / 48 - 1) * 100)
+    assert returns.loc[0, 'One-Month Price Return'] == pytest.approx((300 / 279 - 1) * 100)
+
+def test_horizon_labels_and_weekly_buckets_follow_the_frequency():
+    parsed = {'close': np.array([100.0, 110.0]), 'dates': np.array(['2024-03-15', '2024-03-18'], dtype='datetime64[D]')}
+
+    _, returns = timeseries.series_lookback_returns(parsed, [1], frequency='W')
+
+    assert timeseries.horizon_label(21, 'D') == '21-Day'
+    assert timeseries.horizon_label((12, 1)) == '12-1 Month'
+    assert timeseries.horizon_label((52, 4), 'W') == '52-4 Week'
+    # Friday and the following Monday fall in consecutive Monday-based weeks, as in `period_codes`.
+    assert returns[0] == pytest.approx(10.0)
@@ -0,0 +1,93 @@
+# Standard Imports
+import numpy as np
+import pandas as pd
+
+from utils import utils
+from src.portfolio_management import price_momentum
+from src.investment_analysis import ratio_analysis
+
+# Tests
+
+def test_monthly_returns_are_float64_columns(make_monthly_payload):
+    stock_data = [
+        make_monthly_payload('AAA', [120.0 - index for index in range(13)]),
+        make_monthly_payload('BBB', [100.0 + index for index in range(13)])
+    ]
+
+    returns = utils.calculate_monthly_return_percentage(stock_data, price_momentum.time_periods)
+
+    assert list(returns['Ticker']) == ['AAA', 'BBB']
+    assert all(returns[column].dtype == np.float64 for column in returns.columns if column != 'Ticker')
+    assert returns.loc[0, 'Price'] == 120.0
+
+def test_monthly_returns_skip_error_payloads(make_monthly_payload):
+    stock_data = [
+        make_monthly_payload('AAA', [120.0 - index for index in range(13)]),
+        {'Error Message': 'HTTP 500 for BBB'}
+    ]
+
+    returns = utils.calculate_monthly_return_percentage(stock_data, price_momentum.time_periods)
+
+    assert list(returns['Ticker']) == ['AAA']
+    np.testing.assert_allclose(returns.loc[0, 'One-Year Price Return'], (120.0 / 108.0 - 1) * 100)
+
+def test_get_ratios_builds_typed_frame():
+    overview = [
+        {'Symbol': 'AAA', 'PERatio': '10.5', 'PriceToBookRatio': '2', 'PriceToSalesRatioTTM': '1.5', 'EVToEBITDA': '8', 'EVToRevenue': '3'},
+        {'Symbol': 'BBB', 'PERatio': '20', 'PriceToBookRatio': '4', 'PriceToSalesRatioTTM': '2.5', 'EVToEBITDA': '12', 'EVToRevenue': '5'}
+    ]
+
+    ratios = utils.get_ratios(overview, {'AAA': 50.0, 'BBB': 75.0})
+
+    assert list(ratios.columns) == ['Ticker', 'Price', 'Price-to-Earnings Ratio', 'Price-to-Book Ratio', 'Price-to-Sales Ratio', 'EV/EBITDA', 'EV/RE']
+    assert ratios['Price-to-Earnings Ratio'].tolist() == [10.5, 20.0]
+    assert ratios['Price'].dtype == np.float64
+
+def test_get_ratios_masks_unparseable_values():
+    overview = [
+        {'Symbol': 'AAA', 'PERatio': 'None', 'PriceToBookRatio': '-', 'PriceToSalesRatioTTM': '1.5', 'EVToEBITDA': '-4.2', 'EVToRevenue': '3'},
+        {'Symbol': 'BBB', 'PERatio': '20'},
+        {'Information': 'Invalid API call.'}
+    ]
+
+    tickers, ratios, missing = utils.parse_overview_ratios(overview)
+    frame = utils.get_ratios(overview, {'AAA': 50.0})
+
+    assert tickers == ['AAA', 'BBB', None]
+    assert missing.tolist()[0] == [True, True, False, False, False]
+    assert missing[1, 1:].all() and missing[2].all()
+    assert ratios[0, 3] == -4.2
+    assert frame['Ticker'].tolist() == ['AAA', 'BBB']
+    assert np.isnan(frame.loc[1, 'Price'])
+
+def test_extract_attributes_uses_nan_placeholders():
+    ratios = utils.get_ratios(
+        [{'Symbol': 'AAA', 'PERatio': '10', 'PriceToBookRatio': '2', 'PriceToSalesRatioTTM': '1', 'EVToEBITDA': '8', 'EVToRevenue': '3'}],
+        {'AAA': 50.0}
+    )
+
+    attributes = ratio_analysis.extract_attributes(ratios)
+
+    assert attributes['RV Score'].dtype == np.float64
+    assert np.isnan(attributes.loc[0, 'PE Percentile'])
+
+def test_momentum_pipeline_runs_end_to_end(make_monthly_payload):
+    stock_data = [make_monthly_payload(f'T{index}', [100.0 + index * step for step in range(13)]) for index in range(60)]
+
+    returns = utils.calculate_monthly_return_percentage(stock_data, price_momentum.time_periods)
+    top = price_momentum.get_high_quality_momentum_stocks(returns)
+    top = utils.calculate_number_of_shares_to_buy(10000, top)
+
+    assert len(top) == 50
+    assert top['HQM Score'].is_monotonic_decreasing
+    assert top['HQM Score'].dtype == np.float64
+
+def test_streamed_returns_match_batch_returns(stub_server, make_monthly_payload):
+    closes = {f'T{index}': [100.0 + index * step + step ** 1.5 for step in range(14)] for index in range(6)}
+    stub_server.payload = lambda query: make_monthly_payload(query['symbol'], closes[query['symbol']])
+    tickers = list(closes)
+
+    streamed = utils.stream_monthly_return_percentage(tickers, stub_server.url, 'demo', price_momentum.time_periods, window=2)
+    batch = utils.calculate_monthly_return_percentage([make_monthly_payload(ticker, closes[ticker]) for ticker in tickers], price_momentum.time_periods)
+
+    pd.testing.assert_frame_equal(streamed, batch)
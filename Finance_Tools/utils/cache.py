@@ -0,0 +1,193 @@
+# Standard Imports
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+
+from utils import decode
+from utils import instrumentation
+
+# Constants
+CACHE_DIRECTORY = 'data/cache'
+DEFAULT_TTL = 24 * 60 * 60
+# Daily and monthly bars change at most once a day, company overviews far less often.
+FUNCTION_TTLS = {
+    'TIME_SERIES_DAILY': 24 * 60 * 60,
+    'TIME_SERIES_MONTHLY': 24 * 60 * 60,
+    'OVERVIEW': 7 * 24 * 60 * 60
+}
+MAX_ENTRIES = 20000
+MAX_BYTES = 2 * 1024 ** 3
+# Parameters that never change the payload and must not leak into cache files.
+IGNORED_PARAMS = ('apikey', 'function', 'symbol')
+
+# Classes
+
+class ResponseCache:
+    """
+    Persistent on-disk cache of API payloads keyed by (function, symbol, params).
+
+    Every entry is one JSON file written atomically, so parallel runs sharing
+    the directory never observe a partial file. A file's modification time is
+    refreshed on every hit and drives least-recently-used eviction.
+    """
+
+    def __init__(self, directory=CACHE_DIRECTORY, ttls=None, default_ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.ttls = dict(FUNCTION_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, function, symbol, params=None):
+        """
+        Builds the cache key for a request.
+
+        Parameters:
+        function (str): API function, e.g. 'OVERVIEW'.
+        symbol (str): Stock ticker.
+        params (dict): Any further query parameters.
+
+        Returns:
+        str: Hex digest identifying the request.
+        """
+        extra = {name: value for name, value in (params or {}).items() if name not in IGNORED_PARAMS}
+        raw = json.dumps([function, symbol, extra], sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f'{key}.json')
+
+    def quota_path(self, name):
+        """
+        Returns the file keeping a provider's daily request count next to the cached payloads.
+
+        Parameters:
+        name (str): Provider name, e.g. 'alphavantage'.
+
+        Returns:
+        str: Path of the quota file; it is not a cache entry, so eviction and `clear` leave it alone.
+        """
+        return os.path.join(self.directory, f'{name}.quota')
+
+    def ttl(self, function):
+        return self.ttls.get(function, self.default_ttl)
+
+    def _count(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        instrumentation.count('cache_hits' if hit else 'cache_misses')
+
+    def get(self, function, symbol, params=None, ignore_ttl=False):
+        """
+        Returns a cached payload if present and younger than the function's TTL.
+
+        Parameters:
+        function (str): API function.
+        symbol (str): Stock ticker.
+        params (dict): Any further query parameters.
+        ignore_ttl (bool): Return expired entries too, e.g. for offline backtests.
+
+        Returns:
+        dict: Cached payload, or None on a miss.
+        """
+        path = self.path(self.key(function, symbol, params))
+        try:
+            with open(path, 'rb') as file:
+                entry = decode.loads(file.read())
+        except (OSError, ValueError):
+            self._count(False)
+            return None
+
+        if not ignore_ttl and time.time() - entry['stored_at'] > self.ttl(function):
+            self._count(False)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count(True)
+        return entry['payload']
+
+    def put(self, function, symbol, payload, params=None):
+        """
+        Stores a payload, replacing any previous entry atomically.
+
+        Parameters:
+        function (str): API function.
+        symbol (str): Stock ticker.
+        payload (dict): Decoded JSON payload.
+        params (dict): Any further query parameters.
+        """
+        entry = {'function': function, 'symbol': symbol, 'stored_at': time.time(), 'payload': payload}
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as file:
+                json.dump(entry, file)
+            os.replace(temp_path, self.path(self.key(function, symbol, params)))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def evict(self):
+        """
+        Removes least recently used entries until the cache fits its size bounds.
+
+        Returns:
+        int: Number of entries removed.
+        """
+        entries = []
+        total_bytes = 0
+        with os.scandir(self.directory) as scanner:
+            for item in scanner:
+                if not item.name.endswith('.json'):
+                    continue
+                try:
+                    status = item.stat()
+                except OSError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, item.path))
+                total_bytes += status.st_size
+
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if len(entries) - removed <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            removed += 1
+            total_bytes -= size
+        return removed
+
+    def clear(self):
+        """
+        Removes every entry and resets the hit/miss counters.
+        """
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.directory, name))
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Returns the hit/miss counters.
+
+        Returns:
+        dict: Number of hits and misses since the cache was created.
+        """
+        return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,131 @@
+# Standard Imports
+import re
+import json
+import functools
+
+import numpy as np
+
+from utils import timeseries
+from utils import instrumentation
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Constants
+SYMBOL_PATTERN = re.compile(rb'"2\. Symbol"\s*:\s*"([^"]*)"')
+LAST_REFRESHED_PATTERN = re.compile(rb'"3\. Last Refreshed"\s*:\s*"([^"]*)"')
+DATE_PATTERN = re.compile(rb'"(\d{4}-\d{2}-\d{2})"\s*:\s*\{')
+
+# Functions
+
+def loads(raw):
+    """
+    Decodes a JSON document straight from bytes, with orjson when it is installed.
+
+    Parameters:
+    raw (bytes): Encoded JSON.
+
+    Returns:
+    dict: Decoded document.
+    """
+    with instrumentation.span('decode.json', bytes=len(raw)):
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+@functools.lru_cache(maxsize=None)
+def value_pattern(key):
+    """
+    Compiles the pattern matching every string value of one key.
+
+    Parameters:
+    key (str): JSON key, e.g. '4. close'.
+
+    Returns:
+    Pattern: Pattern capturing the value.
+    """
+    return re.compile(rb'"' + re.escape(key.encode()) + rb'"\s*:\s*"([^"]*)"')
+
+def parse_time_series_bytes(raw, series_key=timeseries.MONTHLY_SERIES_KEY, fields=('close',), dtype=np.float64, since=None, field_keys=timeseries.FIELD_KEYS):
+    """
+    Projects the dates and fields of a time series payload from its bytes into arrays.
+
+    Each requested field is pulled out with one regex scan over the series
+    and converted to numbers in a single NumPy pass, so no dictionaries or
+    strings are built per bar. This beats the json module followed by
+    `timeseries.parse_time_series`, but not orjson, so it is meant for when
+    orjson is not installed. Returns None when the bytes do not hold a
+    well-formed series, e.g. for error payloads, so callers can fall back
+    to `loads`.
+
+    Parameters:
+    raw (bytes): Encoded Alpha Vantage time series payload.
+    series_key (str): Key of the time series in the payload.
+    fields (tuple): Bar fields to keep, out of open, high, low, close and volume.
+    dtype (type): Floating point dtype for the price fields; volume is always float64.
+    since (str): Oldest date to keep as 'YYYY-MM-DD', all dates if None.
+    field_keys (dict): Mapping of bar field to its key in each bar, e.g. for daily adjusted series.
+
+    Returns:
+    dict: Same layout as `timeseries.parse_time_series`, or None.
+    """
+    with instrumentation.span('decode.time_series', bytes=len(raw)):
+        start = raw.find(b'"' + series_key.encode() + b'"')
+        if start < 0:
+            return None
+        symbol = SYMBOL_PATTERN.search(raw, 0, start)
+        last_refreshed = LAST_REFRESHED_PATTERN.search(raw, 0, start)
+        if symbol is None or last_refreshed is None:
+            return None
+
+        section = raw[start:]
+        dates = DATE_PATTERN.findall(section)
+        values = {field: value_pattern(field_keys[field]).findall(section) for field in fields}
+        if any(len(field_values) != len(dates) for field_values in values.values()):
+            return None
+
+        dates = np.array(dates, dtype='S10').astype('datetime64[D]')
+        keep = slice(None) if since is None else dates >= np.datetime64(since, 'D')
+        dates = dates[keep]
+        order = np.argsort(dates, kind='stable')
+        parsed = {
+            'symbol': symbol.group(1).decode(),
+            'last_refreshed': last_refreshed.group(1).decode(),
+            'dates': dates[order]
+        }
+        try:
+            for field in fields:
+                column = np.array(values[field], dtype=bytes)[keep]
+                parsed[field] = column.astype(np.float64 if field == 'volume' else dtype)[order]
+        except ValueError:
+            return None
+        return parsed
+
+def time_series_decoder(series_key=timeseries.MONTHLY_SERIES_KEY, fields=('close',), since=None):
+    """
+    Builds a response decoder that projects time series and fully decodes anything else.
+
+    Parameters:
+    series_key (str): Key of the time series in the payload.
+    fields (tuple): Bar fields to keep.
+    since (str): Oldest date to keep, all dates if None.
+
+    Returns:
+    callable: Function of the response bytes returning a parsed series or the decoded payload.
+    """
+    def decoder(raw):
+        parsed = parse_time_series_bytes(raw, series_key, fields, since=since)
+        return parsed if parsed is not None else loads(raw)
+    return decoder
+
+def is_parsed_series(data):
+    """
+    Checks whether a payload was already projected by `parse_time_series_bytes`.
+
+    Parameters:
+    data (dict): Payload or parsed series.
+
+    Returns:
+    bool: True for parsed series.
+    """
+    return isinstance(data, dict) and 'dates' in data and 'symbol' in data
@@ -0,0 +1,194 @@
+# Standard Imports
+import os
+import fnmatch
+
+import numpy as np
+
+from utils import lazy
+from utils import instrumentation
+
+xlsxwriter = lazy.lazy_import('xlsxwriter')
+
+# Constants
+BACKGROUND_COLOR = '#0a0a23'
+FONT_COLOR = '#ffffff'
+COLUMN_WIDTH = 25
+# Rows converted to cell values at a time; bounds the export's peak memory.
+CHUNK_ROWS = 4096
+NUMBER_FORMATS = {
+    'string': None,
+    'dollar': '$0.00',
+    'integer': '0',
+    'float': '0.00',
+    'percent': '0.0%'
+}
+
+# Functions
+
+def resolve_formats(columns, schema):
+    """
+    Matches every column against a declarative format schema.
+
+    Parameters:
+    columns (list): Column names in output order.
+    schema (list): (column pattern, format name) pairs; patterns may use shell wildcards, first match wins.
+
+    Returns:
+    list: Format name per column, 'string' where no pattern matches.
+    """
+    formats = []
+    for column in columns:
+        formats.append(next((format_name for pattern, format_name in schema if fnmatch.fnmatchcase(column, pattern)), 'string'))
+    return formats
+
+def column_values(Dataframe):
+    """
+    Converts each column to a list of cell values, with NaN as None.
+
+    Parameters:
+    Dataframe (DataFrame): Data to convert.
+
+    Returns:
+    list: One list of values per column.
+    """
+    columns = []
+    for column in Dataframe.columns:
+        values = Dataframe[column].to_numpy()
+        if values.dtype.kind == 'f':
+            values = np.where(np.isnan(values), None, values.astype(object))
+        elif values.dtype.kind == 'O':
+            values = [None if isinstance(value, float) and np.isnan(value) else value for value in values]
+        else:
+            values = values.tolist()
+        columns.append(list(values))
+    return columns
+
+def iter_rows(Dataframe, chunk_rows=None):
+    """
+    Yields the rows of a DataFrame as cell values, converting one bounded chunk at a time.
+
+    Parameters:
+    Dataframe (DataFrame): Data to convert.
+    chunk_rows (int): Number of rows converted at once, CHUNK_ROWS if None.
+
+    Yields:
+    tuple: Cell values of one row, with NaN as None.
+    """
+    chunk_rows = chunk_rows or CHUNK_ROWS
+    for start in range(0, len(Dataframe), chunk_rows):
+        yield from zip(*column_values(Dataframe.iloc[start:start + chunk_rows]))
+
+@instrumentation.timed()
+def write_excel(file_path, sheets):
+    """
+    Writes one or more formatted sheets into a single workbook in one pass.
+
+    Rows are converted to cell values in chunks of CHUNK_ROWS and streamed
+    with xlsxwriter's constant_memory mode, so memory use does not grow with
+    the number of rows.
+
+    Parameters:
+    file_path (str): Path of the .xlsx file.
+    sheets (list): (sheet name, DataFrame, schema) tuples, see `resolve_formats`.
+    """
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    workbook = xlsxwriter.Workbook(file_path, {'constant_memory': True})
+    cell_formats = {}
+    for format_name, number_format in NUMBER_FORMATS.items():
+        properties = {'font_color': FONT_COLOR, 'bg_color': BACKGROUND_COLOR, 'border': 1}
+        if number_format is not None:
+            properties['num_format'] = number_format
+        cell_formats[format_name] = workbook.add_format(properties)
+
+    for sheet_name, Dataframe, schema in sheets:
+        worksheet = workbook.add_worksheet(sheet_name)
+        columns = list(Dataframe.columns)
+        formats = [cell_formats[format_name] for format_name in resolve_formats(columns, schema)]
+
+        for column, cell_format in enumerate(formats):
+            worksheet.set_column(column, column, COLUMN_WIDTH, cell_format)
+            worksheet.write(0, column, columns[column], cell_format)
+
+        for row, values in enumerate(iter_rows(Dataframe), start=1):
+            for column, cell_format in enumerate(formats):
+                worksheet.write(row, column, values[column], cell_format)
+
+    workbook.close()
+
+@instrumentation.timed()
+def write_csv(file_path, Dataframe):
+    """
+    Writes a DataFrame to CSV.
+
+    Parameters:
+    file_path (str): Path of the .csv file.
+    Dataframe (DataFrame): Data to write.
+    """
+    Dataframe.to_csv(file_path, index=False)
+
+@instrumentation.timed()
+def write_parquet(file_path, Dataframe):
+    """
+    Writes a DataFrame to Parquet. Requires pyarrow.
+
+    Parameters:
+    file_path (str): Path of the .parquet file.
+    Dataframe (DataFrame): Data to write.
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow: pip install pyarrow")
+    Dataframe.to_parquet(file_path, index=False)
+
+@instrumentation.timed()
+def write_arrow(file_path, Dataframe):
+    """
+    Writes a DataFrame to an Arrow IPC (Feather) file. Requires pyarrow.
+
+    Parameters:
+    file_path (str): Path of the .arrow or .feather file.
+    Dataframe (DataFrame): Data to write.
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Arrow export requires pyarrow: pip install pyarrow")
+    Dataframe.reset_index(drop=True).to_feather(file_path)
+
+def export(file_path, sheets):
+    """
+    Exports strategy results in the format implied by the file extension.
+
+    Excel writes every sheet into one workbook; the columnar formats write one
+    file per sheet, named '<stem>_<sheet name><extension>'.
+
+    Parameters:
+    file_path (str): Output path ending in .xlsx, .csv, .parquet, .arrow or .feather.
+    sheets (list): (sheet name, DataFrame, schema) tuples.
+
+    Returns:
+    list: Paths of the files written.
+    """
+    stem, extension = os.path.splitext(file_path)
+    extension = extension.lower()
+    if extension == '.xlsx':
+        write_excel(file_path, sheets)
+        return [file_path]
+
+    writers = {'.csv': write_csv, '.parquet': write_parquet, '.arrow': write_arrow, '.feather': write_arrow}
+    if extension not in writers:
+        raise ValueError(f"Unsupported export format '{extension}'.")
+
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    paths = []
+    for sheet_name, Dataframe, _ in sheets:
+        path = file_path if len(sheets) == 1 else f'{stem}_{sheet_name}{extension}'
+        writers[extension](path, Dataframe)
+        paths.append(path)
+    return paths
@@ -0,0 +1,370 @@
+# Standard Imports
+import os
+import json
+import time
+import random
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from utils import lazy
+from utils import decode
+from utils import instrumentation
+
+requests = lazy.lazy_import('requests')
+
+# Constants
+# Alpha Vantage quotas per key tier, as (requests per minute, requests per day).
+# Free keys, including 'demo', get 5 per minute and 25 per day; premium keys
+# start at 75 per minute with no daily cap.
+TIERS = {'free': (5, 25), 'premium': (75, None)}
+TIER = 'free'
+REQUESTS_PER_MINUTE, REQUESTS_PER_DAY = TIERS[TIER]
+MAX_WORKERS = 8
+MAX_RETRIES = 5
+BACKOFF_FACTOR = 0.5
+MAX_BACKOFF = 60.0
+REQUEST_TIMEOUT = 30
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+RATE_LIMIT_KEYS = ('Note', 'Information')
+
+# Classes
+
+class TokenBucket:
+    """
+    Token bucket that allows `capacity` requests per `period` seconds.
+
+    Tokens refill continuously, so short bursts up to `capacity` are allowed
+    while the long-run rate never exceeds `capacity / period`.
+    """
+
+    def __init__(self, capacity, period, clock=time.monotonic, sleep=time.sleep):
+        self.capacity = float(capacity)
+        self.period = float(period)
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / self.period)
+        self.updated = now
+
+    def wait_time(self):
+        """
+        Returns the number of seconds until a token is available.
+
+        Returns:
+        float: Seconds to wait, 0 if a token is available now.
+        """
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                return 0.0
+            return (1 - self.tokens) * self.period / self.capacity
+
+    def try_acquire(self):
+        """
+        Takes a token if one is available.
+
+        Returns:
+        bool: True if a token was taken.
+        """
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def acquire(self, max_wait=None):
+        """
+        Blocks until a token is available and takes it.
+
+        Parameters:
+        max_wait (float): Maximum seconds to wait for a single token, None to wait indefinitely.
+        """
+        while not self.try_acquire():
+            delay = self.wait_time()
+            if max_wait is not None and delay > max_wait:
+                raise RuntimeError(f"Rate limit of {self.capacity:g} requests per {self.period:g}s exhausted.")
+            self.sleep(delay)
+
+
+class QuotaExhausted(RuntimeError):
+    """
+    Raised when the daily request quota is spent.
+    """
+
+
+class DailyQuota:
+    """
+    Counts the requests of the current UTC calendar day against a daily limit.
+
+    With a `path` the count is kept in a small JSON file, re-read before and
+    rewritten atomically after every request, so the quota holds across
+    cron runs and service restarts sharing the file, not only within one
+    process.
+    """
+
+    def __init__(self, limit, path=None, today=None):
+        self.limit = limit
+        self.path = path
+        self.today = today or (lambda: time.strftime('%Y-%m-%d', time.gmtime()))
+        self.lock = threading.Lock()
+        self.day, self.used = self.load()
+
+    def load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return None, 0
+        try:
+            with open(self.path) as file:
+                state = json.load(file)
+            return state['day'], int(state['requests'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, 0
+
+    def save(self):
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as file:
+                json.dump({'day': self.day, 'requests': self.used}, file)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def try_acquire(self):
+        """
+        Counts one request if today's quota allows it.
+
+        Returns:
+        bool: True if the request was counted.
+        """
+        with self.lock:
+            day, used = self.load() if self.path is not None else (self.day, self.used)
+            today = self.today()
+            if day != today:
+                used = 0
+            if used >= self.limit:
+                return False
+            self.day, self.used = today, used + 1
+            if self.path is not None:
+                self.save()
+            return True
+
+
+class RateLimiter:
+    """
+    Combines a per-minute token bucket and a daily quota.
+
+    The daily quota never blocks: once it is spent, `acquire` raises
+    QuotaExhausted instead of sleeping until tomorrow. `state_path` persists
+    the daily count, see DailyQuota.
+    """
+
+    def __init__(self, requests_per_minute=REQUESTS_PER_MINUTE, requests_per_day=REQUESTS_PER_DAY, clock=time.monotonic, sleep=time.sleep, state_path=None):
+        self.minute_bucket = TokenBucket(requests_per_minute, 60, clock, sleep) if requests_per_minute else None
+        self.day_quota = DailyQuota(requests_per_day, state_path) if requests_per_day else None
+
+    def acquire(self):
+        """
+        Blocks until a request is allowed under every quota.
+        """
+        if self.day_quota is not None and not self.day_quota.try_acquire():
+            raise QuotaExhausted(f"Daily request quota of {self.day_quota.limit} exhausted.")
+        if self.minute_bucket is not None:
+            self.minute_bucket.acquire()
+
+# Functions
+
+def create_session(max_workers=MAX_WORKERS):
+    """
+    Creates a requests session with a keep-alive pool sized for the worker count.
+
+    Parameters:
+    max_workers (int): Number of concurrent workers sharing the session.
+
+    Returns:
+    Session: Configured requests session.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def is_rate_limited(data):
+    """
+    Checks whether an Alpha Vantage payload is a throttling notice instead of data.
+
+    Parameters:
+    data (dict): Decoded JSON payload.
+
+    Returns:
+    bool: True if the payload only contains a rate limit message.
+    """
+    return isinstance(data, dict) and len(data) == 1 and next(iter(data)) in RATE_LIMIT_KEYS
+
+def is_valid_payload(data):
+    """
+    Checks whether a payload holds data rather than an error or throttling notice.
+
+    Parameters:
+    data (dict): Decoded JSON payload.
+
+    Returns:
+    bool: True if the payload can be used and cached.
+    """
+    return isinstance(data, dict) and bool(data) and 'Error Message' not in data and not is_rate_limited(data)
+
+def backoff_delay(attempt, response=None):
+    """
+    Computes the delay before retrying a request.
+
+    Parameters:
+    attempt (int): Zero-based retry attempt.
+    response (Response): Failed response, used for its Retry-After header.
+
+    Returns:
+    float: Seconds to wait.
+    """
+    if response is not None and response.headers.get('Retry-After'):
+        try:
+            return min(float(response.headers['Retry-After']), MAX_BACKOFF)
+        except ValueError:
+            pass
+    delay = BACKOFF_FACTOR * (2 ** attempt)
+    return min(delay + random.uniform(0, delay), MAX_BACKOFF)
+
+def fetch_json(session, base_api_url, params, rate_limiter=None, max_retries=MAX_RETRIES, decoder=None):
+    """
+    Fetches a single JSON payload, retrying throttled and failed requests with backoff.
+
+    The body is decoded from the raw response bytes, never from a decoded str.
+    A request that still fails once the retries are spent, or gets another
+    HTTP error, comes back as an 'Error Message' payload instead of raising,
+    so one bad ticker does not abort a whole universe; `is_valid_payload`
+    filters it out downstream. Requests past the daily quota come back as
+    error payloads too, without being sent.
+
+    Parameters:
+    session (Session): Requests session to send the request with.
+    base_api_url (str): Base URL for the API.
+    params (dict): Query parameters.
+    rate_limiter (RateLimiter): Limiter to acquire a token from before each attempt.
+    max_retries (int): Maximum number of retries after the first attempt.
+    decoder (callable): Function of the response bytes, `decode.loads` if None.
+
+    Returns:
+    dict: Decoded JSON payload, or an error payload.
+    """
+    for attempt in range(max_retries + 1):
+        if rate_limiter is not None:
+            try:
+                rate_limiter.acquire()
+            except QuotaExhausted as error:
+                return {'Error Message': str(error)}
+        try:
+            with instrumentation.span('fetcher.network'):
+                response = session.get(base_api_url, params=params, timeout=REQUEST_TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout) as error:
+            if attempt == max_retries:
+                return {'Error Message': f"Request failed after {attempt + 1} attempts: {error}"}
+            instrumentation.count('retries')
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        instrumentation.count('http_requests')
+        instrumentation.count('bytes', len(response.content))
+        if response.status_code in RETRY_STATUS_CODES and attempt < max_retries:
+            instrumentation.count('retries')
+            time.sleep(backoff_delay(attempt, response))
+            continue
+        if response.status_code >= 400:
+            return {'Error Message': f"HTTP {response.status_code} for {params.get('symbol') or params.get('symbols')}"}
+
+        data = (decoder or decode.loads)(response.content)
+        if is_rate_limited(data) and attempt < max_retries:
+            instrumentation.count('retries')
+            time.sleep(backoff_delay(attempt))
+            continue
+        return data
+
+def fetch_all(base_api_url, params_list, max_workers=MAX_WORKERS, rate_limiter=None, session=None, max_retries=MAX_RETRIES, decoder=None):
+    """
+    Fetches many JSON payloads concurrently over a shared keep-alive session.
+
+    Parameters:
+    base_api_url (str): Base URL for the API.
+    params_list (list): List of query parameter dictionaries.
+    max_workers (int): Number of concurrent requests.
+    rate_limiter (RateLimiter): Limiter shared by all workers, None to disable limiting.
+    session (Session): Session to reuse, a pooled one is created if None.
+    max_retries (int): Maximum number of retries per request.
+    decoder (callable): Function of the response bytes, `decode.loads` if None.
+
+    Returns:
+    list: List of decoded payloads, in the same order as `params_list`.
+    """
+    owns_session = session is None
+    if owns_session:
+        session = create_session(max_workers)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            fetch = instrumentation.propagate(lambda params: fetch_json(session, base_api_url, params, rate_limiter, max_retries, decoder))
+            return list(executor.map(fetch, params_list))
+    finally:
+        if owns_session:
+            session.close()
+
+def iter_fetch(base_api_url, params_list, max_workers=MAX_WORKERS, rate_limiter=None, session=None, max_retries=MAX_RETRIES, window=None, decoder=None):
+    """
+    Fetches JSON payloads concurrently and yields each one as soon as it arrives.
+
+    At most `window` requests are submitted but not yet consumed at any time,
+    so memory is bounded by the window rather than by the number of requests.
+
+    Parameters:
+    base_api_url (str): Base URL for the API.
+    params_list (iterable): Query parameter dictionaries.
+    max_workers (int): Number of concurrent requests.
+    rate_limiter (RateLimiter): Limiter shared by all workers, None to disable limiting.
+    session (Session): Session to reuse, a pooled one is created if None.
+    max_retries (int): Maximum number of retries per request.
+    window (int): Maximum number of in-flight requests, twice `max_workers` if None.
+    decoder (callable): Function of the response bytes, `decode.loads` if None.
+
+    Yields:
+    tuple: Position of the request in `params_list` and its decoded payload, in completion order.
+    """
+    window = window or 2 * max_workers
+    owns_session = session is None
+    if owns_session:
+        session = create_session(max_workers)
+    pending = {}
+    fetch = instrumentation.propagate(fetch_json)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for index, params in enumerate(params_list):
+            pending[executor.submit(fetch, session, base_api_url, params, rate_limiter, max_retries, decoder)] = index
+            if len(pending) < window:
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+    finally:
+        # A consumer that stops early must not wait for the queued requests,
+        # so they are cancelled and only those already running finish.
+        executor.shutdown(wait=False, cancel_futures=True)
+        if owns_session:
+            session.close()
@@ -0,0 +1,221 @@
+# Standard Imports
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from utils import lazy
+from utils import timeseries
+from utils import instrumentation
+
+pd = lazy.lazy_import('pandas')
+
+# Constants
+# Column of each bar field in the dump; pass a mapping to read other vendor layouts.
+BAR_COLUMNS = {
+    'symbol': 'symbol',
+    'date': 'date',
+    'open': 'open',
+    'high': 'high',
+    'low': 'low',
+    'close': 'close',
+    'volume': 'volume'
+}
+AGGREGATIONS = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+OVERVIEW_KEYS = ('Symbol', 'MarketCapitalization', 'PERatio', 'PriceToBookRatio', 'PriceToSalesRatioTTM', 'EVToEBITDA', 'EVToRevenue')
+CHUNK_ROWS = 1_000_000
+BLOCK_SIZE = 64 << 20
+MAX_WORKERS = os.cpu_count() or 1
+
+# Functions
+
+def file_format(file_path):
+    """
+    Detects a dump's format from its extension, ignoring compression suffixes.
+
+    Parameters:
+    file_path (str): Path of the dump.
+
+    Returns:
+    str: 'csv' or 'parquet'.
+    """
+    name = file_path.lower()
+    for suffix in ('.gz', '.bz2', '.zst', '.xz'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    if name.endswith(('.parquet', '.pq')):
+        return 'parquet'
+    if name.endswith(('.csv', '.txt')):
+        return 'csv'
+    raise ValueError(f"Unsupported dump format '{file_path}'; use CSV or Parquet.")
+
+def iter_chunks(file_path, columns, chunk_rows=CHUNK_ROWS):
+    """
+    Reads a CSV or Parquet dump in chunks, parsing only the given columns.
+
+    pyarrow parses CSV blocks and Parquet row groups on multiple threads when
+    it is installed; otherwise CSV falls back to pandas' chunked C parser.
+
+    Parameters:
+    file_path (str): Path of the dump.
+    columns (list): Columns to read.
+    chunk_rows (int): Approximate rows per chunk.
+
+    Yields:
+    DataFrame: The projected columns of each chunk.
+    """
+    columns = list(columns)
+    if file_format(file_path) == 'parquet':
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet ingestion requires pyarrow: pip install pyarrow")
+        parquet_file = pyarrow.parquet.ParquetFile(file_path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns, use_threads=True):
+            yield batch.to_pandas(date_as_object=False)
+        return
+
+    try:
+        import pyarrow.csv
+    except ImportError:
+        yield from pd.read_csv(file_path, usecols=columns, chunksize=chunk_rows)
+        return
+    reader = pyarrow.csv.open_csv(
+        file_path,
+        read_options=pyarrow.csv.ReadOptions(block_size=BLOCK_SIZE, use_threads=True),
+        convert_options=pyarrow.csv.ConvertOptions(include_columns=columns, strings_can_be_null=True)
+    )
+    for batch in reader:
+        yield batch.to_pandas(date_as_object=False)
+
+def parse_bars(Dataframe, fields, frequency='M'):
+    """
+    Converts raw bars to numeric columns keyed by ticker and period.
+
+    Parameters:
+    Dataframe (DataFrame): Bars with symbol, date and field columns.
+    fields (tuple): Bar fields to keep.
+    frequency (str): 'D', 'W', 'M', 'Q' or 'Y'; 'M' for monthly bars.
+
+    Returns:
+    DataFrame: symbol, period, start and date (both the bar's date) and one float column per field.
+    """
+    dates = Dataframe['date'].to_numpy()
+    if not np.issubdtype(dates.dtype, np.datetime64):
+        dates = pd.to_datetime(Dataframe['date'], format='ISO8601').to_numpy()
+    dates = dates.astype('datetime64[D]')
+    bars = pd.DataFrame({
+        'symbol': Dataframe['symbol'].to_numpy(),
+        'period': timeseries.period_codes(dates, frequency),
+        'start': dates,
+        'date': dates
+    })
+    for field in fields:
+        bars[field] = pd.to_numeric(Dataframe[field], errors='coerce').to_numpy(dtype=np.float64)
+    return bars
+
+def reduce_bars(bars, fields):
+    """
+    Collapses bars to one bar per ticker and period.
+
+    `start` and `date` track the first and last day each bar covers, so the
+    partial results of different chunks can be combined by reducing their
+    concatenation again.
+
+    Parameters:
+    bars (DataFrame): Output of `parse_bars` or `reduce_bars`.
+    fields (tuple): Bar fields to keep.
+
+    Returns:
+    DataFrame: One row per ticker and period with the same columns.
+    """
+    keys = ['symbol', 'period']
+    bars = bars.sort_values(['symbol', 'date'], kind='stable')
+    aggregations = {'start': 'min', 'date': 'max', **{field: AGGREGATIONS[field] for field in fields if field != 'open'}}
+    reduced = bars.groupby(keys, sort=False).agg(aggregations)
+    if 'open' in fields:
+        reduced['open'] = bars.sort_values(['symbol', 'start'], kind='stable').groupby(keys, sort=False)['open'].first()
+    return reduced.reset_index()
+
+@instrumentation.timed()
+def load_price_matrix(file_path, fields=('close',), columns=None, frequency='M', tickers=None, chunk_rows=CHUNK_ROWS, max_workers=MAX_WORKERS):
+    """
+    Loads a local dump of daily or monthly bars into a PriceMatrix without any network access.
+
+    Chunks are parsed with column projection and reduced to one bar per
+    ticker and period on a thread pool as they are read, so memory is bounded
+    by the number of in-flight chunks and the size of the result.
+
+    Parameters:
+    file_path (str): CSV or Parquet file with one bar per row.
+    fields (tuple): Bar fields to keep, out of open, high, low, close and volume.
+    columns (dict): Mapping of symbol, date and each field to its column in the file, BAR_COLUMNS if None.
+    frequency (str): Frequency of the matrix, 'D', 'W', 'M', 'Q' or 'Y'; 'M' for monthly bars.
+    tickers (list): Tickers to keep, all if None.
+    chunk_rows (int): Approximate rows per chunk.
+    max_workers (int): Number of threads reducing chunks.
+
+    Returns:
+    PriceMatrix: Matrix with one row per ticker, sorted by ticker, as consumed by `calculate_monthly_return_percentage`.
+    """
+    columns = {**BAR_COLUMNS, **(columns or {})}
+    names = {columns[key]: key for key in ('symbol', 'date') + tuple(fields)}
+    wanted = set(tickers) if tickers is not None else None
+
+    def reduce_chunk(chunk):
+        chunk = chunk.rename(columns=names)
+        if wanted is not None:
+            chunk = chunk[chunk['symbol'].isin(wanted)]
+        return reduce_bars(parse_bars(chunk, fields, frequency), fields)
+
+    reduce_chunk = instrumentation.propagate(reduce_chunk)
+    partials = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = []
+        for chunk in iter_chunks(file_path, names, chunk_rows):
+            instrumentation.count('ingested_rows', len(chunk))
+            pending.append(executor.submit(reduce_chunk, chunk))
+            if len(pending) >= 2 * max_workers:
+                partials.append(pending.pop(0).result())
+        partials.extend(future.result() for future in pending)
+
+    if not partials:
+        partials = [parse_bars(pd.DataFrame({'symbol': [], 'date': np.array([], dtype='datetime64[D]'), **{field: [] for field in fields}}), fields, frequency)]
+    bars = reduce_bars(pd.concat(partials, ignore_index=True), fields) if len(partials) > 1 else partials[0]
+
+    codes, symbols = pd.factorize(bars['symbol'], sort=True)
+    periods = bars['period'].to_numpy()
+    if frequency == 'D' or not len(periods):
+        calendar = np.unique(periods)
+    else:
+        calendar = np.arange(periods.min(), periods.max() + 1)
+    columns = np.searchsorted(calendar, periods)
+    matrix_fields = {}
+    for field in fields:
+        matrix_fields[field] = np.full((len(symbols), len(calendar)), np.nan)
+        matrix_fields[field][codes, columns] = bars[field].to_numpy(dtype=np.float64)
+
+    last_dates = np.full(len(symbols), np.datetime64('NaT'), dtype='datetime64[D]')
+    np.maximum.at(last_dates.view(np.int64), codes, bars['date'].to_numpy().astype('datetime64[D]').view(np.int64))
+    return timeseries.PriceMatrix(list(symbols), timeseries.period_labels(calendar, frequency), matrix_fields, [str(date) for date in last_dates], frequency)
+
+@instrumentation.timed()
+def load_overview(file_path, columns=None, tickers=None):
+    """
+    Loads a local dump of company fundamentals as OVERVIEW payloads.
+
+    Parameters:
+    file_path (str): CSV or Parquet file with one company per row.
+    columns (dict): Mapping of OVERVIEW key to its column in the file; keys default to themselves.
+    tickers (list): Tickers to keep, all if None.
+
+    Returns:
+    list: OVERVIEW style dictionaries, as consumed by `get_ratios`; missing values are None.
+    """
+    columns = {key: (columns or {}).get(key, key) for key in OVERVIEW_KEYS}
+    frames = [chunk.rename(columns={column: key for key, column in columns.items()}) for chunk in iter_chunks(file_path, columns.values())]
+    overview = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=list(OVERVIEW_KEYS))
+    if tickers is not None:
+        overview = overview[overview['Symbol'].isin(set(tickers))]
+    overview = overview.astype(object).where(overview.notna(), None)
+    return overview.to_dict('records')
@@ -0,0 +1,293 @@
+# Standard Imports
+import io
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import threading
+import functools
+import contextvars
+import tracemalloc
+from collections import defaultdict
+
+# Constants
+# FINANCE_TOOLS_PROFILE=1 records spans; add ',cprofile' and/or ',tracemalloc' for deeper captures.
+ENVIRONMENT_VARIABLE = 'FINANCE_TOOLS_PROFILE'
+OUTPUT_VARIABLE = 'FINANCE_TOOLS_PROFILE_OUTPUT'
+TOP_FUNCTIONS = 25
+
+# State
+enabled = False
+lock = threading.Lock()
+spans = defaultdict(lambda: {'calls': 0, 'seconds': 0.0, 'counters': defaultdict(float)})
+counters = defaultdict(float)
+# Open spans of the current thread or task, innermost last; handed to worker threads by `propagate`.
+stack = contextvars.ContextVar('instrumentation_stack', default=())
+profiler = None
+started_at = None
+# True while tracemalloc runs because `enable` started it.
+tracing = False
+
+# Classes
+
+class Span:
+    """
+    Times a block of code and collects the counters added while it runs.
+    """
+
+    def __init__(self, name, initial_counters):
+        self.name = name
+        self.counters = defaultdict(float, initial_counters)
+
+    def __enter__(self):
+        stack.set(stack.get() + (self,))
+        self.start = time.perf_counter()
+        return self
+
+    def count(self, name, value=1):
+        # Worker threads started under this span count into it concurrently.
+        with lock:
+            self.counters[name] += value
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        stack.set(tuple(current for current in stack.get() if current is not self))
+        with lock:
+            record = spans[self.name]
+            record['calls'] += 1
+            record['seconds'] += seconds
+            for name, value in self.counters.items():
+                record['counters'][name] += value
+        return False
+
+
+class NullSpan:
+    """
+    Stand-in returned while instrumentation is disabled; does nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def count(self, name, value=1):
+        pass
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_SPAN = NullSpan()
+
+# Functions
+
+def span(name, **initial_counters):
+    """
+    Returns a context manager timing the enclosed block as `name`.
+
+    Parameters:
+    name (str): Span name, e.g. 'utils.get_stock_data'.
+    initial_counters: Counters to add to the span, e.g. rows=100.
+
+    Returns:
+    Span: Context manager, a shared no-op when instrumentation is disabled.
+    """
+    if not enabled:
+        return NULL_SPAN
+    return Span(name, initial_counters)
+
+def timed(name=None):
+    """
+    Decorates a function so each call is recorded as a span.
+
+    Results with a length (DataFrames, lists, dicts) add a 'rows' counter.
+
+    Parameters:
+    name (str): Span name, '<module>.<function>' if None.
+
+    Returns:
+    callable: Decorator.
+    """
+    def decorator(function):
+        span_name = name or f"{function.__module__.rsplit('.', 1)[-1]}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            with Span(span_name, {}) as current:
+                result = function(*args, **kwargs)
+                if hasattr(result, '__len__') and not isinstance(result, str):
+                    current.count('rows', len(result))
+                return result
+        return wrapper
+    return decorator
+
+def count(name, value=1):
+    """
+    Adds to a counter on every open span of this thread, including the spans
+    handed over by `propagate`, and to the run totals.
+
+    Parameters:
+    name (str): Counter name, e.g. 'requests' or 'bytes'.
+    value (float): Amount to add.
+    """
+    if not enabled:
+        return
+    for current in stack.get():
+        current.count(name, value)
+    with lock:
+        counters[name] += value
+
+def propagate(function):
+    """
+    Wraps a function handed to a worker thread so it counts into the caller's open spans.
+
+    Parameters:
+    function (callable): Function to run on another thread.
+
+    Returns:
+    callable: Function running `function` under the spans open at the time of wrapping.
+    """
+    if not enabled:
+        return function
+    parents = stack.get()
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        token = stack.set(parents)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stack.reset(token)
+    return wrapper
+
+def enable(profile=False, memory=False):
+    """
+    Turns instrumentation on and resets all recorded data.
+
+    Parameters:
+    profile (bool): Also capture a cProfile profile of the run.
+    memory (bool): Also trace memory allocations with tracemalloc.
+    """
+    global enabled, profiler, started_at, tracing
+    reset()
+    enabled = True
+    started_at = time.perf_counter()
+    if profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        tracing = True
+
+def enable_from_environment():
+    """
+    Enables instrumentation if FINANCE_TOOLS_PROFILE is set.
+
+    Returns:
+    bool: True if instrumentation was enabled.
+    """
+    value = os.environ.get(ENVIRONMENT_VARIABLE, '').lower()
+    if value in ('', '0', 'false'):
+        return False
+    options = {option.strip() for option in value.split(',')}
+    enable(profile='cprofile' in options, memory='tracemalloc' in options)
+    return True
+
+def disable():
+    """
+    Turns instrumentation off, stopping the cProfile capture and the tracemalloc
+    capture if `enable` started it; tracing started by someone else keeps running.
+    """
+    global enabled, profiler, tracing
+    enabled = False
+    if profiler is not None:
+        profiler.disable()
+    if tracing:
+        tracemalloc.stop()
+        tracing = False
+
+def reset():
+    """
+    Clears all recorded spans and counters.
+    """
+    global profiler
+    with lock:
+        spans.clear()
+        counters.clear()
+    profiler = None
+
+def summarize_span(record):
+    """
+    Summarizes one span, adding its throughput when it counted bytes.
+
+    Parameters:
+    record (dict): Calls, seconds and counters of the span.
+
+    Returns:
+    dict: Calls, seconds, counters and, for spans counting bytes, bytes per second.
+    """
+    summary = {'calls': record['calls'], 'seconds': record['seconds'], 'counters': dict(record['counters'])}
+    if record['counters'].get('bytes') and record['seconds'] > 0:
+        summary['bytes_per_second'] = record['counters']['bytes'] / record['seconds']
+    return summary
+
+def report():
+    """
+    Summarizes the run.
+
+    Returns:
+    dict: Total seconds, per-span calls/seconds/counters (plus bytes per second
+          for spans counting bytes), run counters and, when captured, the top
+          cProfile functions and the tracemalloc peak.
+    """
+    with lock:
+        summary = {
+            'total_seconds': time.perf_counter() - started_at if started_at is not None else 0.0,
+            'spans': {
+                name: summarize_span(record)
+                for name, record in spans.items()
+            },
+            'counters': dict(counters)
+        }
+
+    if profiler is not None:
+        profiler.disable()
+        stream = io.StringIO()
+        statistics = pstats.Stats(profiler, stream=stream)
+        statistics.sort_stats('cumulative')
+        summary['profile'] = [
+            {
+                'function': f'{filename}:{line}({function})',
+                'calls': calls,
+                'total_seconds': total_time,
+                'cumulative_seconds': cumulative_time
+            }
+            for (filename, line, function), (_, calls, total_time, cumulative_time, _) in sorted(
+                statistics.stats.items(), key=lambda item: item[1][3], reverse=True
+            )[:TOP_FUNCTIONS]
+        ]
+        if enabled:
+            profiler.enable()
+
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        summary['memory'] = {'current_bytes': current, 'peak_bytes': peak}
+
+    return summary
+
+def emit(file_path=None):
+    """
+    Writes the run summary as JSON.
+
+    Parameters:
+    file_path (str): Output path; FINANCE_TOOLS_PROFILE_OUTPUT or stderr if None.
+    """
+    file_path = file_path or os.environ.get(OUTPUT_VARIABLE)
+    summary = json.dumps(report(), indent=2, default=float)
+    if file_path:
+        with open(file_path, 'w') as file:
+            file.write(summary)
+    else:
+        print(summary, file=sys.stderr)
@@ -0,0 +1,55 @@
+# Standard Imports
+import importlib
+import threading
+
+# Constants
+lock = threading.Lock()
+
+# Classes
+
+class LazyModule:
+    """
+    Stands in for a module and imports it on first attribute access.
+
+    Heavy dependencies such as pandas, requests and xlsxwriter are bound to a
+    LazyModule at import time, so entry points only pay for the libraries a
+    run actually touches.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            with lock:
+                module = self.__dict__['_module']
+                if module is None:
+                    module = importlib.import_module(self.__dict__['_name'])
+                    self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._load(), attribute, value)
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+# Functions
+
+def lazy_import(name):
+    """
+    Returns a module that is imported the first time it is used.
+
+    Parameters:
+    name (str): Absolute module name, e.g. 'pandas'.
+
+    Returns:
+    LazyModule: Proxy for the module.
+    """
+    return LazyModule(name)
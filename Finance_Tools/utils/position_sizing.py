@@ -0,0 +1,170 @@
+# Standard Imports
+import numpy as np
+
+# Constants
+METHODS = ('equal', 'score', 'inverse_volatility')
+VOLATILITY_PERIODS = 12
+
+# Functions
+
+def normalize(weights):
+    """
+    Scales non-negative weights to sum to one, falling back to equal weights.
+
+    Parameters:
+    weights (ndarray): Raw weights; NaN and negative entries count as zero.
+
+    Returns:
+    ndarray: Weights summing to one, or all zero for an empty input.
+    """
+    weights = np.where(np.isfinite(weights) & (weights > 0), weights, 0.0)
+    total = weights.sum()
+    if total > 0:
+        return weights / total
+    return np.full(len(weights), 1.0 / len(weights)) if len(weights) else weights
+
+def equal_weights(count):
+    """
+    Splits the portfolio evenly.
+
+    Parameters:
+    count (int): Number of positions.
+
+    Returns:
+    ndarray: Equal weights summing to one.
+    """
+    return normalize(np.ones(count))
+
+def score_weights(scores):
+    """
+    Weights positions in proportion to their strategy scores.
+
+    Parameters:
+    scores (array-like): Scores such as HQM or RV scores; NaN or negative scores get no weight.
+
+    Returns:
+    ndarray: Weights summing to one.
+    """
+    return normalize(np.asarray(scores, dtype=np.float64))
+
+def inverse_volatility_weights(volatility):
+    """
+    Weights positions in inverse proportion to their volatility.
+
+    Parameters:
+    volatility (array-like): Return volatility per position; NaN or zero volatility gets no weight.
+
+    Returns:
+    ndarray: Weights summing to one.
+    """
+    volatility = np.asarray(volatility, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return normalize(np.where(volatility > 0, 1.0 / volatility, 0.0))
+
+def trailing_volatility(close, periods=VOLATILITY_PERIODS):
+    """
+    Computes each ticker's volatility of periodic returns over its latest periods.
+
+    Parameters:
+    close (ndarray): Ticker x period closing prices.
+    periods (int): Number of returns to use.
+
+    Returns:
+    ndarray: Standard deviation of returns per ticker, NaN with fewer than two returns.
+    """
+    close = np.asarray(close, dtype=np.float64)[:, -(periods + 1):]
+    returns = close[:, 1:] / close[:, :-1] - 1
+    valid = ~np.isnan(returns)
+    count = valid.sum(axis=1)
+    mean = np.where(valid, returns, 0.0).sum(axis=1) / np.maximum(count, 1)
+    squares = np.where(valid, (returns - mean[:, None]) ** 2, 0.0).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 1, np.sqrt(squares / (count - 1)), np.nan)
+
+def allocate_shares(portfolio_amount, prices, weights, lot_size=1, min_position=0.0, spend_leftover=True):
+    """
+    Turns target weights into whole lots without exceeding the budget.
+
+    Each position first gets the whole lots its weight pays for. Positions
+    worth less than `min_position` are dropped and their weight spread over
+    the rest. A single greedy pass in the given order then spends the
+    leftover cash, one lot per position, on positions still below their
+    target. Every step is linear in the number of positions.
+
+    Parameters:
+    portfolio_amount (float): Amount to invest.
+    prices (array-like): Price per share; NaN or non-positive prices are not bought.
+    weights (array-like): Target weight per position.
+    lot_size (int): Shares per tradable lot.
+    min_position (float): Smallest position value worth holding.
+    spend_leftover (bool): Run the greedy pass over the leftover cash.
+
+    Returns:
+    tuple: Shares per position (NaN where the price is unusable) and the unspent cash.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    priced = np.isfinite(prices) & (prices > 0)
+    weights = np.where(priced, np.asarray(weights, dtype=np.float64), 0.0)
+    if not (weights > 0).any():
+        weights = priced.astype(np.float64)
+    weights = normalize(weights) if priced.any() else weights
+    lot_prices = np.where(priced, prices * lot_size, 1.0)
+
+    targets = portfolio_amount * weights
+    if min_position > 0:
+        keep = priced & (targets >= min_position)
+        if keep.any():
+            targets = portfolio_amount * normalize(np.where(keep, weights, 0.0))
+        targets[~keep] = 0.0
+
+    lots = np.floor(targets / lot_prices)
+    if min_position > 0:
+        lots[lots * lot_prices < min_position] = 0
+    cash = portfolio_amount - lots @ lot_prices
+
+    if spend_leftover:
+        deficits = targets - lots * lot_prices
+        for position in np.flatnonzero(priced & (deficits > 0)):
+            lot_price = lot_prices[position]
+            if lot_price <= cash and (lots[position] + 1) * lot_price >= min_position:
+                lots[position] += 1
+                cash -= lot_price
+
+    shares = lots * lot_size
+    shares[~priced] = np.nan
+    return shares, cash
+
+def size_positions(portfolio_amount, Dataframe, method='equal', score_column=None, volatility_column=None, lot_size=1, min_position=0.0, spend_leftover=True):
+    """
+    Fills the 'Number of Shares to Buy' column by splitting the portfolio across the rows.
+
+    Parameters:
+    portfolio_amount (float): Amount to invest in the portfolio.
+    Dataframe (DataFrame): Selected stocks with a Price column, best first.
+    method (str): 'equal', 'score' or 'inverse_volatility'.
+    score_column (str): Column weighting the 'score' method, e.g. 'HQM Score'.
+    volatility_column (str): Column weighting the 'inverse_volatility' method.
+    lot_size (int): Shares per tradable lot.
+    min_position (float): Smallest position value worth holding.
+    spend_leftover (bool): Spend the cash left by rounding down to whole lots.
+
+    Returns:
+    DataFrame: DataFrame with the number of shares to buy calculated.
+    """
+    if not lot_size >= 1:
+        raise ValueError(f"The lot size must be at least 1, not {lot_size}.")
+    if not min_position >= 0:
+        raise ValueError(f"The minimum position must not be negative, not {min_position}.")
+    if method == 'equal':
+        weights = equal_weights(len(Dataframe))
+    elif method == 'score':
+        weights = score_weights(Dataframe[score_column].to_numpy(dtype=np.float64, na_value=np.nan))
+    elif method == 'inverse_volatility':
+        weights = inverse_volatility_weights(Dataframe[volatility_column].to_numpy(dtype=np.float64, na_value=np.nan))
+    else:
+        raise ValueError(f"Unknown sizing method '{method}'. Choose one of {', '.join(METHODS)}.")
+
+    prices = Dataframe['Price'].to_numpy(dtype=np.float64, na_value=np.nan)
+    shares, _ = allocate_shares(portfolio_amount, prices, weights, lot_size, min_position, spend_leftover)
+    Dataframe['Number of Shares to Buy'] = shares
+    return Dataframe
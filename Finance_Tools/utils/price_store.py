@@ -0,0 +1,295 @@
+# Standard Imports
+import os
+import json
+import tempfile
+
+import numpy as np
+
+from utils import timeseries
+from utils import instrumentation
+
+# Constants
+STORE_DIRECTORY = 'data/prices'
+META_FILE = 'meta.json'
+TICKER_CAPACITY = 8192
+# Period records copied at a time when older history moves the first period back.
+REBASE_RECORDS = 256
+FIELDS = ('close', 'volume')
+
+# Classes
+
+class PriceStore:
+    """
+    Append-only, memory-mapped price history with one fixed-width file per field.
+
+    Each field file is laid out date-major: one record of `ticker_capacity`
+    values per period, so adding a period appends a record to the end of the
+    file instead of rewriting it; only history older than the first period
+    rewrites the files, once, through `rebase`. Tickers map to slots through
+    `meta.json` and periods to records through their offset from the first
+    period, so reads are zero-copy transposed views of the mapped files.
+    """
+
+    def __init__(self, directory=STORE_DIRECTORY):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE)) as file:
+            meta = json.load(file)
+        self.frequency = meta['frequency']
+        self.ticker_capacity = meta['ticker_capacity']
+        self.dtypes = {field: np.dtype(dtype) for field, dtype in meta['fields'].items()}
+        self.tickers = meta['tickers']
+        self.last_refreshed = meta['last_refreshed']
+        self.number_of_dates = meta['number_of_dates']
+        self.start = np.datetime64(meta['start'], self.frequency) if meta['start'] else None
+        self.index = {ticker: row for row, ticker in enumerate(self.tickers)}
+
+    def __len__(self):
+        return len(self.tickers)
+
+    @classmethod
+    def create(cls, directory=STORE_DIRECTORY, fields=FIELDS, ticker_capacity=TICKER_CAPACITY, frequency='M', dtype=np.float64):
+        """
+        Creates an empty store, or opens the existing one in `directory`.
+
+        Parameters:
+        directory (str): Directory holding the field files and index.
+        fields (tuple): Bar fields to store; volume is always float64.
+        ticker_capacity (int): Number of ticker slots in every period record.
+        frequency (str): NumPy datetime unit of the periods, 'M' for monthly or 'D' for daily bars.
+        dtype (type): Floating point dtype for the price fields.
+
+        Returns:
+        PriceStore: The opened store.
+        """
+        if os.path.exists(os.path.join(directory, META_FILE)):
+            return cls(directory)
+        os.makedirs(directory, exist_ok=True)
+        for field in fields:
+            open(os.path.join(directory, f'{field}.bin'), 'wb').close()
+        write_meta(directory, {
+            'frequency': frequency,
+            'ticker_capacity': ticker_capacity,
+            'fields': {field: np.dtype(np.float64 if field == 'volume' else dtype).str for field in fields},
+            'tickers': [],
+            'last_refreshed': [],
+            'number_of_dates': 0,
+            'start': None
+        })
+        return cls(directory)
+
+    @property
+    def dates(self):
+        if self.start is None:
+            return np.array([], dtype=f'datetime64[{self.frequency}]')
+        return self.start + np.arange(self.number_of_dates)
+
+    def path(self, field):
+        return os.path.join(self.directory, f'{field}.bin')
+
+    def field(self, field, mode='r'):
+        """
+        Maps one field file.
+
+        Parameters:
+        field (str): Bar field, e.g. 'close'.
+        mode (str): np.memmap mode, 'r' for read-only views.
+
+        Returns:
+        memmap: Period x ticker slot array.
+        """
+        shape = (self.number_of_dates, self.ticker_capacity)
+        if not self.number_of_dates:
+            return np.empty(shape, dtype=self.dtypes[field])
+        return np.memmap(self.path(field), dtype=self.dtypes[field], mode=mode, shape=shape)
+
+    def columns(self, start=None, end=None):
+        """
+        Converts a date range to a record slice.
+
+        Parameters:
+        start (str): First date to include, the first stored period if None.
+        end (str): Last date to include, the last stored period if None.
+
+        Returns:
+        slice: Record positions of the range.
+        """
+        first = 0 if start is None or self.start is None else int((np.datetime64(start, self.frequency) - self.start).astype(int))
+        last = self.number_of_dates if end is None or self.start is None else int((np.datetime64(end, self.frequency) - self.start).astype(int)) + 1
+        return slice(min(max(first, 0), self.number_of_dates), min(max(last, 0), self.number_of_dates))
+
+    def rows(self, tickers):
+        """
+        Looks up ticker slots, skipping tickers not in the store.
+
+        Parameters:
+        tickers (list): Stock tickers.
+
+        Returns:
+        ndarray: Slot of each stored ticker.
+        """
+        return np.array([self.index[ticker] for ticker in tickers if ticker in self.index], dtype=np.intp)
+
+    @instrumentation.timed()
+    def price_matrix(self, tickers=None, start=None, end=None, fields=None):
+        """
+        Reads a PriceMatrix from the store.
+
+        Without `tickers` every field is a zero-copy view of the mapped files;
+        selecting tickers gathers their rows into new arrays. Daily stores
+        keep a record for every calendar day, so their reads gather only the
+        days any stored ticker traded on.
+
+        Parameters:
+        tickers (list): Tickers to read, all if None; tickers not in the store are skipped.
+        start (str): First date to include.
+        end (str): Last date to include.
+        fields (tuple): Fields to read, all stored fields if None.
+
+        Returns:
+        PriceMatrix: Ticker x period matrix.
+        """
+        columns = self.columns(start, end)
+        if self.frequency == 'D':
+            traded = ~np.isnan(self.field('close' if 'close' in self.dtypes else next(iter(self.dtypes)))[columns]).all(axis=1)
+            columns = np.arange(columns.start, columns.stop)[traded]
+        rows = slice(0, len(self.tickers)) if tickers is None else self.rows(tickers)
+        matrix_fields = {
+            field: self.field(field)[columns].T[rows]
+            for field in (fields or self.dtypes)
+        }
+        selected = self.tickers if tickers is None else [self.tickers[row] for row in rows]
+        last_refreshed = self.last_refreshed if tickers is None else [self.last_refreshed[row] for row in rows]
+        return timeseries.PriceMatrix(selected, self.dates[columns], matrix_fields, last_refreshed, self.frequency)
+
+    @instrumentation.timed()
+    def rebase(self, start):
+        """
+        Moves the first period back to `start`, prepending empty records to every field file.
+
+        Each file is rewritten to a temporary file and swapped in atomically,
+        and the index is written last; readers that already mapped the old
+        files keep reading them.
+
+        Parameters:
+        start (datetime64): New first period, before the current one.
+
+        Returns:
+        PriceStore: The store, reloaded.
+        """
+        prepended = int((self.start - start).astype(int))
+        for field, dtype in self.dtypes.items():
+            mapped = self.field(field)
+            descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(descriptor, 'wb') as file:
+                    np.full((prepended, self.ticker_capacity), np.nan, dtype=dtype).tofile(file)
+                    for first in range(0, self.number_of_dates, REBASE_RECORDS):
+                        np.asarray(mapped[first:first + REBASE_RECORDS]).tofile(file)
+                del mapped
+                os.replace(temp_path, self.path(field))
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+        write_meta(self.directory, {
+            'frequency': self.frequency,
+            'ticker_capacity': self.ticker_capacity,
+            'fields': {field: dtype.str for field, dtype in self.dtypes.items()},
+            'tickers': self.tickers,
+            'last_refreshed': self.last_refreshed,
+            'number_of_dates': self.number_of_dates + prepended,
+            'start': str(start)
+        })
+        self.__init__(self.directory)
+        return self
+
+    @instrumentation.timed()
+    def write(self, price_matrix):
+        """
+        Merges a PriceMatrix into the store.
+
+        New tickers take free slots and new periods are appended as records;
+        existing cells are updated in place. NaN cells leave stored values
+        unchanged, so a short payload never erases older history. Periods
+        before the store's first period rebase it first.
+
+        Parameters:
+        price_matrix (PriceMatrix): Matrix on the store's frequency.
+
+        Returns:
+        PriceStore: The store, reloaded.
+        """
+        dates = np.asarray(price_matrix.dates).astype(f'datetime64[{self.frequency}]')
+        if not len(dates) or not len(price_matrix):
+            return self
+
+        if self.start is not None and dates[0] < self.start:
+            self.rebase(dates[0])
+        start = self.start if self.start is not None else dates[0]
+
+        tickers = list(self.tickers)
+        last_refreshed = list(self.last_refreshed)
+        index = dict(self.index)
+        for ticker, refreshed in zip(price_matrix.tickers, price_matrix.last_refreshed):
+            if ticker not in index:
+                index[ticker] = len(tickers)
+                tickers.append(ticker)
+                last_refreshed.append(None)
+            if refreshed is not None:
+                last_refreshed[index[ticker]] = refreshed
+        if len(tickers) > self.ticker_capacity:
+            raise ValueError(f"Store holds at most {self.ticker_capacity} tickers; rebuild it with a larger ticker_capacity.")
+
+        first = int((dates[0] - start).astype(int))
+        number_of_dates = max(self.number_of_dates, int((dates[-1] - start).astype(int)) + 1)
+        rows = np.array([index[ticker] for ticker in price_matrix.tickers], dtype=np.intp)
+        columns = first + (dates - dates[0]).astype(int)
+
+        for field, dtype in self.dtypes.items():
+            record_bytes = self.ticker_capacity * dtype.itemsize
+            with open(self.path(field), 'r+b') as file:
+                # Drop any partial records left by an interrupted write, then append.
+                file.truncate(self.number_of_dates * record_bytes)
+                file.seek(0, os.SEEK_END)
+                np.full((number_of_dates - self.number_of_dates, self.ticker_capacity), np.nan, dtype=dtype).tofile(file)
+            if field not in price_matrix.fields:
+                continue
+            mapped = np.memmap(self.path(field), dtype=dtype, mode='r+', shape=(number_of_dates, self.ticker_capacity))
+            block = np.asarray(price_matrix.fields[field], dtype=dtype).T
+            current = mapped[np.ix_(columns, rows)]
+            mapped[np.ix_(columns, rows)] = np.where(np.isnan(block), current, block)
+            mapped.flush()
+            del mapped
+
+        write_meta(self.directory, {
+            'frequency': self.frequency,
+            'ticker_capacity': self.ticker_capacity,
+            'fields': {field: dtype.str for field, dtype in self.dtypes.items()},
+            'tickers': tickers,
+            'last_refreshed': last_refreshed,
+            'number_of_dates': number_of_dates,
+            'start': str(start)
+        })
+        self.__init__(self.directory)
+        return self
+
+# Functions
+
+def write_meta(directory, meta):
+    """
+    Writes the store index atomically, after the field files it describes.
+
+    Parameters:
+    directory (str): Store directory.
+    meta (dict): Frequency, capacity, field dtypes, tickers and period range.
+    """
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w') as file:
+            json.dump(meta, file)
+        os.replace(temp_path, os.path.join(directory, META_FILE))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,308 @@
+# Standard Imports
+import abc
+
+import numpy as np
+
+from utils import fetcher
+from utils import timeseries
+
+# Constants
+ALPHA_VANTAGE_URL = 'https://www.alphavantage.co/query'
+IEX_BATCH_URL = 'https://cloud.iexapis.com/stable/stock/market/batch'
+IEX_BATCH_SIZE = 100
+IEX_REQUESTS_PER_MINUTE = 6000
+IEX_CHART_RANGE = '5y'
+
+# Classes
+
+class Provider(abc.ABC):
+    """
+    Market data source that `utils.get_stock_data` dispatches through.
+
+    Every provider returns payloads in one internal schema, the Alpha Vantage
+    layout of the requested function: 'TIME_SERIES_MONTHLY' payloads carry
+    "Meta Data" and "Monthly Time Series", 'OVERVIEW' payloads the flat ratio
+    keys. Parsing, caching and the strategies therefore work unchanged
+    whichever provider fetched the data. Symbols a provider has no data for
+    come back as empty payloads.
+
+    Subclasses set `name`, `batch_size` to the number of symbols one request
+    can carry, `native_schema` when responses already are internal payloads
+    and `secret_params` to their credential parameters, and implement
+    `params` and `normalize`.
+    """
+
+    name = 'provider'
+    batch_size = 1
+    native_schema = False
+    # Query parameters holding credentials, kept out of cache keys.
+    secret_params = ()
+    requests_per_minute = fetcher.REQUESTS_PER_MINUTE
+    requests_per_day = fetcher.REQUESTS_PER_DAY
+
+    def __init__(self, base_api_url):
+        self.base_api_url = base_api_url
+
+    def chunks(self, symbols):
+        """
+        Splits symbols into groups of at most `batch_size`.
+
+        Parameters:
+        symbols (list): Stock tickers.
+
+        Returns:
+        list: Lists of tickers, one per request.
+        """
+        return [symbols[start:start + self.batch_size] for start in range(0, len(symbols), self.batch_size)]
+
+    def rate_limiter(self, cache=None):
+        """
+        Builds a limiter for the provider's quotas.
+
+        Parameters:
+        cache (ResponseCache): Cache whose directory keeps the daily request count across runs, None to count in memory.
+
+        Returns:
+        RateLimiter: Limiter shared by every request of a run.
+        """
+        state_path = cache.quota_path(self.name) if cache is not None else None
+        return fetcher.RateLimiter(self.requests_per_minute, self.requests_per_day, state_path=state_path)
+
+    def cache_params(self, function, symbol):
+        """
+        Returns the parameters identifying one symbol's payload in the response cache.
+
+        Payloads fetched from different providers, or with different options
+        such as `outputsize`, get different keys; credentials are left out.
+
+        Parameters:
+        function (str): Internal function name.
+        symbol (str): Stock ticker.
+
+        Returns:
+        dict: Provider name and the request's query parameters without credentials.
+        """
+        params = {key: value for key, value in self.params(function, [symbol]).items() if key not in self.secret_params}
+        return {'provider': self.name, **params}
+
+    @abc.abstractmethod
+    def params(self, function, symbols):
+        """
+        Builds the query parameters of one request.
+
+        Parameters:
+        function (str): Internal function name, e.g. 'TIME_SERIES_MONTHLY'.
+        symbols (list): Tickers of the request, at most `batch_size`.
+
+        Returns:
+        dict: Query parameters.
+        """
+
+    @abc.abstractmethod
+    def normalize(self, function, symbols, data):
+        """
+        Converts one response into a payload per requested symbol.
+
+        Parameters:
+        function (str): Internal function name.
+        symbols (list): Tickers of the request.
+        data (dict): Decoded response.
+
+        Returns:
+        list: Payloads in the order of `symbols`.
+        """
+
+
+class AlphaVantageProvider(Provider):
+    """
+    Alpha Vantage, one symbol per request; responses are already in the internal schema.
+
+    `tier` selects the key's quotas out of `fetcher.TIERS`; the free tier applies if None.
+    """
+
+    name = 'alphavantage'
+    native_schema = True
+    secret_params = ('apikey',)
+
+    def __init__(self, base_api_url=ALPHA_VANTAGE_URL, api_key='demo', tier=None):
+        super().__init__(base_api_url)
+        self.api_key = api_key
+        if tier is not None:
+            if tier not in fetcher.TIERS:
+                raise ValueError(f"Unknown Alpha Vantage tier '{tier}'. Available: {', '.join(fetcher.TIERS)}.")
+            self.requests_per_minute, self.requests_per_day = fetcher.TIERS[tier]
+
+    def params(self, function, symbols):
+        params = {'function': function, 'symbol': symbols[0], 'apikey': self.api_key}
+        if function == timeseries.SERIES_FUNCTIONS['D']:
+            # The compact daily series only holds 100 days, too few for yearly lookbacks.
+            params['outputsize'] = 'full'
+        return params
+
+    def normalize(self, function, symbols, data):
+        return [data]
+
+
+class IEXBatchProvider(Provider):
+    """
+    IEX Cloud style `/stock/market/batch` endpoint, up to 100 symbols per request.
+
+    Daily series come straight from the chart and monthly series resample
+    it, one bar per calendar month; overview ratios come from the quote and
+    advanced stats.
+    """
+
+    name = 'iex'
+    batch_size = IEX_BATCH_SIZE
+    secret_params = ('token',)
+    requests_per_minute = IEX_REQUESTS_PER_MINUTE
+    requests_per_day = None
+    types = {
+        'TIME_SERIES_DAILY': 'chart',
+        'TIME_SERIES_MONTHLY': 'chart',
+        'OVERVIEW': 'quote,advanced-stats'
+    }
+
+    def __init__(self, base_api_url=IEX_BATCH_URL, token=None, chart_range=IEX_CHART_RANGE):
+        super().__init__(base_api_url)
+        self.token = token
+        self.chart_range = chart_range
+
+    def params(self, function, symbols):
+        if function not in self.types:
+            raise ValueError(f"IEX batch provider does not support '{function}'.")
+        params = {'symbols': ','.join(symbols), 'types': self.types[function], 'token': self.token}
+        if self.types[function] == 'chart':
+            params['range'] = self.chart_range
+        return params
+
+    def normalize(self, function, symbols, data):
+        if not fetcher.is_valid_payload(data):
+            return [data] * len(symbols)
+        convert = {'TIME_SERIES_DAILY': daily_payload, 'TIME_SERIES_MONTHLY': monthly_payload}.get(function, overview_payload)
+        return [convert(symbol, data[symbol]) if data.get(symbol) else {} for symbol in symbols]
+
+# Functions
+
+def text(value):
+    """
+    Formats a value the way Alpha Vantage reports it.
+
+    Parameters:
+    value: Number, string or None.
+
+    Returns:
+    str: The value as text, "None" when missing.
+    """
+    return "None" if value is None else str(value)
+
+def chart_arrays(data):
+    """
+    Converts an IEX daily chart into ascending dates and one array per bar field.
+
+    Parameters:
+    data (dict): The symbol's entry of the batch response, with a 'chart' list.
+
+    Returns:
+    tuple: datetime64[D] dates and a dict of float64 arrays, both empty without chart data.
+    """
+    chart = sorted(data.get('chart') or [], key=lambda bar: bar['date'])
+    dates = np.array([bar['date'] for bar in chart], dtype='datetime64[D]')
+    fields = {
+        field: np.array([np.nan if bar.get(field) is None else bar[field] for bar in chart], dtype=np.float64)
+        for field in timeseries.FIELD_KEYS
+    }
+    return dates, fields
+
+def series_payload(symbol, information, series_key, dates, bars):
+    """
+    Formats ascending bars as an Alpha Vantage time series payload.
+
+    Parameters:
+    symbol (str): Stock ticker.
+    information (str): Description in the "Meta Data".
+    series_key (str): Key of the time series.
+    dates (ndarray): Date of every bar.
+    bars (dict): Array of every bar field.
+
+    Returns:
+    dict: Payload in the internal schema, newest bar first.
+    """
+    series = {
+        str(dates[bar]): {key: f"{bars[field][bar]:.4f}" for field, key in timeseries.FIELD_KEYS.items()}
+        for bar in range(len(dates) - 1, -1, -1)
+    }
+    return {
+        "Meta Data": {
+            "1. Information": information,
+            "2. Symbol": symbol,
+            "3. Last Refreshed": str(dates[-1])
+        },
+        series_key: series
+    }
+
+def daily_payload(symbol, data):
+    """
+    Converts an IEX daily chart into a TIME_SERIES_DAILY payload.
+
+    Parameters:
+    symbol (str): Stock ticker.
+    data (dict): The symbol's entry of the batch response, with a 'chart' list.
+
+    Returns:
+    dict: Payload in the internal daily schema, empty without chart data.
+    """
+    dates, fields = chart_arrays(data)
+    if not len(dates):
+        return {}
+    return series_payload(symbol, "Daily Prices (open, high, low, close) and Volumes", timeseries.DAILY_SERIES_KEY, dates, fields)
+
+def monthly_payload(symbol, data):
+    """
+    Converts an IEX daily chart into a TIME_SERIES_MONTHLY payload.
+
+    Each month's bar opens at its first daily open, closes at its last daily
+    close and sums the daily volume, like Alpha Vantage's monthly bars, and
+    is dated by its last trading day.
+
+    Parameters:
+    symbol (str): Stock ticker.
+    data (dict): The symbol's entry of the batch response, with a 'chart' list.
+
+    Returns:
+    dict: Payload in the internal monthly schema, empty without chart data.
+    """
+    dates, fields = chart_arrays(data)
+    if not len(dates):
+        return {}
+    starts, ends = timeseries.period_bounds(timeseries.period_codes(dates, 'M'))
+    bars = {
+        field: timeseries.reduce_periods(values[None, :], starts, timeseries.RESAMPLE_REDUCTIONS[field])[0]
+        for field, values in fields.items()
+    }
+    bars['volume'] = np.nan_to_num(bars['volume'])
+    return series_payload(symbol, "Monthly Prices (open, high, low, close) and Volumes", timeseries.MONTHLY_SERIES_KEY, dates[ends], bars)
+
+def overview_payload(symbol, data):
+    """
+    Converts IEX quote and advanced stats into an OVERVIEW payload.
+
+    Parameters:
+    symbol (str): Stock ticker.
+    data (dict): The symbol's entry of the batch response, with 'quote' and 'advanced-stats'.
+
+    Returns:
+    dict: Payload in the internal overview schema.
+    """
+    quote = data.get('quote') or {}
+    stats = data.get('advanced-stats') or {}
+    enterprise_value, ebitda = stats.get('enterpriseValue'), stats.get('EBITDA')
+    return {
+        "Symbol": symbol,
+        "MarketCapitalization": text(quote.get('marketCap')),
+        "PERatio": text(quote.get('peRatio')),
+        "PriceToBookRatio": text(stats.get('priceToBook')),
+        "PriceToSalesRatioTTM": text(stats.get('priceToSales')),
+        "EVToEBITDA": text(enterprise_value / ebitda if enterprise_value is not None and ebitda else None),
+        "EVToRevenue": text(stats.get('enterpriseValueToRevenue'))
+    }
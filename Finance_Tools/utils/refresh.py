@@ -0,0 +1,153 @@
+# Standard Imports
+import os
+import json
+import time
+import datetime
+import tempfile
+
+import numpy as np
+
+from utils import lazy
+from utils import utils
+from utils import instrumentation
+
+pd = lazy.lazy_import('pandas')
+
+# Constants
+STATE_PATH = 'data/state/monthly_returns.json'
+# A ticker checked this recently is not refetched even if its data still looks
+# behind, e.g. over market holidays when no new bar exists.
+RECHECK_AFTER = 12 * 60 * 60
+
+# Functions
+
+def load_state(path=STATE_PATH):
+    """
+    Loads the persisted per-ticker refresh state.
+
+    Parameters:
+    path (str): Path of the state file.
+
+    Returns:
+    dict: Mapping of ticker to its last refreshed date, check time, price and returns.
+    """
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state, path=STATE_PATH):
+    """
+    Writes the refresh state atomically.
+
+    Parameters:
+    state (dict): Mapping of ticker to its refresh entry.
+    path (str): Path of the state file.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w') as file:
+            json.dump(state, file)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def expected_last_refreshed(today=None):
+    """
+    Returns the newest trading day a fresh payload should report.
+
+    Bars for the current day are only final after the close, so the newest
+    complete trading day is the last weekday before today.
+
+    Parameters:
+    today (date): Date of the run, today if None.
+
+    Returns:
+    str: ISO date of the expected newest bar.
+    """
+    today = np.datetime64(today or datetime.date.today(), 'D')
+    return str(np.busday_offset(today, -1, roll='forward'))
+
+def stale_tickers(state, stock_tickers, time_periods, today=None, now=None, recheck_after=RECHECK_AFTER):
+    """
+    Lists the tickers whose stored returns need refetching.
+
+    A ticker is stale if it has no entry, lacks one of the time periods, or
+    its newest bar predates the expected trading day and it has not been
+    checked within `recheck_after` seconds.
+
+    Parameters:
+    state (dict): Mapping of ticker to its refresh entry.
+    stock_tickers (list): List of stock tickers.
+    time_periods (list): List of time periods, keys of LOOKBACK_MONTHS.
+    today (date): Date of the run, today if None.
+    now (float): Current epoch time, time.time() if None.
+    recheck_after (float): Seconds before a behind ticker is checked again.
+
+    Returns:
+    list: Stale tickers in the order of `stock_tickers`.
+    """
+    expected = expected_last_refreshed(today)
+    now = time.time() if now is None else now
+    stale = []
+    for stock_ticker in stock_tickers:
+        entry = state.get(stock_ticker)
+        if entry is None or any(time_period not in entry['returns'] for time_period in time_periods):
+            stale.append(stock_ticker)
+        elif entry['last_refreshed'] < expected and now - entry['checked_at'] > recheck_after:
+            stale.append(stock_ticker)
+    return stale
+
+@instrumentation.timed()
+def refresh_monthly_return_percentage(stock_tickers, base_api_url, api_key, time_periods, state_path=STATE_PATH, today=None, **fetch_options):
+    """
+    Calculates monthly returns, fetching only the tickers whose stored returns are stale.
+
+    Fresh tickers reuse the returns persisted by earlier runs; stale ones are
+    streamed through `utils.iter_monthly_returns` and written back to the
+    state, and the result is built from the merged state so percentiles and
+    scores are always recomputed over the whole universe.
+
+    Parameters:
+    stock_tickers (list): List of stock tickers.
+    base_api_url (str): Base URL for the Alpha Vantage API.
+    api_key (str): Alpha Vantage API key.
+    time_periods (list): List of time periods, keys of LOOKBACK_MONTHS.
+    state_path (str): Path of the state file.
+    today (date): Date of the run, today if None.
+    fetch_options: Extra keyword arguments for `utils.iter_monthly_returns`, e.g. max_workers or cache.
+
+    Returns:
+    DataFrame: DataFrame with monthly returns calculated, in the order of `stock_tickers`.
+    """
+    state = load_state(state_path)
+    stale = stale_tickers(state, stock_tickers, time_periods, today)
+
+    if stale:
+        horizons = [utils.LOOKBACK_MONTHS[time_period] for time_period in time_periods]
+        checked_at = time.time()
+        for index, _, last_refreshed, price, returns in utils.iter_monthly_returns(stale, base_api_url, api_key, horizons, **fetch_options):
+            state[stale[index]] = {
+                'last_refreshed': last_refreshed,
+                'checked_at': checked_at,
+                'price': float(price),
+                'returns': {time_period: float(value) for time_period, value in zip(time_periods, returns)}
+            }
+        save_state(state, state_path)
+
+    stock_price_returns_dataframe = pd.DataFrame({
+        "Ticker": list(stock_tickers),
+        "Price": [state.get(stock_ticker, {}).get('price', np.nan) for stock_ticker in stock_tickers]
+    })
+    for time_period in time_periods:
+        stock_price_returns_dataframe[f"{time_period} Price Return"] = np.array(
+            [state.get(stock_ticker, {}).get('returns', {}).get(time_period, np.nan) for stock_ticker in stock_tickers],
+            dtype=np.float64
+        )
+
+    return stock_price_returns_dataframe
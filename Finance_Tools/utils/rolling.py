@@ -0,0 +1,343 @@
+# Standard Imports
+import os
+import tempfile
+
+import numpy as np
+
+from utils import timeseries
+from utils import instrumentation
+
+# Constants
+STATE_PATH = 'data/state/rolling_stats.npz'
+FACTORS = ('Volatility-Adjusted Momentum', 'Rolling Sharpe', 'Drawdown')
+# Per-ticker arrays saved with the statistics.
+STATE_ARRAYS = ('returns', 'total', 'total_squares', 'log_total', 'count', 'last_close', 'peak')
+
+# Classes
+
+class RollingStats:
+    """
+    Rolling return statistics of every ticker, updated one bar at a time.
+
+    The last `window` returns of each ticker sit in a ring buffer next to
+    their windowed sum, sum of squares and sum of log returns, and a running
+    peak close is kept for drawdowns. A new bar swaps the oldest return for
+    the newest in every sum, so each update costs O(1) per ticker and is one
+    vectorized step across the universe, however long the history.
+    """
+
+    def __init__(self, tickers, window=12, periods_per_year=12, frequency='M'):
+        number_of_tickers = len(tickers)
+        self.tickers = list(tickers)
+        self.index = {ticker: column for column, ticker in enumerate(self.tickers)}
+        self.window = window
+        self.periods_per_year = periods_per_year
+        self.frequency = frequency
+        self.position = 0
+        self.last_date = None
+        self.returns = np.full((window, number_of_tickers), np.nan)
+        self.total = np.zeros(number_of_tickers)
+        self.total_squares = np.zeros(number_of_tickers)
+        self.log_total = np.zeros(number_of_tickers)
+        self.count = np.zeros(number_of_tickers)
+        self.last_close = np.full(number_of_tickers, np.nan)
+        self.peak = np.full(number_of_tickers, np.nan)
+
+    def __len__(self):
+        return len(self.tickers)
+
+    @classmethod
+    def from_price_matrix(cls, price_matrix, window=None):
+        """
+        Builds the statistics from a PriceMatrix's full history.
+
+        Parameters:
+        price_matrix (PriceMatrix): Closing prices at any frequency.
+        window (int): Number of returns per window, one year of periods if None.
+
+        Returns:
+        RollingStats: Statistics as of the matrix's last date.
+        """
+        periods_per_year = timeseries.PERIODS_PER_YEAR.get(price_matrix.frequency, 12)
+        stats = cls(price_matrix.tickers, window or periods_per_year, periods_per_year, price_matrix.frequency)
+        return stats.extend(price_matrix)
+
+    @classmethod
+    def load(cls, path=STATE_PATH):
+        """
+        Loads statistics saved by `save`.
+
+        Parameters:
+        path (str): Path of the state file.
+
+        Returns:
+        RollingStats: The saved statistics.
+        """
+        with np.load(path, allow_pickle=False) as state:
+            stats = cls(state['tickers'].tolist(), int(state['window']), int(state['periods_per_year']), str(state['frequency']))
+            stats.position = int(state['position'])
+            stats.last_date = str(state['last_date']) or None
+            for name in STATE_ARRAYS:
+                setattr(stats, name, state[name].copy())
+        return stats
+
+    def save(self, path=STATE_PATH):
+        """
+        Writes the statistics atomically.
+
+        Parameters:
+        path (str): Path of the state file.
+        """
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                np.savez(
+                    file,
+                    tickers=np.array(self.tickers, dtype=str),
+                    window=self.window,
+                    periods_per_year=self.periods_per_year,
+                    frequency=self.frequency,
+                    position=self.position,
+                    last_date=self.last_date or '',
+                    **{name: getattr(self, name) for name in STATE_ARRAYS}
+                )
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def add_tickers(self, tickers):
+        """
+        Adds columns for tickers not tracked yet, with empty statistics.
+
+        Parameters:
+        tickers (list): Stock tickers.
+
+        Returns:
+        list: The tickers that were added.
+        """
+        added = [ticker for ticker in dict.fromkeys(tickers) if ticker not in self.index]
+        if not added:
+            return added
+        empty = RollingStats(added, self.window)
+        for name in STATE_ARRAYS:
+            setattr(self, name, np.concatenate([getattr(self, name), getattr(empty, name)], axis=-1))
+        for ticker in added:
+            self.index[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        return added
+
+    def update(self, close, date=None):
+        """
+        Adds one bar for every ticker.
+
+        Parameters:
+        close (array-like): Close per tracked ticker, NaN where a ticker has no bar.
+        date: Date of the bar.
+
+        Returns:
+        RollingStats: The statistics, updated.
+        """
+        close = np.asarray(close, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            new = close / self.last_close - 1
+        slot = self.position % self.window
+        self.accumulate(self.returns[slot], -1.0)
+        self.accumulate(new, 1.0)
+        self.returns[slot] = new
+        self.position += 1
+        # Sums drift as values enter and leave, so they are rebuilt from the ring once per window.
+        if self.position % self.window == 0:
+            self.resync()
+
+        self.last_close = np.where(np.isnan(close), self.last_close, close)
+        self.peak = np.fmax(self.peak, close)
+        if date is not None:
+            self.last_date = str(date)
+        return self
+
+    def accumulate(self, returns, sign):
+        valid = ~np.isnan(returns)
+        values = np.where(valid, returns, 0.0)
+        self.total += sign * values
+        self.total_squares += sign * values * values
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.log_total += sign * np.where(valid, np.log1p(values), 0.0)
+        self.count += sign * valid
+
+    def resync(self):
+        """
+        Recomputes the windowed sums from the ring buffer to drop rounding drift.
+        """
+        valid = ~np.isnan(self.returns)
+        values = np.where(valid, self.returns, 0.0)
+        self.total = values.sum(axis=0)
+        self.total_squares = (values * values).sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.log_total = np.where(valid, np.log1p(values), 0.0).sum(axis=0)
+        self.count = valid.sum(axis=0).astype(np.float64)
+
+    @instrumentation.timed()
+    def extend(self, price_matrix):
+        """
+        Adds the bars of a PriceMatrix that are newer than the last update.
+
+        Tickers seen for the first time are replayed over the matrix's
+        history up to the last update first, so their statistics line up
+        with the tickers already tracked.
+
+        Parameters:
+        price_matrix (PriceMatrix): Closing prices on the statistics' frequency.
+
+        Returns:
+        RollingStats: The statistics, updated.
+        """
+        dates = np.asarray(price_matrix.dates)
+        newer = np.ones(len(dates), dtype=bool) if self.last_date is None else dates > np.datetime64(self.last_date)
+        added = self.add_tickers(price_matrix.tickers)
+        if added and self.last_date is not None:
+            self.backfill(price_matrix, added, ~newer)
+
+        columns = np.array([self.index[ticker] for ticker in price_matrix.tickers], dtype=np.intp)
+        close = np.full(len(self.tickers), np.nan)
+        for column in np.flatnonzero(newer):
+            close[:] = np.nan
+            close[columns] = price_matrix.close[:, column]
+            self.update(close, dates[column])
+        return self
+
+    def backfill(self, price_matrix, tickers, history):
+        """
+        Replays the history of newly added tickers and aligns their ring buffers.
+
+        Parameters:
+        price_matrix (PriceMatrix): Closing prices including the tickers.
+        tickers (list): Newly added tickers.
+        history (ndarray): Boolean mask of the matrix columns up to the last update.
+        """
+        rows = np.array([price_matrix.index[ticker] for ticker in tickers], dtype=np.intp)
+        replay = RollingStats(tickers, self.window, self.periods_per_year, self.frequency)
+        for column in np.flatnonzero(history):
+            replay.update(price_matrix.close[rows, column])
+
+        columns = np.array([self.index[ticker] for ticker in tickers], dtype=np.intp)
+        # Slot of the return k bars ago is (position - 1 - k) % window in both rings.
+        replay.returns = np.roll(replay.returns, self.position - replay.position, axis=0)
+        for name in STATE_ARRAYS:
+            getattr(self, name)[..., columns] = getattr(replay, name)
+
+    def mean(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.count > 0, self.total / self.count, np.nan)
+
+    def volatility(self):
+        """
+        Returns the sample standard deviation of each ticker's windowed returns.
+
+        Returns:
+        ndarray: Volatility per ticker, NaN with fewer than two returns.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = (self.total_squares - self.total * self.total / self.count) / (self.count - 1)
+        return np.where(self.count > 1, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+    def momentum(self):
+        """
+        Returns each ticker's compounded return over the window.
+
+        Returns:
+        ndarray: Return per ticker as a fraction, NaN without any return.
+        """
+        return np.where(self.count > 0, np.expm1(self.log_total), np.nan)
+
+    def volatility_adjusted_momentum(self):
+        """
+        Returns the window return divided by the volatility over the same window.
+
+        Returns:
+        ndarray: Momentum per unit of risk, NaN where the volatility is zero or unknown.
+        """
+        risk = self.volatility() * np.sqrt(self.count)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(risk > 0, self.momentum() / risk, np.nan)
+
+    def sharpe(self):
+        """
+        Returns the annualized Sharpe ratio of the windowed returns, with a zero risk-free rate.
+
+        Returns:
+        ndarray: Sharpe ratio per ticker, NaN where the volatility is zero or unknown.
+        """
+        volatility = self.volatility()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(volatility > 0, self.mean() / volatility * np.sqrt(self.periods_per_year), np.nan)
+
+    def drawdown(self):
+        """
+        Returns each ticker's distance below its running peak close.
+
+        Returns:
+        ndarray: Drawdown per ticker as a non-positive fraction.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.last_close / self.peak - 1
+
+    def factors(self):
+        """
+        Returns every ranking factor.
+
+        Returns:
+        dict: Mapping of each FACTORS name to its array over the tracked tickers.
+        """
+        return dict(zip(FACTORS, (self.volatility_adjusted_momentum(), self.sharpe(), self.drawdown())))
+
+# Functions
+
+def add_factors(Dataframe, stats):
+    """
+    Adds the rolling factors of every row's ticker as columns.
+
+    Parameters:
+    Dataframe (DataFrame): Stocks with a Ticker column.
+    stats (RollingStats): Statistics covering the tickers; others get NaN.
+
+    Returns:
+    DataFrame: DataFrame with one column per FACTORS name.
+    """
+    columns = np.array([stats.index.get(ticker, -1) for ticker in Dataframe['Ticker']], dtype=np.intp)
+    for factor, values in stats.factors().items():
+        # Index -1 picks the appended NaN for tickers without statistics.
+        Dataframe[factor] = np.append(values, np.nan)[columns]
+    return Dataframe
+
+@instrumentation.timed()
+def update_state(price_matrix, path=STATE_PATH, window=None):
+    """
+    Brings the persisted statistics up to date with a PriceMatrix and saves them.
+
+    Only bars newer than the saved state are applied, so a run after one new
+    month costs a single update instead of a pass over the full history. A
+    missing or incompatible state file is rebuilt from the matrix.
+
+    Parameters:
+    price_matrix (PriceMatrix): Closing prices.
+    path (str): Path of the state file.
+    window (int): Number of returns per window, one year of periods if None.
+
+    Returns:
+    RollingStats: The updated statistics.
+    """
+    periods_per_year = timeseries.PERIODS_PER_YEAR.get(price_matrix.frequency, 12)
+    try:
+        stats = RollingStats.load(path)
+    except (OSError, ValueError, KeyError):
+        stats = None
+    if stats is None or stats.frequency != price_matrix.frequency or stats.window != (window or periods_per_year):
+        stats = RollingStats.from_price_matrix(price_matrix, window)
+    else:
+        stats.extend(price_matrix)
+    stats.save(path)
+    return stats
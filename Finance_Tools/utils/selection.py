@@ -0,0 +1,121 @@
+# Standard Imports
+import bisect
+
+import numpy as np
+
+# Classes
+
+class TopN:
+    """
+    Keeps the top N tickers by score up to date as individual scores change.
+
+    Scores are held in a list sorted by (score descending, ticker ascending),
+    so an update costs a binary search plus a list shift instead of a re-sort
+    of the whole universe, and ties are always broken by ticker.
+    """
+
+    def __init__(self, number_of_stocks, min_score=None):
+        self.number_of_stocks = number_of_stocks
+        self.min_score = min_score
+        self.scores = {}
+        self.ordered = []
+
+    def __len__(self):
+        return len(self.scores)
+
+    def update(self, ticker, score):
+        """
+        Sets a ticker's score, inserting the ticker if it is new.
+
+        Parameters:
+        ticker (str): Stock ticker.
+        score (float): New score; NaN or a score below `min_score` removes the ticker from contention.
+        """
+        self.remove(ticker)
+        if score is None or np.isnan(score) or (self.min_score is not None and score < self.min_score):
+            return
+        self.scores[ticker] = score
+        bisect.insort(self.ordered, (-score, ticker))
+
+    def remove(self, ticker):
+        """
+        Drops a ticker if it is tracked.
+
+        Parameters:
+        ticker (str): Stock ticker.
+        """
+        score = self.scores.pop(ticker, None)
+        if score is not None:
+            del self.ordered[bisect.bisect_left(self.ordered, (-score, ticker))]
+
+    def top(self):
+        """
+        Returns the current top N.
+
+        Returns:
+        list: (ticker, score) pairs, best first.
+        """
+        return [(ticker, -negative_score) for negative_score, ticker in self.ordered[:self.number_of_stocks]]
+
+    def rank(self, ticker):
+        """
+        Returns a ticker's one-based rank, or None if it is not tracked.
+
+        Parameters:
+        ticker (str): Stock ticker.
+
+        Returns:
+        int: Rank of the ticker.
+        """
+        score = self.scores.get(ticker)
+        if score is None:
+            return None
+        return bisect.bisect_left(self.ordered, (-score, ticker)) + 1
+
+# Functions
+
+def top_positions(scores, number_of_stocks, tie_breakers=None, min_score=None):
+    """
+    Finds the positions of the N highest scores without sorting every score.
+
+    Parameters:
+    scores (array-like): Scores, NaN for ineligible entries.
+    number_of_stocks (int): Number of positions to return.
+    tie_breakers (array-like): Values ordering equal scores ascending, e.g. tickers; position order if None.
+    min_score (float): Scores below this are never selected.
+
+    Returns:
+    ndarray: Positions of the selected scores, best first.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    eligible = ~np.isnan(scores)
+    if min_score is not None:
+        eligible &= scores >= min_score
+    candidates = np.flatnonzero(eligible)
+
+    if len(candidates) > number_of_stocks > 0:
+        kth = -np.partition(-scores[candidates], number_of_stocks - 1)[number_of_stocks - 1]
+        candidates = candidates[scores[candidates] >= kth]
+    elif number_of_stocks <= 0:
+        candidates = candidates[:0]
+
+    keys = np.arange(len(scores)) if tie_breakers is None else np.asarray(tie_breakers)
+    order = np.lexsort((keys[candidates], -scores[candidates]))
+    return candidates[order][:number_of_stocks]
+
+def select_top(Dataframe, column, number_of_stocks, min_score=None, tie_breaker='Ticker'):
+    """
+    Returns the N highest scoring rows without sorting or modifying the DataFrame.
+
+    Parameters:
+    Dataframe (DataFrame): DataFrame containing the score column.
+    column (str): Name of the score column.
+    number_of_stocks (int): Number of rows to return.
+    min_score (float): Rows scoring below this are left out.
+    tie_breaker (str): Column ordering rows with equal scores, None to keep the original row order.
+
+    Returns:
+    DataFrame: The selected rows, best first, with their original index.
+    """
+    tie_breakers = Dataframe[tie_breaker].to_numpy() if tie_breaker is not None and tie_breaker in Dataframe.columns else None
+    return Dataframe.iloc[top_positions(Dataframe[column].to_numpy(dtype=np.float64), number_of_stocks, tie_breakers, min_score)]
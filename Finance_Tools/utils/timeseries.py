@@ -0,0 +1,430 @@
+# Standard Imports
+import numpy as np
+
+from utils import instrumentation
+
+# Constants
+MONTHLY_SERIES_KEY = 'Monthly Time Series'
+WEEKLY_SERIES_KEY = 'Weekly Time Series'
+DAILY_SERIES_KEY = 'Time Series (Daily)'
+# API function and payload key of the series at each frequency.
+SERIES_FUNCTIONS = {
+    'D': 'TIME_SERIES_DAILY',
+    'W': 'TIME_SERIES_WEEKLY',
+    'M': 'TIME_SERIES_MONTHLY'
+}
+SERIES_KEYS = {
+    'D': DAILY_SERIES_KEY,
+    'W': WEEKLY_SERIES_KEY,
+    'M': MONTHLY_SERIES_KEY
+}
+PERIODS_PER_YEAR = {'D': 252, 'W': 52, 'M': 12, 'Q': 4, 'Y': 1}
+PERIOD_NAMES = {'D': 'Day', 'W': 'Week', 'M': 'Month', 'Q': 'Quarter', 'Y': 'Year'}
+# Day 0 of the epoch is a Thursday, so shifting by three days starts weeks on Monday.
+WEEK_OFFSET = 3
+FIELD_KEYS = {
+    'open': '1. open',
+    'high': '2. high',
+    'low': '3. low',
+    'close': '4. close',
+    'volume': '5. volume'
+}
+# How each field of the bars in one period combines into the resampled bar.
+RESAMPLE_REDUCTIONS = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum'
+}
+
+# Classes
+
+class PriceMatrix:
+    """
+    Ticker x period matrix of bar fields on a shared, ascending date index.
+
+    Every field is a 2-D array with one row per ticker and one column per
+    period; periods a ticker has no bar for hold NaN. Returns and other
+    downstream calculations index into these arrays instead of the JSON.
+
+    `frequency` is 'D' for daily bars, whose columns are the trading days any
+    ticker traded on, or the period of a contiguous calendar: 'W' (weeks
+    labelled by their Monday), 'M', 'Q' or 'Y'. Lookbacks count columns, so
+    252 daily or 12 monthly periods both span a year.
+    """
+
+    def __init__(self, tickers, dates, fields, last_refreshed=None, frequency=None):
+        self.tickers = list(tickers)
+        self.dates = np.asarray(dates)
+        self.fields = fields
+        self.last_refreshed = last_refreshed if last_refreshed is not None else [None] * len(self.tickers)
+        self.index = {ticker: row for row, ticker in enumerate(self.tickers)}
+        if frequency is None:
+            frequency = np.datetime_data(self.dates.dtype)[0] if np.issubdtype(self.dates.dtype, np.datetime64) else 'M'
+        self.frequency = frequency
+
+    def __len__(self):
+        return len(self.tickers)
+
+    @property
+    def close(self):
+        return self.fields['close']
+
+    def last_valid_column(self):
+        """
+        Returns the column of each ticker's newest close.
+
+        Returns:
+        ndarray: Column index per ticker, -1 for tickers without any close.
+        """
+        valid = ~np.isnan(self.close)
+        last = self.close.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+        return np.where(valid.any(axis=1), last, -1)
+
+    def last_close(self):
+        """
+        Returns each ticker's newest close.
+
+        Returns:
+        ndarray: Newest close per ticker, NaN for tickers without any close.
+        """
+        last = self.last_valid_column()
+        prices = self.close[np.arange(len(self.tickers)), np.maximum(last, 0)].astype(np.float64)
+        prices[last < 0] = np.nan
+        return prices
+
+    def lookback_return(self, periods):
+        """
+        Computes each ticker's return over the given number of periods, ending at its newest close.
+
+        Parameters:
+        periods (int): Number of periods to look back, e.g. 12 for a one-year monthly return.
+
+        Returns:
+        ndarray: Percentage return per ticker, NaN where the history is too short.
+        """
+        return self.lookback_returns([periods])[:, 0]
+
+    def lookback_returns(self, horizons):
+        """
+        Computes the returns of every ticker over every horizon in one gather.
+
+        A horizon is either a number of periods, or a (lookback, skip) pair
+        whose return runs from `lookback` periods ago to `skip` periods ago,
+        e.g. (12, 1) for 12-1 momentum.
+
+        Parameters:
+        horizons (list): Horizons as ints or (lookback, skip) tuples.
+
+        Returns:
+        ndarray: Percentage returns with one row per ticker and one column per horizon.
+        """
+        lookbacks, skips = parse_horizons(horizons)
+        last = self.last_valid_column()[:, None]
+        starts = last - lookbacks
+        ends = last - skips
+        rows = np.arange(len(self.tickers))[:, None]
+        current = self.close[rows, np.maximum(ends, 0)].astype(np.float64)
+        past = self.close[rows, np.maximum(starts, 0)].astype(np.float64)
+        past[(starts < 0) | (last < 0)] = np.nan
+        return (current - past) / past * 100
+
+    def resample(self, frequency='M', calendar=None):
+        """
+        Resamples every ticker at once to a coarser calendar, see `resample`.
+        """
+        return resample(self, frequency, calendar)
+
+# Functions
+
+def parse_horizons(horizons):
+    """
+    Splits horizons into lookback and skip arrays.
+
+    Parameters:
+    horizons (list): Horizons as ints or (lookback, skip) tuples.
+
+    Returns:
+    tuple: Arrays of lookbacks and skips.
+    """
+    lookbacks = []
+    skips = []
+    for horizon in horizons:
+        lookback, skip = (horizon, 0) if np.isscalar(horizon) else horizon
+        if not 0 <= skip < lookback:
+            raise ValueError(f"Invalid horizon {horizon!r}: skip must be non-negative and shorter than the lookback.")
+        lookbacks.append(lookback)
+        skips.append(skip)
+    return np.array(lookbacks, dtype=np.int64), np.array(skips, dtype=np.int64)
+
+def horizon_label(horizon, frequency='M'):
+    """
+    Builds a column label for a horizon, e.g. '9-Month', '12-1 Month' or '21-Day'.
+
+    Parameters:
+    horizon (int or tuple): Number of periods or (lookback, skip) pair.
+    frequency (str): Frequency the periods are counted in, 'M' for months.
+
+    Returns:
+    str: Label for the horizon.
+    """
+    unit = PERIOD_NAMES.get(frequency or 'M', 'Period')
+    if np.isscalar(horizon):
+        return f'{horizon}-{unit}'
+    return f'{horizon[0]}-{horizon[1]} {unit}'
+
+def parse_time_series(data, series_key=MONTHLY_SERIES_KEY, fields=('close',), dtype=np.float64):
+    """
+    Parses one Alpha Vantage time series payload into ascending typed arrays.
+
+    Parameters:
+    data (dict): Decoded JSON payload.
+    series_key (str): Key of the time series in the payload.
+    fields (tuple): Bar fields to keep, out of open, high, low, close and volume.
+    dtype (type): Floating point dtype for the price fields; volume is always float64.
+
+    Returns:
+    dict: Symbol, last refreshed date, datetime64[D] dates and one array per field.
+    """
+    series = data.get(series_key)
+    bars = list(series.values())
+    dates = np.array(list(series.keys()), dtype='datetime64[D]')
+    order = np.argsort(dates, kind='stable')
+
+    parsed = {
+        'symbol': data.get("Meta Data")["2. Symbol"],
+        'last_refreshed': data.get("Meta Data")["3. Last Refreshed"],
+        'dates': dates[order]
+    }
+    for field in fields:
+        values = np.array([bar[FIELD_KEYS[field]] for bar in bars], dtype=np.float64 if field == 'volume' else dtype)
+        parsed[field] = values[order]
+    return parsed
+
+def period_codes(dates, frequency):
+    """
+    Numbers the calendar period each date falls in.
+
+    Parameters:
+    dates (ndarray): datetime64 dates.
+    frequency (str): 'D', 'W' (Monday to Sunday), 'M', 'Q' or 'Y'.
+
+    Returns:
+    ndarray: int64 period number per date, consecutive for consecutive periods.
+    """
+    dates = np.asarray(dates)
+    if frequency == 'W':
+        return (dates.astype('datetime64[D]').astype(np.int64) + WEEK_OFFSET) // 7
+    if frequency == 'Q':
+        return dates.astype('datetime64[M]').astype(np.int64) // 3
+    return dates.astype(f'datetime64[{frequency}]').astype(np.int64)
+
+def period_labels(codes, frequency):
+    """
+    Converts period numbers from `period_codes` back to dates.
+
+    Parameters:
+    codes (ndarray): int64 period numbers.
+    frequency (str): 'D', 'W', 'M', 'Q' or 'Y'.
+
+    Returns:
+    ndarray: datetime64 label per period; weeks by their Monday, quarters by their first month.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    if frequency == 'W':
+        return (codes * 7 - WEEK_OFFSET).astype('datetime64[D]')
+    if frequency == 'Q':
+        return (codes * 3).astype('datetime64[M]')
+    return codes.astype(f'datetime64[{frequency}]')
+
+def stack_time_series(parsed_series, frequency='M'):
+    """
+    Stacks parsed series into a single PriceMatrix aligned on calendar periods.
+
+    Daily series are aligned on the union of their trading days, so weekends
+    and holidays take no columns; coarser frequencies use every period
+    between the first and the last.
+
+    Parameters:
+    parsed_series (list): Output of `parse_time_series` for each ticker.
+    frequency (str): 'D', 'W', 'M', 'Q' or 'Y'; 'M' for monthly bars.
+
+    Returns:
+    PriceMatrix: Matrix with one row per ticker.
+    """
+    parsed_series = list(parsed_series)
+    fields = [field for field in FIELD_KEYS if parsed_series and field in parsed_series[0]]
+    periods = [period_codes(series['dates'], frequency) for series in parsed_series]
+    if periods and sum(len(series_periods) for series_periods in periods):
+        if frequency == 'D':
+            codes = np.unique(np.concatenate(periods))
+        else:
+            first = min(series_periods[0] for series_periods in periods if len(series_periods))
+            last = max(series_periods[-1] for series_periods in periods if len(series_periods))
+            codes = np.arange(first, last + 1)
+    else:
+        codes = np.array([], dtype=np.int64)
+
+    matrix_fields = {}
+    for field in fields:
+        matrix_fields[field] = np.full((len(parsed_series), len(codes)), np.nan, dtype=parsed_series[0][field].dtype)
+    for row, (series, series_periods) in enumerate(zip(parsed_series, periods)):
+        columns = np.searchsorted(codes, series_periods)
+        for field in fields:
+            matrix_fields[field][row, columns] = series[field]
+
+    return PriceMatrix(
+        [series['symbol'] for series in parsed_series],
+        period_labels(codes, frequency),
+        matrix_fields,
+        [series['last_refreshed'] for series in parsed_series],
+        frequency
+    )
+
+def period_bounds(codes):
+    """
+    Finds the runs of equal period numbers in an ascending sequence.
+
+    Parameters:
+    codes (ndarray): Non-decreasing period number per column.
+
+    Returns:
+    tuple: First and last column of every run.
+    """
+    if not len(codes):
+        return np.array([], dtype=np.intp), np.array([], dtype=np.intp)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)] - 1
+    return starts, ends
+
+def reduce_periods(values, starts, reduction):
+    """
+    Reduces the columns of every run to one, for all rows at once; NaN is skipped.
+
+    Parameters:
+    values (ndarray): Row x column values, columns in ascending date order.
+    starts (ndarray): First column of every run, see `period_bounds`.
+    reduction (str): 'first', 'last', 'max', 'min' or 'sum'.
+
+    Returns:
+    ndarray: Row x run values, NaN for runs without any value.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not len(starts):
+        return np.empty((values.shape[0], 0))
+    valid = ~np.isnan(values)
+    if reduction in ('first', 'last'):
+        columns = np.arange(values.shape[1])
+        if reduction == 'last':
+            picked = np.maximum.reduceat(np.where(valid, columns, -1), starts, axis=1)
+        else:
+            picked = np.minimum.reduceat(np.where(valid, columns, values.shape[1]), starts, axis=1)
+        missing = (picked < 0) | (picked >= values.shape[1])
+        reduced = np.take_along_axis(values, np.clip(picked, 0, values.shape[1] - 1), axis=1)
+        reduced[missing] = np.nan
+        return reduced
+    if reduction == 'max':
+        return np.fmax.reduceat(values, starts, axis=1)
+    if reduction == 'min':
+        return np.fmin.reduceat(values, starts, axis=1)
+    if reduction == 'sum':
+        reduced = np.add.reduceat(np.where(valid, values, 0.0), starts, axis=1)
+        reduced[np.add.reduceat(valid, starts, axis=1) == 0] = np.nan
+        return reduced
+    raise ValueError(f"Unknown reduction '{reduction}'. Choose one of first, last, max, min or sum.")
+
+@instrumentation.timed()
+def resample(price_matrix, frequency='M', calendar=None):
+    """
+    Resamples a PriceMatrix to a coarser calendar for all tickers at once.
+
+    Bars in one period combine per `RESAMPLE_REDUCTIONS`: the first open,
+    highest high, lowest low, last close and summed volume. With a
+    `calendar` of period end dates, e.g. mid-month rebalance dates, each
+    period runs from the day after the previous end through its own end.
+
+    Parameters:
+    price_matrix (PriceMatrix): Matrix at a finer frequency, typically daily.
+    frequency (str): 'W', 'M', 'Q' or 'Y'; with a `calendar`, the period it approximates,
+        which sets how many columns the lookbacks span.
+    calendar (array-like): Ascending period end dates; later bars are dropped.
+
+    Returns:
+    PriceMatrix: Matrix with one column per period, labelled by period or by end date.
+    """
+    dates = price_matrix.dates.astype('datetime64[D]')
+    if calendar is not None:
+        labels = np.unique(np.asarray(calendar, dtype='datetime64[D]'))
+        codes = np.searchsorted(labels, dates)
+        columns = np.flatnonzero(codes < len(labels))
+        first = 0
+    else:
+        codes = period_codes(dates, frequency)
+        columns = np.arange(len(dates))
+        first = codes[0] if len(codes) else 0
+        labels = period_labels(np.arange(first, codes[-1] + 1) if len(codes) else codes, frequency)
+
+    codes = codes[columns]
+    starts, _ = period_bounds(codes)
+    positions = codes[starts] - first
+    matrix_fields = {}
+    for field, values in price_matrix.fields.items():
+        reduced = reduce_periods(np.asarray(values)[:, columns], starts, RESAMPLE_REDUCTIONS.get(field, 'last'))
+        matrix_fields[field] = np.full((len(price_matrix), len(labels)), np.nan, dtype=np.asarray(values).dtype)
+        matrix_fields[field][:, positions] = reduced
+
+    return PriceMatrix(price_matrix.tickers, labels, matrix_fields, price_matrix.last_refreshed, frequency)
+
+def series_lookback_returns(parsed, horizons, frequency='M'):
+    """
+    Computes one ticker's returns over every horizon straight from its parsed series.
+
+    Gives the same result as the ticker's row of `PriceMatrix.lookback_returns`,
+    so returns can be computed as each payload arrives and the series dropped.
+
+    Parameters:
+    parsed (dict): Output of `parse_time_series`.
+    horizons (list): Horizons as ints or (lookback, skip) tuples.
+    frequency (str): Period the horizons are counted in, 'D', 'W', 'M', 'Q' or 'Y', bucketed like `period_codes`.
+
+    Returns:
+    tuple: Newest close and an array of percentage returns, one per horizon.
+    """
+    lookbacks, skips = parse_horizons(horizons)
+    closes = parsed['close'].astype(np.float64)
+    if not len(closes):
+        return np.nan, np.full(len(lookbacks), np.nan)
+
+    periods = period_codes(parsed['dates'], frequency)
+    last = periods[-1]
+
+    def close_at(targets):
+        positions = np.minimum(np.searchsorted(periods, targets), len(periods) - 1)
+        return np.where(periods[positions] == targets, closes[positions], np.nan)
+
+    current = close_at(last - skips)
+    past = close_at(last - lookbacks)
+    return closes[-1], (current - past) / past * 100
+
+@instrumentation.timed()
+def build_price_matrix(stock_data, series_key=MONTHLY_SERIES_KEY, fields=('close',), dtype=np.float64, frequency=None):
+    """
+    Parses every payload once and stacks them into a PriceMatrix.
+
+    Payloads without the time series, such as the error payloads of tickers
+    that failed to fetch, are skipped, so their tickers get no row.
+
+    Parameters:
+    stock_data (list): List of dictionaries containing stock data.
+    series_key (str): Key of the time series in each payload.
+    fields (tuple): Bar fields to keep.
+    dtype (type): Floating point dtype for the price fields.
+    frequency (str): Frequency of the matrix, the frequency of `series_key` if None.
+
+    Returns:
+    PriceMatrix: Matrix with one row per ticker.
+    """
+    if frequency is None:
+        frequency = next((key for key, value in SERIES_KEYS.items() if value == series_key), 'M')
+    return stack_time_series((parse_time_series(data, series_key, fields, dtype) for data in stock_data if data and data.get(series_key)), frequency)
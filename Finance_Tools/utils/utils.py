@@ -1,14 +1,46 @@
-import math
-import json
-import requests
-import datetime
-import pandas as pd
-import xlsxwriter
+import os
+import functools
+
+import numpy as np
+
+from utils import lazy
+from utils import decode
+from utils import fetcher
+from utils import providers
+from utils import timeseries
+from utils import position_sizing
+from utils import instrumentation
+
+pd = lazy.lazy_import('pandas')
+
+# Constants
+LOOKBACK_MONTHS = {
+    'One-Year': 12,
+    'Six-Month': 6,
+    'Three-Month': 3,
+    'One-Month': 1
+}
+# The same time periods counted in bars of each frequency; a year has about 252 trading days.
+LOOKBACK_PERIODS = {
+    'D': {'One-Year': 252, 'Six-Month': 126, 'Three-Month': 63, 'One-Month': 21},
+    'W': {'One-Year': 52, 'Six-Month': 26, 'Three-Month': 13, 'One-Month': 4},
+    'M': LOOKBACK_MONTHS
+}
+RATIO_KEYS = {
+    "Price-to-Earnings Ratio": "PERatio",
+    "Price-to-Book Ratio": "PriceToBookRatio",
+    "Price-to-Sales Ratio": "PriceToSalesRatioTTM",
+    "EV/EBITDA": "EVToEBITDA",
+    "EV/RE": "EVToRevenue"
+}
 
 def get_stock_tickers(file_path):
     """
     Retrieves stock tickers from a CSV file.
 
+    Only the Ticker column is parsed, and the result is cached until the file
+    changes, so repeated runs in one process read the universe once.
+
     Parameters:
     file_path (str): Path to the CSV file containing stock tickers.
 
@@ -16,34 +48,182 @@ def get_stock_tickers(file_path):
     list: List of stock tickers.
     """
     
-    return pd.read_csv(file_path)['Ticker'].tolist()
+    return list(read_stock_tickers(os.path.abspath(file_path), os.stat(file_path).st_mtime_ns))
 
-def get_stock_data(stock_tickers, base_api_url, api_key, function):
+@functools.lru_cache(maxsize=8)
+def read_stock_tickers(file_path, modified_time):
     """
-    Retrieves stock data using the Alpha Vantage API.
+    Reads the Ticker column of a CSV file; `modified_time` keys the cache.
+
+    Parameters:
+    file_path (str): Absolute path to the CSV file.
+    modified_time (int): Modification time of the file in nanoseconds.
+
+    Returns:
+    tuple: Stock tickers.
+    """
+    return tuple(pd.read_csv(file_path, usecols=['Ticker'])['Ticker'].tolist())
+
+@instrumentation.timed()
+def get_stock_data(stock_tickers, base_api_url, api_key, function, max_workers=fetcher.MAX_WORKERS, rate_limiter=None, cache=None, provider=None):
+    """
+    Retrieves stock data through a market data provider, Alpha Vantage by default.
+
+    Requests run concurrently over a pooled keep-alive session, throttled by
+    `rate_limiter` and retried with backoff when the API reports throttling.
+    Providers with batch endpoints get up to their batch size of symbols per
+    request. When a cache is given, only tickers missing from it are requested.
 
     Parameters:
     stock_tickers (list): List of stock tickers.
     base_api_url (str): Base URL for the Alpha Vantage API.
     api_key (str): Alpha Vantage API key.
+    function (str): Alpha Vantage function, e.g. 'TIME_SERIES_MONTHLY'.
+    max_workers (int): Number of concurrent requests.
+    rate_limiter (RateLimiter): Limiter for the API quotas, defaults to the provider's quotas.
+    cache (ResponseCache): On-disk response cache, None to always fetch.
+    provider (Provider): Market data provider, Alpha Vantage at `base_api_url` if None.
 
     Returns:
     list: List of dictionaries containing stock data.
     """
 
-    all_stocks_data = []
-    for stock_ticker in stock_tickers:
-        params = {
-            'function': function,
-            'symbol': stock_ticker,
-            'apikey': api_key
-        }
-        response = requests.get(base_api_url, params=params)
-        data = json.loads(response.text)
-        all_stocks_data.append(data)
+    all_stocks_data = [None] * len(stock_tickers)
+    for index, data in iter_stock_data(stock_tickers, base_api_url, api_key, function, max_workers, rate_limiter, cache, provider=provider):
+        all_stocks_data[index] = data
 
     return all_stocks_data
 
+def iter_stock_data(stock_tickers, base_api_url, api_key, function, max_workers=fetcher.MAX_WORKERS, rate_limiter=None, cache=None, window=None, provider=None, decoder=None):
+    """
+    Retrieves stock data like `get_stock_data`, yielding each payload as soon as it is available.
+
+    Cached payloads are yielded first; the rest are fetched with at most
+    `window` requests in flight, so only a bounded number of raw payloads is
+    alive at any time.
+
+    Parameters:
+    stock_tickers (list): List of stock tickers.
+    base_api_url (str): Base URL for the Alpha Vantage API.
+    api_key (str): Alpha Vantage API key.
+    function (str): Alpha Vantage function, e.g. 'TIME_SERIES_MONTHLY'.
+    max_workers (int): Number of concurrent requests.
+    rate_limiter (RateLimiter): Limiter for the API quotas, defaults to the provider's quotas.
+    cache (ResponseCache): On-disk response cache, None to always fetch.
+    window (int): Maximum number of in-flight requests.
+    provider (Provider): Market data provider, Alpha Vantage at `base_api_url` if None.
+    decoder (callable): Function of the response bytes, e.g. `decode.time_series_decoder()`; only
+        for providers with a native schema and without a cache, as projected series are not payloads.
+
+    Yields:
+    tuple: Position of the ticker in `stock_tickers` and its payload, in arrival order.
+    """
+
+    if provider is None:
+        provider = providers.AlphaVantageProvider(base_api_url, api_key)
+
+    missing = []
+    for index, stock_ticker in enumerate(stock_tickers):
+        data = cache.get(function, stock_ticker, provider.cache_params(function, stock_ticker)) if cache is not None else None
+        if data is None:
+            missing.append(index)
+        else:
+            yield index, data
+
+    if not missing:
+        return
+
+    if rate_limiter is None:
+        rate_limiter = provider.rate_limiter(cache)
+
+    chunks = provider.chunks(missing)
+    params_list = (provider.params(function, [stock_tickers[index] for index in chunk]) for chunk in chunks)
+    for position, response in fetcher.iter_fetch(provider.base_api_url, params_list, max_workers=max_workers, rate_limiter=rate_limiter, window=window, decoder=decoder):
+        chunk = chunks[position]
+        payloads = provider.normalize(function, [stock_tickers[index] for index in chunk], response)
+        for index, data in zip(chunk, payloads):
+            if cache is not None and fetcher.is_valid_payload(data):
+                cache.put(function, stock_tickers[index], data, provider.cache_params(function, stock_tickers[index]))
+            yield index, data
+
+    if cache is not None:
+        cache.evict()
+
+def iter_monthly_returns(stock_tickers, base_api_url, api_key, horizons, max_workers=fetcher.MAX_WORKERS, rate_limiter=None, cache=None, window=None, provider=None):
+    """
+    Reduces each monthly payload to its newest close and return vector as it arrives.
+
+    Parameters:
+    stock_tickers (list): List of stock tickers.
+    base_api_url (str): Base URL for the Alpha Vantage API.
+    api_key (str): Alpha Vantage API key.
+    horizons (list): Horizons as month counts or (lookback, skip) pairs.
+    max_workers (int): Number of concurrent requests.
+    rate_limiter (RateLimiter): Limiter for the API quotas, defaults to the fetcher quotas.
+    cache (ResponseCache): On-disk response cache, None to always fetch.
+    window (int): Maximum number of in-flight requests.
+    provider (Provider): Market data provider, Alpha Vantage at `base_api_url` if None.
+
+    Yields:
+    tuple: Position in `stock_tickers`, symbol, last refreshed date, newest close and return array.
+        Tickers without data are skipped.
+    """
+
+    provider = provider or providers.AlphaVantageProvider(base_api_url, api_key)
+    # Without a cache the raw payloads are never kept, so only the closes need decoding; the
+    # regex projection only beats a full decode when orjson is missing and the json module is used.
+    decoder = decode.time_series_decoder() if cache is None and provider.native_schema and decode.orjson is None else None
+    stream = iter_stock_data(stock_tickers, base_api_url, api_key, 'TIME_SERIES_MONTHLY', max_workers, rate_limiter, cache, window, provider, decoder)
+    for index, data in stream:
+        if not fetcher.is_valid_payload(data):
+            continue
+        parsed = data if decode.is_parsed_series(data) else timeseries.parse_time_series(data)
+        price, returns = timeseries.series_lookback_returns(parsed, horizons)
+        yield index, parsed['symbol'], parsed['last_refreshed'], price, returns
+
+@instrumentation.timed()
+def stream_monthly_return_percentage(stock_tickers, base_api_url, api_key, time_periods, max_workers=fetcher.MAX_WORKERS, rate_limiter=None, cache=None, window=None, provider=None):
+    """
+    Fetches monthly data and calculates returns for each stock as its payload arrives.
+
+    Each payload is reduced to its newest close and return vector right away
+    and then dropped, so peak memory depends on the in-flight window and the
+    number of time periods rather than on the size of the raw payloads.
+
+    Parameters:
+    stock_tickers (list): List of stock tickers.
+    base_api_url (str): Base URL for the Alpha Vantage API.
+    api_key (str): Alpha Vantage API key.
+    time_periods (list): List of time periods, keys of LOOKBACK_MONTHS.
+    max_workers (int): Number of concurrent requests.
+    rate_limiter (RateLimiter): Limiter for the API quotas, defaults to the fetcher quotas.
+    cache (ResponseCache): On-disk response cache, None to always fetch.
+    window (int): Maximum number of in-flight requests.
+    provider (Provider): Market data provider, Alpha Vantage at `base_api_url` if None.
+
+    Returns:
+    DataFrame: DataFrame with monthly returns calculated, in the order of `stock_tickers`.
+    """
+
+    horizons = [LOOKBACK_MONTHS[time_period] for time_period in time_periods]
+    number_of_stocks = len(stock_tickers)
+    tickers = list(stock_tickers)
+    prices = np.full(number_of_stocks, np.nan)
+    returns = np.full((number_of_stocks, len(horizons)), np.nan)
+
+    stream = iter_monthly_returns(stock_tickers, base_api_url, api_key, horizons, max_workers, rate_limiter, cache, window, provider)
+    for index, symbol, _, price, return_vector in stream:
+        tickers[index] = symbol
+        prices[index] = price
+        returns[index] = return_vector
+
+    stock_price_returns_dataframe = pd.DataFrame({"Ticker": tickers, "Price": prices})
+    for column, time_period in enumerate(time_periods):
+        stock_price_returns_dataframe[f"{time_period} Price Return"] = returns[:, column]
+
+    return stock_price_returns_dataframe
+
+@instrumentation.timed()
 def extract_last_closing_price(stock_data):
     """
     Extracts price data from the stock data.
@@ -60,196 +240,119 @@ def extract_last_closing_price(stock_data):
         symbol = data.get("Meta Data")["2. Symbol"]
         last_refreshed = data.get("Meta Data")["3. Last Refreshed"]
         closing_price = data.get("Monthly Time Series")[last_refreshed]["4. close"]
-        stock_prices[symbol] = closing_price
+        stock_prices[symbol] = float(closing_price)
 
     return stock_prices
     
+@instrumentation.timed()
 def calculate_monthly_return_percentage(stock_data, time_periods):
     """
     Calculates monthly returns for each stock.
 
+    Payloads are parsed once into a PriceMatrix and each time period's return
+    is read from it by calendar month, so a one-year return always compares
+    the newest close with the close twelve months earlier. A daily or weekly
+    PriceMatrix counts the periods in its own bars, e.g. 252 trading days.
+
     Parameters:
-    stock_price_data (DataFrame): DataFrame containing stock price data.
-    time_periods (list): List of time periods.
+    stock_data (list or PriceMatrix): List of dictionaries containing stock data, or an already parsed PriceMatrix.
+    time_periods (list): List of time periods, keys of LOOKBACK_MONTHS.
 
     Returns:
     DataFrame: DataFrame with monthly returns calculated.
     """
 
-    # print(stock_data)
-    stock_price_returns = {}
-    for data in stock_data:
-        symbol = data.get("Meta Data")["2. Symbol"]
-        last_refreshed = data.get("Meta Data")["3. Last Refreshed"]
-        last_closing_price = data.get("Monthly Time Series")[last_refreshed]["4. close"]
-        monthly_series_keys = list(data.get("Monthly Time Series").keys())
-
-        stock_price_returns[symbol] = {
-            "Price": last_closing_price,
-            time_periods[0]: (float(last_closing_price) - float(data.get("Monthly Time Series")[monthly_series_keys[11]]["4. close"])) / float(data.get("Monthly Time Series")[monthly_series_keys[11]]["4. close"]) * 100,
-            time_periods[1]: (float(last_closing_price) - float(data.get("Monthly Time Series")[monthly_series_keys[5]]["4. close"])) / float(data.get("Monthly Time Series")[monthly_series_keys[5]]["4. close"]) * 100,
-            time_periods[2]: (float(last_closing_price) - float(data.get("Monthly Time Series")[monthly_series_keys[2]]["4. close"])) / float(data.get("Monthly Time Series")[monthly_series_keys[2]]["4. close"]) * 100,
-            time_periods[3]: (float(last_closing_price) - float(data.get("Monthly Time Series")[monthly_series_keys[0]]["4. close"])) / float(data.get("Monthly Time Series")[monthly_series_keys[0]]["4. close"]) * 100
-        }
-
-    stock_price_returns_dataframe = pd.DataFrame(columns = ["Ticker", "Price", "One-Year Price Return", "Six-Month Price Return", "Three-Month Price Return", "One-Month Price Return"])
-    for symbol, stock in stock_price_returns.items():
-        stock_price_returns_dataframe = stock_price_returns_dataframe.append(
-            pd.Series(
-                [
-                    symbol,
-                    stock['Price'],
-                    stock[time_periods[0]],
-                    stock[time_periods[1]],
-                    stock[time_periods[2]],
-                    stock[time_periods[3]]
-                ],
-                index=["Ticker", "Price", "One-Year Price Return", "Six-Month Price Return", "Three-Month Price Return", "One-Month Price Return"]
-            ),
-            ignore_index=True
-        )
+    frequency = stock_data.frequency if isinstance(stock_data, timeseries.PriceMatrix) else 'M'
+    lookbacks = LOOKBACK_PERIODS.get(frequency, LOOKBACK_MONTHS)
+    return calculate_momentum_returns(stock_data, {time_period: lookbacks[time_period] for time_period in time_periods})
 
-    return stock_price_returns_dataframe
+@instrumentation.timed()
+def calculate_momentum_returns(stock_data, horizons):
+    """
+    Calculates the returns of every stock over any set of lookback horizons at once.
+
+    Parameters:
+    stock_data (list or PriceMatrix): List of dictionaries containing stock data, or an already parsed PriceMatrix.
+    horizons (dict or list): Mapping of time period label to horizon, or a list of horizons labelled automatically.
+                             A horizon is a number of periods of the matrix, months for monthly payloads,
+                             or a (lookback, skip) pair, e.g. (12, 1) for 12-1 momentum.
 
+    Returns:
+    DataFrame: DataFrame with a '<label> Price Return' column per horizon.
+    """
+
+    if isinstance(stock_data, timeseries.PriceMatrix):
+        price_matrix = stock_data
+    else:
+        price_matrix = timeseries.build_price_matrix(stock_data)
+    if not isinstance(horizons, dict):
+        horizons = {timeseries.horizon_label(horizon, price_matrix.frequency): horizon for horizon in horizons}
+
+    returns = price_matrix.lookback_returns(list(horizons.values()))
+    columns = {"Ticker": price_matrix.tickers, "Price": price_matrix.last_close()}
+    for column, time_period in enumerate(horizons):
+        columns[f"{time_period} Price Return"] = returns[:, column]
+
+    return pd.DataFrame(columns)
+
+def parse_overview_ratios(stock_data, ratio_keys=RATIO_KEYS):
+    """
+    Parses the ratios of every OVERVIEW payload into one typed matrix in a single pass.
+
+    Alpha Vantage reports unavailable ratios as "None" or "-"; those, absent
+    keys and any other unparseable value become NaN instead of raising.
+
+    Parameters:
+    stock_data (list): List of OVERVIEW dictionaries.
+    ratio_keys (dict): Mapping of ratio name to OVERVIEW key.
+
+    Returns:
+    tuple: Tickers, ticker x ratio float64 matrix and its boolean missing mask.
+    """
+    tickers = [data.get("Symbol") for data in stock_data]
+    values = [data.get(key) for data in stock_data for key in ratio_keys.values()]
+    ratios = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    ratios = ratios.reshape(len(stock_data), len(ratio_keys))
+    return tickers, ratios, np.isnan(ratios)
+
+@instrumentation.timed()
 def get_ratios(stock_data, price_data):
     """
     Extracts ratios from the stock data.
 
+    Payloads without a symbol are skipped; missing prices and ratios are NaN.
+
     Parameters:
     stock_data (list): List of dictionaries containing stock data.
-    ratios (list): List of ratios to extract.
+    price_data (dict): Mapping of ticker to latest closing price.
 
     Returns:
     DataFrame: DataFrame containing ratios.
     """
 
-    stock_ratios = {}
-    for data in stock_data:
-        symbol = data.get("Symbol")
-        price = price_data.get(symbol)
-        pe_ratio = data.get("PERatio")
-        pb_ratio = data.get("PriceToBookRatio")
-        ps_ratio = data.get("PriceToSalesRatioTTM")
-        ev_ebitda = data.get("EVToEBITDA")
-        ev_revenue = data.get("EVToRevenue")
-
-        stock_ratios[symbol] = {
-            "Price": price,
-            "Price-to-Earnings Ratio": pe_ratio,
-            "Price-to-Book Ratio": pb_ratio,
-            "Price-to-Sales Ratio": ps_ratio,
-            "EV/EBITDA": ev_ebitda,
-            "EV/RE": ev_revenue
-        }
-
-    stock_ratios_dataframe = pd.DataFrame(columns = ["Ticker", "Price", "Price-to-Earnings Ratio", "Price-to-Book Ratio", "Price-to-Sales Ratio", "EV/EBITDA", "EV/RE"])
-    for symbol, stock in stock_ratios.items():
-        stock_ratios_dataframe = stock_ratios_dataframe.append(
-            pd.Series(
-                [
-                    symbol,
-                    float(stock["Price"]),
-                    float(stock["Price-to-Earnings Ratio"]),
-                    float(stock["Price-to-Book Ratio"]),
-                    float(stock["Price-to-Sales Ratio"]),
-                    float(stock["EV/EBITDA"]),
-                    float(stock["EV/RE"])
-                ],
-                index=["Ticker", "Price", "Price-to-Earnings Ratio", "Price-to-Book Ratio", "Price-to-Sales Ratio", "EV/EBITDA", "EV/RE"]
-            ),
-            ignore_index=True
-        )
+    stock_data = [data for data in stock_data if data.get("Symbol")]
+    tickers, ratios, _ = parse_overview_ratios(stock_data)
+    prices = np.array([price_data.get(ticker, np.nan) for ticker in tickers], dtype=np.float64)
+
+    stock_ratios_dataframe = pd.DataFrame({"Ticker": tickers, "Price": prices})
+    for column, ratio in enumerate(RATIO_KEYS):
+        stock_ratios_dataframe[ratio] = ratios[:, column]
 
     return stock_ratios_dataframe
 
-def calculate_number_of_shares_to_buy(portfolio_amount, stock_data):
+@instrumentation.timed()
+def calculate_number_of_shares_to_buy(portfolio_amount, stock_data, method='equal', **sizing_options):
     """
-    Calculates the number of shares to buy based on the portfolio amount.
+    Calculates the number of shares to buy by splitting the portfolio amount across the stocks.
 
     Parameters:
     portfolio_amount (float): Amount to invest in the portfolio.
     stock_data (DataFrame): DataFrame containing stock data.
+    method (str): Weighting, 'equal', 'score' or 'inverse_volatility', see `position_sizing.size_positions`.
+    sizing_options: Extra keyword arguments for `position_sizing.size_positions`, e.g. score_column or lot_size.
 
     Returns:
     DataFrame: DataFrame with number of shares to buy calculated.
     """
 
-    for row in stock_data.index:
-        stock_data.loc[row, 'Number of Shares to Buy'] = math.floor(portfolio_amount / float(stock_data.loc[row, 'Price']))
-
-    return stock_data
-
-# def save_to_excel(data, sheet_name, file_path, column_formats):
-#     """
-#     Saves the data to an Excel file.
-
-#     Parameters:
-#     data (DataFrame): Data to be saved.
-#     file_path (str): Path to the Excel file.
-#     """ 
-#     writer = pd.ExcelWriter(file_path, engine='xlsxwriter')
-#     data.to_excel(writer, sheet_name=sheet_name, index=False)
-
-#     background_color = '#0a0a23'
-#     font_color = '#ffffff'
-
-#     string_format = writer.book.add_format(
-#         {
-#             'font_color': font_color,
-#             'bg_color': background_color,
-#             'border': 1
-#         }
-#     )
-
-#     dollar_format = writer.book.add_format(
-#         {
-#             'num_format':'$0.00',
-#             'font_color': font_color,
-#             'bg_color': background_color,
-#             'border': 1
-#         }
-#     )
-
-#     integer_format = writer.book.add_format(
-#         {
-#             'num_format':'0',
-#             'font_color': font_color,
-#             'bg_color': background_color,
-#             'border': 1
-#         }
-#     )
-
-#     float_format = writer.book.add_format(
-#         {
-#             'num_format':'0.00',
-#             'font_color': font_color,
-#             'bg_color': background_color,
-#             'border': 1
-#         }
-#     )
-
-#     percent_format = writer.book.add_format(
-#         {
-#             'num_format':'0.0%',
-#             'font_color': font_color,
-#             'bg_color': background_color,
-#             'border': 1
-#         }
-#     )
-
-#     column_formats = {
-#         'A': ['Ticker', string_format],
-#         'B': ['Price', dollar_format],
-#         'C': ['Price-to-Earnings Ratio', float_format],
-#         'D': ['Price-to-Book Ratio', float_format],
-#         'E': ['Price-to-Sales Ratio', float_format],
-#         'F': ['EV/EBITDA', float_format],
-#         'G': ['EV/RE', float_format],
-#         'H': ['Number of Shares to Buy', integer_format]
-#     }
-
-#     for column, format in column_formats.items():
-#         writer.sheets[sheet_name].set_column(f'{column}:{column}', 20, format[1])
-#         writer.sheets[sheet_name].write(f'{column}1', format[0], format[1])
-
-#     writer.save()
\ No newline at end of file
+    return position_sizing.size_positions(portfolio_amount, stock_data, method, **sizing_options)